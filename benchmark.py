@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from glob import glob
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from ortools.linear_solver import pywraplp
+from ortools.sat.python import cp_model
+
+from lot_sizing.generator import COST_STRUCTURES, generate_input
+from lot_sizing.heuristic import earliest_deadline_schedule
+from lot_sizing.incremental import IncrementalSolver
+from lot_sizing.input import Input, InputError
+from lot_sizing.model import FORMULATIONS, BulkMipModel, CpSatModel, MipModel, create_schedule, create_solver
+from lot_sizing.solve import SolverSettings, compute_gap, solve_mip
+
+BUILD_METHODS = ('standard', 'bulk', 'bulk_unnamed')
+STAGES = ('read', 'build', 'solve', 'schedule')
+
+
+def compute_relaxation_bound(prob_input: Input, formulation: str) -> float:
+    """Return the optimal value of the linear programming relaxation of the given formulation."""
+    solver = pywraplp.Solver('relaxation', pywraplp.Solver.GLOP_LINEAR_PROGRAMMING)
+    FORMULATIONS[formulation].build_mip(prob_input, solver)
+    solver.Solve()
+    return solver.Objective().Value()
+
+
+def benchmark_formulation(prob_input: Input, formulation: str, time_limit: float) -> dict:
+    """Solve the given formulation via SCIP and return size, bounds, node count and solving time."""
+    root_bound = compute_relaxation_bound(prob_input, formulation)
+    solver = pywraplp.Solver('solver', pywraplp.Solver.SCIP_MIXED_INTEGER_PROGRAMMING)
+    solver.SetTimeLimit(int(time_limit * 1000))
+    FORMULATIONS[formulation].build_mip(prob_input, solver)
+    start_time = time.perf_counter()
+    status = solver.Solve()
+    solve_time = time.perf_counter() - start_time
+    has_solution = status in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE)
+    objective = solver.Objective().Value() if has_solution else float('nan')
+    return {'variables': solver.NumVariables(), 'constraints': solver.NumConstraints(), 'root_bound': root_bound,
+            'objective': objective, 'bound': solver.Objective().BestBound(),
+            'root_gap': (objective - root_bound) / objective if has_solution and objective else 0.,
+            'nodes': solver.nodes(), 'time': solve_time, 'optimal': status == pywraplp.Solver.OPTIMAL}
+
+
+def benchmark_cp_sat(prob_input: Input, num_workers: int, time_limit: float) -> dict:
+    """Solve the CP-SAT model with the given number of workers and return objective, bound and solving time."""
+    cp_sat_model = CpSatModel.build_model(prob_input)
+    start_time = time.perf_counter()
+    status = cp_sat_model.solve(num_workers=num_workers, time_limit=time_limit)
+    solve_time = time.perf_counter() - start_time
+    has_solution = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    return {'objective': cp_sat_model.solver.ObjectiveValue() if has_solution else float('nan'),
+            'bound': cp_sat_model.solver.BestObjectiveBound(), 'time': solve_time, 'optimal': status == cp_model.OPTIMAL}
+
+
+def _build(prob_input: Input, method: str) -> dict:
+    """Build the standard formulation via the given method and return build time, peak memory and model size."""
+    memory_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    solver = pywraplp.Solver('solver', pywraplp.Solver.SCIP_MIXED_INTEGER_PROGRAMMING)
+    start_time = time.perf_counter()
+    if method == 'standard':
+        MipModel.build_mip(prob_input, solver)
+    else:
+        BulkMipModel.build_mip(prob_input, solver, names=method == 'bulk')
+    build_time = time.perf_counter() - start_time
+    memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - memory_before
+    return {'variables': solver.NumVariables(), 'constraints': solver.NumConstraints(), 'time': build_time,
+            'memory': memory / 1024}
+
+
+def benchmark_build(prob_input: Input, method: str) -> dict:
+    """Build the standard formulation via the given method in a separate process and return its measurements."""
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(_build, prob_input, method).result()
+
+
+def _run_stages(filepath: str, formulation: str, time_limit: float) -> dict:
+    """Read, build, solve and extract the schedule of the given instance and return stage times and solve results."""
+    memory_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    times = dict()
+    start_time = time.perf_counter()
+    prob_input = Input.read(filepath)
+    times['read'] = time.perf_counter() - start_time
+    solver = create_solver()
+    solver.SetTimeLimit(int(time_limit * 1000))
+    start_time = time.perf_counter()
+    mip_model = FORMULATIONS[formulation].build_mip(prob_input, solver)
+    times['build'] = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    status = solver.Solve()
+    times['solve'] = time.perf_counter() - start_time
+    has_solution = status in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE)
+    start_time = time.perf_counter()
+    schedule = create_schedule(mip_model) if has_solution else None
+    times['schedule'] = time.perf_counter() - start_time
+    memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - memory_before
+    objective = solver.Objective().Value() if has_solution else None
+    bound = solver.Objective().BestBound()
+    return {'times': times, 'memory': memory / 1024, 'variables': solver.NumVariables(),
+            'constraints': solver.NumConstraints(), 'objective': objective, 'bound': bound,
+            'gap': compute_gap(objective, bound), 'nodes': solver.nodes(),
+            'costs': prob_input.compute_costs(schedule) if schedule is not None else None,
+            'optimal': status == pywraplp.Solver.OPTIMAL}
+
+
+def benchmark_stages(filepath: str, formulation: str, time_limit: float) -> dict:
+    """Run the stages of solving the given instance file in a separate process and return their measurements."""
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(_run_stages, filepath, formulation, time_limit).result()
+
+
+def perturbation_stream(prob_input: Input, count: int, seed: Optional[int] = None) -> List[Tuple[np.ndarray, int]]:
+    """Return count successive (demand, inventory cost) perturbations of the given instance which stay feasible.
+
+    Each perturbation adds a unit demand, removes one, moves one by up to three time periods or changes the inventory
+    cost by one.
+    """
+    rng = np.random.default_rng(seed)
+    demand, inventory_cost = prob_input.demand.astype(np.int64), prob_input.inventory_cost
+    stream = []
+    while len(stream) < count:
+        candidate, candidate_cost = demand.copy(), inventory_cost
+        machine_type = int(rng.integers(prob_input.num_types))
+        demanded = np.flatnonzero(candidate[machine_type])
+        kind = rng.choice(['add', 'remove', 'move', 'cost'])
+        time_period = int(rng.choice(demanded)) if len(demanded) else None
+        if kind == 'add':
+            candidate[machine_type, rng.integers(prob_input.num_time_periods)] += 1
+        elif kind == 'remove' and time_period is not None:
+            candidate[machine_type, time_period] -= 1
+        elif kind == 'move' and time_period is not None:
+            candidate[machine_type, time_period] -= 1
+            candidate[machine_type, np.clip(time_period + rng.integers(-3, 4), 0, prob_input.num_time_periods - 1)] += 1
+        elif kind == 'cost':
+            candidate_cost = max(inventory_cost + int(rng.choice([-1, 1])), 0)
+        try:
+            earliest_deadline_schedule(Input.from_arrays(candidate, candidate_cost, prob_input.transition_cost))
+        except InputError:
+            continue
+        demand, inventory_cost = candidate, candidate_cost
+        stream.append((demand, inventory_cost))
+    return stream
+
+
+def benchmark_incremental(prob_input: Input, count: int, time_limit: float, seed: Optional[int] = None) -> dict:
+    """Re-solve the given instance for a stream of demand perturbations incrementally and from scratch and return the
+    mean latencies, the number of perturbations solved to optimality both ways and the number of those whose objective
+    values differ."""
+    settings = SolverSettings(engine='mip', mip_time_limit=time_limit)
+    start_time = time.perf_counter()
+    incremental = IncrementalSolver(prob_input, settings)
+    incremental.solve()
+    initial_time = time.perf_counter() - start_time
+    incremental_times, fresh_times, compared, mismatches = [], [], 0, 0
+    for demand, inventory_cost in perturbation_stream(prob_input, count, seed):
+        start_time = time.perf_counter()
+        result = incremental.update_demand(demand, inventory_cost)
+        incremental_times.append(time.perf_counter() - start_time)
+        start_time = time.perf_counter()
+        fresh = solve_mip(Input.from_arrays(demand, inventory_cost, prob_input.transition_cost), settings)
+        fresh_times.append(time.perf_counter() - start_time)
+        if result.optimal and fresh.optimal:
+            compared += 1
+            mismatches += abs(result.objective - fresh.objective) > 1e-6
+    return {'initial': initial_time, 'incremental': float(np.mean(incremental_times)),
+            'fresh': float(np.mean(fresh_times)), 'compared': compared, 'mismatches': mismatches}
+
+
+def compare_to_baseline(records: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """Return a description of each regression of the given records with respect to the baseline.
+
+    A stage time or the peak memory regresses if it exceeds the baseline by more than the relative tolerance (and by
+    more than 10ms or 1MiB, respectively, to ignore noise); the objective value regresses if it is worse than the
+    baseline objective value and the node count if it exceeds the baseline node count by more than the tolerance.
+    """
+    regressions = []
+    for key, record in records.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        for stage in STAGES:
+            value, reference_value = record['times'][stage], reference['times'][stage]
+            if value > reference_value * (1. + tolerance) and value - reference_value > 0.01:
+                regressions.append(f'{key}: {stage} time {value:.3f}s (baseline {reference_value:.3f}s)')
+        if record['memory'] > reference['memory'] * (1. + tolerance) and record['memory'] - reference['memory'] > 1.:
+            regressions.append(f'{key}: peak memory {record["memory"]:.0f} MiB (baseline {reference["memory"]:.0f} MiB)')
+        if reference['objective'] is not None and (record['objective'] is None or
+                                                   record['objective'] > reference['objective'] + 1e-6):
+            regressions.append(f'{key}: objective {record["objective"]} (baseline {reference["objective"]})')
+        if record['nodes'] > reference['nodes'] * (1. + tolerance) and record['nodes'] - reference['nodes'] > 10:
+            regressions.append(f'{key}: nodes {record["nodes"]} (baseline {reference["nodes"]})')
+    return regressions
+
+
+def run_stage_benchmark(instances: List[tuple], formulations: List[str], time_limit: float) -> Dict[str, dict]:
+    """Benchmark the stages of the given (name, file) instances and print one line per instance and formulation."""
+    records = dict()
+    print(f'{"instance":<40}{"formulation":<12}' + ''.join(f'{stage:>10}' for stage in STAGES) +
+          f'{"memory":>12}{"objective":>12}{"bound":>12}{"gap":>9}{"nodes":>10}')
+    for name, filepath in instances:
+        for formulation in formulations:
+            record = benchmark_stages(filepath, formulation, time_limit)
+            records[f'{name}/{formulation}'] = record
+            objective = float('nan') if record['objective'] is None else record['objective']
+            gap = float('nan') if record['gap'] is None else record['gap']
+            print(f'{name:<40}{formulation:<12}' + ''.join(f'{record["times"][stage]:>9.3f}s' for stage in STAGES) +
+                  f'{record["memory"]:>8.0f} MiB{objective:>12.1f}{record["bound"]:>12.1f}{gap:>9.1%}'
+                  f'{record["nodes"]:>10}')
+    return records
+
+
+cmd_parser = ArgumentParser(description='Benchmark the mip formulations of the lot sizing problem.')
+cmd_parser.add_argument('files', metavar='input_file', type=str, nargs='*',
+                        help='Files containing the input data (default: instances/*.txt)')
+cmd_parser.add_argument('--formulations', choices=tuple(FORMULATIONS), nargs='+', default=list(FORMULATIONS),
+                        help='Formulations to benchmark')
+cmd_parser.add_argument('-t', '--time-limit', metavar='seconds', type=float, default=60.,
+                        help='Time limit per solve')
+cmd_parser.add_argument('--build', action='store_true',
+                        help='Only benchmark model construction (time and peak memory) of the standard formulation')
+cmd_parser.add_argument('--build-methods', choices=BUILD_METHODS, nargs='+', default=list(BUILD_METHODS),
+                        help='Construction methods to benchmark')
+cmd_parser.add_argument('--cp-sat', action='store_true',
+                        help='Compare the time to optimality of SCIP on the formulations with CP-SAT on its model')
+cmd_parser.add_argument('--workers', metavar='num_workers', type=int, nargs='+', default=[1, 8],
+                        help='Numbers of CP-SAT search workers to benchmark')
+cmd_parser.add_argument('--stages', action='store_true',
+                        help='Benchmark the stages read, build, solve and schedule extraction (time and peak memory) '
+                             'together with objective value, gap and node count')
+cmd_parser.add_argument('--baseline', metavar='baseline_file', type=str, default=None,
+                        help='Compare the stage benchmark against the given baseline and fail on regressions')
+cmd_parser.add_argument('--save-baseline', metavar='baseline_file', type=str, default=None,
+                        help='Store the results of the stage benchmark as baseline in the given file')
+cmd_parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Relative tolerance of the baseline comparison')
+cmd_parser.add_argument('--incremental', metavar='num_perturbations', type=int, default=None,
+                        help='Compare re-solving the standard formulation in place after each of the given number of '
+                             'random demand perturbations with building and solving it from scratch')
+cmd_parser.add_argument('--synthetic', metavar='TYPESxPERIODS', type=str, nargs='*', default=[],
+                        help='Additionally benchmark random instances of the given sizes, e.g., 20x500')
+cmd_parser.add_argument('--density', type=float, default=0.5,
+                        help='Fraction of time periods with a demand in random instances')
+cmd_parser.add_argument('--costs', choices=COST_STRUCTURES, default='random',
+                        help='Structure of the transition costs of random instances')
+cmd_parser.add_argument('--seed', type=int, default=0,
+                        help='Seed of random instances')
+
+if __name__ == '__main__':
+    cmd_args = cmd_parser.parse_args()
+    files = [(file, file) for file in cmd_args.files or sorted(glob('instances/*.txt'))]
+    directory = tempfile.TemporaryDirectory()
+    for size in cmd_args.synthetic:
+        num_types, num_time_periods = (int(value) for value in size.split('x'))
+        filepath = os.path.join(directory.name, f'{size}.txt')
+        generate_input(num_types, num_time_periods, demand_density=cmd_args.density, cost_structure=cmd_args.costs,
+                       seed=cmd_args.seed).write_file(filepath)
+        files.append((f'synthetic {size} {cmd_args.costs} d={cmd_args.density} s={cmd_args.seed}', filepath))
+    instances = [(name, Input.read(filepath)) for name, filepath in files]
+    if cmd_args.cp_sat:
+        print(f'{"instance":<40}{"solver":<16}{"objective":>12}{"bound":>12}{"time":>10}{"optimal":>9}')
+        for name, prob_input in instances:
+            results = [(f'scip {formulation}', benchmark_formulation(prob_input, formulation, cmd_args.time_limit))
+                       for formulation in cmd_args.formulations]
+            results += [(f'cp-sat {num_workers}w', benchmark_cp_sat(prob_input, num_workers, cmd_args.time_limit))
+                        for num_workers in cmd_args.workers]
+            for solver_name, result in results:
+                print(f'{name:<40}{solver_name:<16}{result["objective"]:>12.1f}{result["bound"]:>12.1f}'
+                      f'{result["time"]:>9.2f}s{str(result["optimal"]):>9}')
+    elif cmd_args.incremental is not None:
+        print(f'{"instance":<40}{"initial":>10}{"fresh":>10}{"incremental":>13}{"speedup":>9}{"optimal":>9}'
+              f'{"mismatches":>12}')
+        for name, prob_input in instances:
+            result = benchmark_incremental(prob_input, cmd_args.incremental, cmd_args.time_limit, cmd_args.seed)
+            print(f'{name:<40}{result["initial"]:>9.3f}s{result["fresh"]:>9.3f}s{result["incremental"]:>12.3f}s'
+                  f'{result["fresh"] / result["incremental"]:>8.1f}x{result["compared"]:>9}{result["mismatches"]:>12}')
+    elif cmd_args.stages:
+        records = run_stage_benchmark(files, cmd_args.formulations, cmd_args.time_limit)
+        if cmd_args.save_baseline is not None:
+            with open(cmd_args.save_baseline, 'w') as file:
+                json.dump(records, file, indent=1, sort_keys=True)
+        if cmd_args.baseline is not None:
+            with open(cmd_args.baseline, 'r') as file:
+                regressions = compare_to_baseline(records, json.load(file), cmd_args.tolerance)
+            for regression in regressions:
+                print(f'Regression: {regression}')
+            if regressions:
+                sys.exit(1)
+            print('No regressions with respect to baseline.')
+    elif cmd_args.build:
+        print(f'{"instance":<40}{"method":<14}{"vars":>10}{"cons":>10}{"time":>10}{"memory":>12}')
+        for name, prob_input in instances:
+            for method in cmd_args.build_methods:
+                result = benchmark_build(prob_input, method)
+                print(f'{name:<40}{method:<14}{result["variables"]:>10}{result["constraints"]:>10}'
+                      f'{result["time"]:>9.2f}s{result["memory"]:>8.0f} MiB')
+    else:
+        print(f'{"instance":<40}{"formulation":<12}{"vars":>8}{"cons":>8}{"root bound":>12}{"objective":>12}'
+              f'{"bound":>12}{"root gap":>10}{"nodes":>10}{"time":>10}')
+        for name, prob_input in instances:
+            for formulation in cmd_args.formulations:
+                result = benchmark_formulation(prob_input, formulation, cmd_args.time_limit)
+                print(f'{name:<40}{formulation:<12}{result["variables"]:>8}{result["constraints"]:>8}'
+                      f'{result["root_bound"]:>12.1f}{result["objective"]:>12.1f}{result["bound"]:>12.1f}'
+                      f'{result["root_gap"]:>10.1%}{result["nodes"]:>10}{result["time"]:>9.2f}s')
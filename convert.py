@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+
+from argparse import ArgumentParser
+
+from lot_sizing.input import Input
+
+cmd_parser = ArgumentParser(
+    description='Convert instances of the lot sizing problem between the text format and the binary (.npz) format; '
+                'files ending with .npz are in binary format.')
+cmd_parser.add_argument('input_file', type=str, help='File containing the input data')
+cmd_parser.add_argument('output_file', type=str, help='File the input data is written to')
+
+if __name__ == '__main__':
+    cmd_args = cmd_parser.parse_args()
+    Input.read(cmd_args.input_file).write(cmd_args.output_file)
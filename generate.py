@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+
+from argparse import ArgumentParser
+
+from lot_sizing.generator import COST_STRUCTURES, generate_input
+
+cmd_parser = ArgumentParser(description='Generate a random feasible instance of the lot sizing problem.')
+cmd_parser.add_argument('-o', '--output', metavar='output_file', type=str, required=True,
+                        help='File the instance is written to')
+cmd_parser.add_argument('-n', '--num-time-periods', metavar='periods', type=int, required=True,
+                        help='Number of time periods')
+cmd_parser.add_argument('-m', '--num-types', metavar='types', type=int, required=True,
+                        help='Number of machine types')
+cmd_parser.add_argument('-d', '--density', type=float, default=0.5,
+                        help='Fraction of time periods with a demand')
+cmd_parser.add_argument('-c', '--costs', choices=COST_STRUCTURES, default='random',
+                        help='Structure of the transition costs')
+cmd_parser.add_argument('--max-transition-cost', type=int, default=100,
+                        help='Maximal transition cost')
+cmd_parser.add_argument('--inventory-cost', type=int, default=1,
+                        help='Inventory cost per item per time period')
+cmd_parser.add_argument('--mean-slack', metavar='periods', type=float, default=5.,
+                        help='Mean number of time periods between production and deadline')
+cmd_parser.add_argument('--seed', type=int, default=0,
+                        help='Seed of the random number generator')
+
+if __name__ == '__main__':
+    cmd_args = cmd_parser.parse_args()
+    prob_input = generate_input(cmd_args.num_types, cmd_args.num_time_periods, demand_density=cmd_args.density,
+                                cost_structure=cmd_args.costs, max_transition_cost=cmd_args.max_transition_cost,
+                                inventory_cost=cmd_args.inventory_cost, mean_slack=cmd_args.mean_slack,
+                                seed=cmd_args.seed)
+    prob_input.write_file(cmd_args.output)
@@ -0,0 +1,142 @@
+"""Module responsible for solving batches of instances in parallel."""
+
+import glob
+import multiprocessing
+import os
+import signal
+import time
+import traceback
+from multiprocessing.connection import wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from lot_sizing.cache import SolutionCache
+from lot_sizing.input import BINARY_SUFFIX, Input
+from lot_sizing.metrics import RunMetrics
+from lot_sizing.solve import SolveResult, SolverSettings, compute_gap, solve_instance
+
+
+def find_instances(pattern: str) -> List[str]:
+    """Returns the instance files matching the given glob pattern, or all text and binary (.npz) files if a directory
+    is given."""
+    if os.path.isdir(pattern):
+        return sorted(path for suffix in ('.txt', BINARY_SUFFIX) for path in
+                      glob.glob(os.path.join(pattern, '*' + suffix)) if os.path.isfile(path))
+    return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+
+
+def solve_record(status: str, wall_time: float, result: Optional[SolveResult] = None, error: Optional[str] = None,
+                 times: Optional[Dict[str, float]] = None) -> Dict:
+    """Returns the JSON record of a solve (see :func:`solve_batch`)."""
+    record = {'status': status, 'schedule': None, 'objective': None, 'bound': None, 'gap': None,
+              'engine': None, 'backend': None, 'optimal': False, 'wall_time': round(wall_time, 3),
+              'times': {stage: round(stage_time, 3) for stage, stage_time in (times or dict()).items()}}
+    if result is not None:
+        record.update(schedule=result.schedule, objective=result.objective, bound=result.bound,
+                      gap=compute_gap(result.objective, result.bound), engine=result.engine, backend=result.backend,
+                      optimal=result.optimal)
+    if error is not None:
+        record['error'] = error
+    return record
+
+
+def start_worker(target, args: Tuple) -> multiprocessing.Process:
+    """Starts a worker process running target with the given arguments.
+
+    The worker is not daemonic, so that it may start processes itself (e.g., raced backends or the workers of the
+    rolling engine), and leads a process group of its own, so that :func:`kill_worker` also kills these processes.
+    """
+    process = multiprocessing.Process(target=_run_in_process_group, args=(target, args))
+    process.start()
+    return process
+
+
+def _run_in_process_group(target, args: Tuple):
+    """Runs target with the given arguments as leader of a new process group; run in a worker."""
+    os.setpgrp()
+    target(*args)
+
+
+def kill_worker(process: multiprocessing.Process):
+    """Kills the given worker process (see :func:`start_worker`) together with the processes it started."""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        # the worker has not become leader of its process group yet
+        process.kill()
+    process.join()
+
+
+def _solve_file(filepath: str, settings: SolverSettings, cache_dir: Optional[str], cache_size: int, connection):
+    """Solves the instance given by file and sends the result (or the error) together with the stage times via
+    connection; run in a worker."""
+    metrics = RunMetrics()
+    try:
+        cache = None if cache_dir is None else SolutionCache(cache_dir, max_size=cache_size)
+        with metrics.stage('read'):
+            prob_input = Input.read(filepath)
+        result = solve_instance(prob_input, settings, cache=cache, metrics=metrics)
+        connection.send(('ok' if result.schedule is not None else 'no_solution', result, None, metrics.times))
+    except Exception as error:
+        connection.send(('error', None, ''.join(traceback.format_exception_only(type(error), error)).strip(),
+                         metrics.times))
+    finally:
+        connection.close()
+
+
+def solve_batch(filepaths: List[str], settings: SolverSettings, num_workers: Optional[int] = None,
+                timeout: Optional[float] = None, cache_dir: Optional[str] = None,
+                cache_size: int = 256 * 2 ** 20) -> Iterator[Dict]:
+    """Solves the given instance files in parallel and yields a record per instance as soon as its solve finishes.
+
+    Each instance is solved in a process of its own so that a crashing solve or a solve exceeding the timeout (which is
+    killed) does not affect the other solves. A record contains the file, the status (`ok`, `no_solution`, `error`,
+    `crashed` or `timeout`), the schedule, objective value, bound, relative gap, engine, optimality flag, wall time and
+    the time of each stage (see :class:`lot_sizing.metrics.RunMetrics`).
+
+    :param filepaths: the instance files to solve
+    :param settings: the settings used for each instance
+    :param num_workers: the maximal number of simultaneous solves (number of CPUs if None)
+    :param timeout: the wall time (in seconds) after which a solve is killed (unlimited if None)
+    :param cache_dir: the directory of the solution cache (no cache is used if None)
+    :param cache_size: the maximal size (in bytes) of the solution cache
+    """
+    num_workers = num_workers or os.cpu_count() or 1
+    pending = list(reversed(filepaths))
+    running = dict()
+    try:
+        while pending or running:
+            while pending and len(running) < num_workers:
+                filepath = pending.pop()
+                receiver, sender = multiprocessing.Pipe(duplex=False)
+                process = start_worker(_solve_file, (filepath, settings, cache_dir, cache_size, sender))
+                sender.close()
+                running[receiver] = (filepath, process, time.perf_counter())
+            wait_time = None
+            if timeout is not None:
+                next_timeout = min(start_time + timeout for _, _, start_time in running.values())
+                wait_time = max(next_timeout - time.perf_counter(), 0.)
+            ready = wait(list(running), timeout=wait_time)
+            for receiver in ready:
+                filepath, process, start_time = running.pop(receiver)
+                try:
+                    status, result, error, times = receiver.recv()
+                except EOFError:
+                    # kills the processes the crashed worker left behind
+                    kill_worker(process)
+                    status, result, error, times = 'crashed', None, f'Worker exited with code {process.exitcode}.', None
+                receiver.close()
+                process.join()
+                yield {'file': filepath, **solve_record(status, time.perf_counter() - start_time, result, error, times)}
+            now = time.perf_counter()
+            for receiver, (filepath, process, start_time) in list(running.items()):
+                if timeout is not None and now - start_time >= timeout:
+                    kill_worker(process)
+                    receiver.close()
+                    del running[receiver]
+                    yield {'file': filepath,
+                           **solve_record('timeout', now - start_time, error=f'Solve exceeded timeout of {timeout}s.')}
+    finally:
+        # e.g., the records are no longer consumed
+        for receiver, (_, process, _) in running.items():
+            kill_worker(process)
+            receiver.close()
@@ -0,0 +1,211 @@
+"""Module responsible for caching computed schedules on disk."""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import List, Optional
+
+from lot_sizing.dynamic_program import DpCertificate
+from lot_sizing.input import Input
+from lot_sizing.solve import SolveResult, SolverSettings
+
+
+def input_digest(prob_input: Input) -> str:
+    """Returns a hash of the data of the given instance."""
+    digest = hashlib.sha256()
+    digest.update(f'{prob_input.num_time_periods} {prob_input.num_types} {prob_input.inventory_cost}\n'.encode())
+    digest.update(prob_input.demand.astype('<i1').tobytes())
+    digest.update(prob_input.transition_cost.astype('<i8').tobytes())
+    return digest.hexdigest()
+
+
+# settings which may affect the result of each engine apart from its time limit
+MIP_SETTINGS = ('formulation', 'warm_start', 'relative_gap', 'backends')
+RELEVANT_SETTINGS = {'auto': ('memory_limit',) + MIP_SETTINGS,
+                     'mip': MIP_SETTINGS,
+                     'heuristic': ('method', 'seed'),
+                     'dp': (),
+                     'cp': ('warm_start', 'relative_gap', 'num_threads'),
+                     'rolling': ('formulation', 'backends', 'window_size', 'window_overlap', 'window_workers')}
+# time limit of each engine (None if the engine has none)
+TIME_LIMITS = {'auto': 'mip_time_limit',
+               'mip': 'mip_time_limit',
+               'heuristic': 'time_limit',
+               'dp': None,
+               'cp': 'mip_time_limit',
+               'rolling': 'mip_time_limit'}
+
+
+def settings_digest(settings: SolverSettings) -> str:
+    """Returns a hash of the engine of the given settings together with the settings relevant for the engine; the time
+    limit is not part of the hash (see :meth:`SolutionCache.get`)."""
+    relevant = {name: getattr(settings, name) for name in RELEVANT_SETTINGS[settings.engine]}
+    return hashlib.sha256(json.dumps([settings.engine, relevant], sort_keys=True).encode()).hexdigest()
+
+
+def within_time_limit(stored: dict, settings: SolverSettings) -> bool:
+    """Returns whether the time limit of the given stored settings is at least the time limit of the given settings,
+    i.e., whether a result computed under the stored settings is as good as a result computed under the given ones."""
+    name = TIME_LIMITS[settings.engine]
+    if name is None or stored.get(name) is None:
+        return True
+    return getattr(settings, name) is not None and getattr(settings, name) <= stored[name]
+
+
+class SolutionCache:
+    """Content-addressed on-disk cache of computed schedules.
+
+    An entry is keyed by the hash of the instance data together with the hash of the settings and consists of the
+    settings and the result (schedule, objective value, bound and whether it is proven optimal) as JSON file. Entries
+    of the same instance reside in a common directory so that schedules computed under other settings can be reused as
+    start schedules. If the overall size of the cache exceeds its maximal size, the least recently used entries are
+    evicted.
+    """
+
+    def __init__(self, directory: str, max_size: int = 256 * 2 ** 20):
+        """
+        :param directory: the directory containing the cache
+        :param max_size: the maximal overall size (in bytes) of the cache
+        """
+        self.directory = directory
+        self.max_size = max_size
+
+    @staticmethod
+    def default_directory() -> str:
+        """Returns the default cache directory (within XDG_CACHE_HOME or ~/.cache)."""
+        return os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser(os.path.join('~', '.cache'))),
+                            'lot_sizing')
+
+    def _entry_path(self, prob_input: Input, settings: SolverSettings) -> str:
+        """Returns the path of the entry without file extension."""
+        return os.path.join(self.directory, input_digest(prob_input), settings_digest(settings))
+
+    def get(self, prob_input: Input, settings: SolverSettings) -> Optional[SolveResult]:
+        """Returns the result stored for the given instance and settings (or None if there is none).
+
+        A proven optimal result is returned under any time limit, any other result only if it was computed under at
+        least the time limit of the given settings.
+        """
+        path = self._entry_path(prob_input, settings)
+        try:
+            with open(path + '.json', 'r') as file:
+                entry = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        result = entry['result']
+        if not result['optimal'] and not within_time_limit(entry['settings'], settings):
+            return None
+        self._touch(path)
+        if result['certificate'] is not None:
+            result['certificate'] = DpCertificate(*result['certificate'])
+        return SolveResult(**result)
+
+    def best_schedule(self, prob_input: Input) -> Optional[List[int]]:
+        """Returns the cheapest feasible schedule stored for the given instance under any settings."""
+        directory = os.path.join(self.directory, input_digest(prob_input))
+        if not os.path.isdir(directory):
+            return None
+        best_schedule, best_cost = None, None
+        for name in os.listdir(directory):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(directory, name), 'r') as file:
+                    schedule = json.load(file)['result']['schedule']
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            if schedule is None or len(schedule) != prob_input.num_time_periods or not prob_input.is_feasible(
+                    schedule):
+                continue
+            cost = prob_input.compute_model_costs(schedule)
+            if best_cost is None or cost < best_cost:
+                best_schedule, best_cost = schedule, cost
+        return best_schedule
+
+    def optimal_objective(self, prob_input: Input) -> Optional[float]:
+        """Returns the objective value of an optimal result stored for the given instance (or None if there is none)."""
+        directory = os.path.join(self.directory, input_digest(prob_input))
+        if not os.path.isdir(directory):
+            return None
+        for name in os.listdir(directory):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(directory, name), 'r') as file:
+                    result = json.load(file)['result']
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            if result['optimal'] and result['objective'] is not None:
+                return result['objective']
+        return None
+
+    def put(self, prob_input: Input, settings: SolverSettings, result: SolveResult):
+        """Stores the given result for the given instance and settings and evicts entries if necessary."""
+        path = self._entry_path(prob_input, settings)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {'settings': settings._asdict(), 'result': result._asdict()}
+        # a file of its own per writer, so that processes sharing the cache do not write into the same file
+        with tempfile.NamedTemporaryFile('w', dir=os.path.dirname(path), prefix=os.path.basename(path),
+                                         suffix='.json.tmp', delete=False) as file:
+            json.dump(entry, file)
+        os.replace(file.name, path + '.json')
+        self.evict()
+
+    def _touch(self, path: str):
+        """Marks the entry with the given path as recently used."""
+        try:
+            os.utime(path + '.json')
+        except FileNotFoundError:
+            pass
+
+    def _entries(self):
+        """Returns (last access time, size, path) of all entries; entries removed concurrently (e.g., evicted by another
+        process sharing the cache) are skipped."""
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for instance in os.listdir(self.directory):
+            directory = os.path.join(self.directory, instance)
+            try:
+                names = os.listdir(directory)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            for name in names:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(directory, name[:-len('.json')])
+                try:
+                    last_access = os.path.getmtime(path + '.json')
+                    size = os.path.getsize(path + '.json')
+                except FileNotFoundError:
+                    continue
+                entries.append((last_access, size, path))
+        return entries
+
+    def size(self) -> int:
+        """Returns the overall size (in bytes) of the cache."""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Removes least recently used entries until the overall size does not exceed the maximal size."""
+        entries = sorted(self._entries())
+        overall_size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if overall_size <= self.max_size:
+                break
+            try:
+                os.remove(path + '.json')
+            except FileNotFoundError:
+                pass
+            overall_size -= size
+            try:
+                os.rmdir(os.path.dirname(path))
+            except OSError:
+                # the directory still holds other entries or was removed concurrently
+                pass
+
+    def clear(self):
+        """Removes all entries."""
+        shutil.rmtree(self.directory, ignore_errors=True)
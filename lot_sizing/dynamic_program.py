@@ -0,0 +1,209 @@
+"""Module responsible for solving the lot sizing problem exactly via dynamic programming."""
+
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from lot_sizing.heuristic import earliest_deadline_schedule
+from lot_sizing.input import Input, InputError
+
+INFINITY = np.int64(2 ** 60)
+
+
+class DpCertificate(NamedTuple):
+    """Optimality certificate of a schedule computed by the dynamic program.
+
+    The cost is the optimal value of the dynamic program; it coincides with the costs of the schedule as computed by
+    :meth:`lot_sizing.input.Input.compute_model_costs`, i.e., the objective value of the mip and cp models.
+    """
+    cost: int
+    upper_bound: int
+    num_states: int
+    num_dominated: int
+    memory: int
+
+
+class DynamicProgramSolver:
+    """Solves the lot sizing problem exactly by dynamic programming over time periods.
+
+    A state at the end of time period $p$ consists of the machine type the machine is configured for (or none before
+    the first production) and the number of produced items of each machine type, capped at its overall demand (further
+    items are stocked until the last time period). As in the mip and cp models, the machine may be reconfigured in an
+    idle time period at the corresponding transition cost. The counts are encoded as a mixed-radix integer key and each
+    layer of the dynamic program is stored as an array of keys together with a (num_keys x (num_types + 1)) cost matrix,
+    one column per configuration.
+
+    States are pruned if they violate the cumulative demand, if the remaining items cannot be produced in the remaining
+    time periods, if they are more expensive than the earliest deadline schedule, or if they are dominated by a state
+    with the same counts whose cheaper cost outweighs any difference in future transition costs.
+    """
+
+    def __init__(self, prob_input: Input, memory_limit: int = 2 ** 30):
+        """
+        :param prob_input: the input problem instance to consider
+        :param memory_limit: the maximal number of bytes used for storing the states
+        """
+        if np.any(prob_input.transition_cost < 0) or prob_input.inventory_cost < 0:
+            raise InputError('Dynamic program expects non-negative costs.')
+        self.prob_input = prob_input
+        self.memory_limit = memory_limit
+        num_types = prob_input.num_types
+        self._radix = prob_input.num_demands.astype(np.int64) + 1
+        self._stride = np.concatenate(([1], np.cumprod(self._radix)[:-1])).astype(np.int64)
+        self._transition_cost = np.zeros((num_types + 1, num_types), dtype=np.int64)
+        self._transition_cost[:num_types] = prob_input.transition_cost
+        self._transition_cost[np.arange(num_types), np.arange(num_types)] = 0
+        # dominance[a, b] is the maximal extra transition cost of continuing from a instead of from b
+        self._dominance = (self._transition_cost[:, None, :] - self._transition_cost[None, :, :]).max(axis=2)
+        np.fill_diagonal(self._dominance, INFINITY)
+
+    @staticmethod
+    def estimate_memory(prob_input: Input) -> int:
+        """Returns an upper bound on the number of bytes needed for storing the states of the dynamic program.
+
+        In time period $p$, the count of machine type $t$ lies between its cumulative demand and the cumulative demand
+        plus the number of time periods not needed for producing the cumulative demand of all machine types.
+
+        :param prob_input: the input problem instance to consider
+        """
+        num_states = 0
+        for time_period in range(prob_input.num_time_periods):
+            cumulative_demand = prob_input.cumulative_demand[:, time_period].astype(np.int64)
+            slack = time_period + 1 - int(cumulative_demand.sum())
+            if slack < 0:
+                return 0
+            ahead = np.minimum(slack, prob_input.num_demands - cumulative_demand)
+            num_states += float(np.prod(ahead + 1., dtype=float))
+        return int(num_states * (prob_input.num_types + 1) * DynamicProgramSolver._entry_size())
+
+    @staticmethod
+    def _entry_size() -> int:
+        """Returns the number of bytes stored per state, i.e., the parent index and the parent code."""
+        return np.dtype(np.int32).itemsize + np.dtype(np.int16).itemsize
+
+    def solve(self) -> Tuple[List[int], DpCertificate]:
+        """Returns an optimal schedule together with its optimality certificate."""
+        prob_input = self.prob_input
+        num_types, num_time_periods = prob_input.num_types, prob_input.num_time_periods
+        if float(np.prod(self._radix, dtype=float)) >= 2 ** 62 or num_types >= 127:
+            raise MemoryError('State space of the dynamic program exceeds the supported key range.')
+        upper_bound_schedule = earliest_deadline_schedule(prob_input)
+        upper_bound = prob_input.compute_model_costs(upper_bound_schedule)
+        # max_remaining[p] is the maximal number of items which can be produced from time period p on
+        max_remaining = np.cumsum((np.array(upper_bound_schedule) >= 0)[::-1])[::-1].tolist() + [0]
+        keys = np.zeros(1, dtype=np.int64)
+        costs = np.full((1, num_types + 1), INFINITY, dtype=np.int64)
+        costs[0, num_types] = 0
+        parents: List[Tuple[np.ndarray, np.ndarray]] = []
+        num_states, num_dominated, memory = 1, 0, 0
+        for time_period in range(num_time_periods):
+            keys, costs, parent_index, parent_code, dominated = self._expand(
+                keys, costs, time_period, upper_bound, max_remaining[time_period + 1])
+            num_states += int(np.count_nonzero(costs < INFINITY))
+            num_dominated += dominated
+            memory += parent_index.nbytes + parent_code.nbytes
+            if memory > self.memory_limit:
+                raise MemoryError(f'Dynamic program exceeds memory limit of {self.memory_limit} bytes.')
+            parents.append((parent_index, parent_code))
+            if len(keys) == 0:
+                raise InputError('Given instance does not admit a feasible schedule.')
+        index, last = np.unravel_index(np.argmin(costs), costs.shape)
+        cost = int(costs[index, last])
+        schedule = self._reconstruct(parents, int(index), int(last))
+        if not prob_input.is_feasible(schedule) or prob_input.compute_model_costs(schedule) != cost:
+            raise RuntimeError(f'Computed schedule {schedule} does not match optimal value {cost}.')
+        return schedule, DpCertificate(cost, upper_bound, num_states, num_dominated, memory)
+
+    def _expand(self, keys: np.ndarray, costs: np.ndarray, time_period: int, upper_bound: int, max_remaining: int):
+        """Computes the layer of time period from the layer of the previous time period.
+
+        The parent code of a state is the configuration of its parent, offset by num_types + 1 if the time period is
+        idle.
+
+        :return: the keys and costs of the new layer, the parent index and parent code of each of its states as well as
+         the number of dominated states
+        """
+        prob_input = self.prob_input
+        num_types = prob_input.num_types
+        idle_offset = num_types + 1
+        indices, lasts = np.nonzero(costs < INFINITY)
+        values = costs[indices, lasts]
+        counts = (keys[indices, None] // self._stride) % self._radix
+        new_keys, new_lasts, new_costs, parent_indices, parent_codes = [keys[indices]], [lasts], [values], [indices], [
+            idle_offset + lasts]
+        # reconfigurations of the machine in an idle time period
+        configured = lasts < num_types
+        for machine_type in range(num_types):
+            changed = configured & (lasts != machine_type)
+            new_keys.append(keys[indices[changed]])
+            new_lasts.append(np.full(np.count_nonzero(changed), machine_type))
+            new_costs.append(values[changed] + self._transition_cost[lasts[changed], machine_type])
+            parent_indices.append(indices[changed])
+            parent_codes.append(idle_offset + lasts[changed])
+        for machine_type in range(num_types):
+            ranks = counts[:, machine_type]
+            deadlines = prob_input.deadlines[machine_type, ranks].astype(np.int64)
+            feasible = deadlines >= time_period
+            extra = ranks >= prob_input.num_demands[machine_type]
+            new_keys.append((keys[indices] + np.where(extra, 0, self._stride[machine_type]))[feasible])
+            new_lasts.append(np.full(np.count_nonzero(feasible), machine_type))
+            new_costs.append((values + prob_input.inventory_cost * (deadlines - time_period) +
+                              self._transition_cost[lasts, machine_type])[feasible])
+            parent_indices.append(indices[feasible])
+            parent_codes.append(lasts[feasible])
+        new_keys, new_lasts, new_costs, parent_indices, parent_codes = (
+            np.concatenate(array) for array in (new_keys, new_lasts, new_costs, parent_indices, parent_codes))
+        # cumulative demand, remaining capacity and upper bound pruning
+        new_counts = (new_keys[:, None] // self._stride) % self._radix
+        valid = np.all(new_counts >= prob_input.cumulative_demand[:, time_period], axis=1)
+        valid &= prob_input.overall_demand - np.minimum(new_counts, prob_input.num_demands).sum(axis=1) <= max_remaining
+        valid &= new_costs <= upper_bound
+        new_keys, new_lasts, new_costs, parent_indices, parent_codes = (
+            array[valid] for array in (new_keys, new_lasts, new_costs, parent_indices, parent_codes))
+        # keep the cheapest state per (key, configuration)
+        order = np.lexsort((new_costs, new_lasts, new_keys))
+        new_keys, new_lasts, new_costs, parent_indices, parent_codes = (
+            array[order] for array in (new_keys, new_lasts, new_costs, parent_indices, parent_codes))
+        first = np.ones(len(new_keys), dtype=bool)
+        first[1:] = (new_keys[1:] != new_keys[:-1]) | (new_lasts[1:] != new_lasts[:-1])
+        layer_keys, rows = np.unique(new_keys[first], return_inverse=True)
+        layer_costs = np.full((len(layer_keys), num_types + 1), INFINITY, dtype=np.int64)
+        layer_parent_index = np.zeros((len(layer_keys), num_types + 1), dtype=np.int32)
+        layer_parent_code = np.zeros((len(layer_keys), num_types + 1), dtype=np.int16)
+        columns = new_lasts[first]
+        layer_costs[rows, columns] = new_costs[first]
+        layer_parent_index[rows, columns] = parent_indices[first]
+        layer_parent_code[rows, columns] = parent_codes[first]
+        # dominance pruning among states with the same counts
+        best_other = (layer_costs[:, :, None] + self._dominance[None, :, :]).min(axis=1)
+        dominated = (best_other < layer_costs) & (layer_costs < INFINITY)
+        layer_costs[dominated] = INFINITY
+        return layer_keys, layer_costs, layer_parent_index, layer_parent_code, int(np.count_nonzero(dominated))
+
+    def _reconstruct(self, parents: List[Tuple[np.ndarray, np.ndarray]], index: int, last: int) -> List[int]:
+        """Returns the schedule leading to the state with given index and configuration of the final layer."""
+        idle_offset = self.prob_input.num_types + 1
+        schedule = [-1] * self.prob_input.num_time_periods
+        for time_period in reversed(range(self.prob_input.num_time_periods)):
+            parent_index, parent_code = parents[time_period]
+            code = int(parent_code[index, last])
+            index = int(parent_index[index, last])
+            if code < idle_offset:
+                schedule[time_period] = last
+            last = code % idle_offset
+        return schedule
+
+
+def solve_exactly(prob_input: Input, memory_limit: int = 2 ** 30) -> Optional[Tuple[List[int], DpCertificate]]:
+    """Returns an optimal schedule and its certificate, or None if the dynamic program does not fit into memory.
+
+    :param prob_input: the input problem instance to consider
+    :param memory_limit: the maximal number of bytes used for storing the states
+    :raises InputError: if the instance does not admit a feasible schedule or has negative costs
+    """
+    if DynamicProgramSolver.estimate_memory(prob_input) > memory_limit:
+        return None
+    try:
+        return DynamicProgramSolver(prob_input, memory_limit).solve()
+    except MemoryError:
+        return None
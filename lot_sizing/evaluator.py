@@ -0,0 +1,187 @@
+"""Module responsible for evaluating moves on a schedule incrementally."""
+
+from bisect import bisect_left
+from typing import Dict, List, NamedTuple, Tuple
+
+from lot_sizing.input import Input, InputError
+
+
+class MoveDelta(NamedTuple):
+    """Change of costs caused by a move together with the feasibility of the resulting schedule."""
+    transition_cost: int
+    inventory_cost: int
+    feasible: bool
+
+    @property
+    def cost(self) -> int:
+        """Returns the change of the overall costs."""
+        return self.transition_cost + self.inventory_cost
+
+
+class ScheduleEvaluator:
+    """Maintains a schedule together with its costs and feasibility under swap, insert and shift moves.
+
+    Each move rearranges the entries of a range of time periods. As the number of produced items of each machine type
+    within that range is preserved, the ranks of all productions (and thus the deadlines they are matched with) stay
+    the same; only the productions inside the range and the transitions to the closest productions outside the range
+    need to be reconsidered. Hence, evaluating and applying a move takes time proportional to the length of the range
+    (plus a logarithmic lookup of the neighbouring productions).
+    """
+
+    def __init__(self, prob_input: Input, schedule: List[int]):
+        if len(schedule) != prob_input.num_time_periods:
+            raise InputError(
+                f'Length of given schedule {len(schedule)} does not coincide with expected length '
+                f'{prob_input.num_time_periods}.')
+        self.prob_input = prob_input
+        self.schedule = [int(state) for state in schedule]
+        self._transition_cost = prob_input.transition_cost.tolist()
+        self._deadlines = prob_input.deadlines.tolist()
+        self._productions = [time_period for time_period, state in enumerate(self.schedule) if state >= 0]
+        self._positions = [[] for _ in range(prob_input.num_types)]
+        for time_period in self._productions:
+            self._positions[self.schedule[time_period]].append(time_period)
+        self._num_missing = sum(len(positions) < num_demands for positions, num_demands in
+                                zip(self._positions, prob_input.num_demands.tolist()))
+        self._num_late = self._count_late(0, self.schedule)
+        self.transition_cost = prob_input.compute_transition_cost(self.schedule)
+        self.inventory_cost = prob_input.compute_inventory_cost(self.schedule)
+
+    @property
+    def cost(self) -> int:
+        """Returns the overall costs of the current schedule."""
+        return self.transition_cost + self.inventory_cost
+
+    @property
+    def feasible(self) -> bool:
+        """Returns true if the current schedule is feasible. Otherwise, false."""
+        return self._num_missing == 0 and self._num_late == 0
+
+    def evaluate_swap(self, time_period: int, other_time_period: int) -> MoveDelta:
+        """Returns the effect of exchanging the entries of the two given time periods."""
+        return self._evaluate(*self._swap_range(time_period, other_time_period))
+
+    def apply_swap(self, time_period: int, other_time_period: int) -> MoveDelta:
+        """Exchanges the entries of the two given time periods and returns the effect."""
+        return self._apply(*self._swap_range(time_period, other_time_period))
+
+    def evaluate_insert(self, time_period: int, target_time_period: int) -> MoveDelta:
+        """Returns the effect of removing the entry of the given time period and re-inserting it at the target."""
+        return self.evaluate_shift(time_period, time_period + 1, target_time_period - time_period)
+
+    def apply_insert(self, time_period: int, target_time_period: int) -> MoveDelta:
+        """Removes the entry of the given time period, re-inserts it at the target and returns the effect."""
+        return self.apply_shift(time_period, time_period + 1, target_time_period - time_period)
+
+    def evaluate_shift(self, start: int, stop: int, offset: int) -> MoveDelta:
+        """Returns the effect of moving the block of time periods [start, stop) by offset time periods.
+
+        The entries displaced by the block fill the time periods vacated by it.
+        """
+        return self._evaluate(*self._shift_range(start, stop, offset))
+
+    def apply_shift(self, start: int, stop: int, offset: int) -> MoveDelta:
+        """Moves the block of time periods [start, stop) by offset time periods and returns the effect."""
+        return self._apply(*self._shift_range(start, stop, offset))
+
+    def _check_time_period(self, time_period: int):
+        """Raises an input error if given time period is out of range."""
+        if not 0 <= time_period < self.prob_input.num_time_periods:
+            raise InputError(
+                f'Given time period {time_period} expected to be between 0 and {self.prob_input.num_time_periods - 1}.')
+
+    def _swap_range(self, time_period: int, other_time_period: int):
+        """Returns the range of time periods affected by a swap together with its new entries."""
+        self._check_time_period(time_period)
+        self._check_time_period(other_time_period)
+        first, last = sorted((time_period, other_time_period))
+        entries = self.schedule[first:last + 1]
+        entries[0], entries[-1] = entries[-1], entries[0]
+        return first, last + 1, entries
+
+    def _shift_range(self, start: int, stop: int, offset: int):
+        """Returns the range of time periods affected by a block shift together with its new entries."""
+        if start >= stop:
+            raise InputError(f'Given block [{start}, {stop}) expected to be non-empty.')
+        self._check_time_period(start)
+        self._check_time_period(stop - 1)
+        self._check_time_period(start + offset)
+        self._check_time_period(stop - 1 + offset)
+        if offset >= 0:
+            return start, stop + offset, self.schedule[stop:stop + offset] + self.schedule[start:stop]
+        return start + offset, stop, self.schedule[start:stop] + self.schedule[start + offset:start]
+
+    def _evaluate(self, start: int, stop: int, entries: List[int]) -> MoveDelta:
+        """Returns the effect of replacing the entries of the time periods [start, stop) by given entries."""
+        return self._assess(start, stop, entries)[0]
+
+    def _assess(self, start: int, stop: int, entries: List[int]) -> Tuple[MoveDelta, int]:
+        """Returns the effect of replacing the entries of the time periods [start, stop) by given entries together
+        with the resulting number of late productions."""
+        old_entries = self.schedule[start:stop]
+        prev_state, next_state = self._neighbouring_states(start, stop)
+        transition_cost = self._sequence_cost(prev_state, entries, next_state) - self._sequence_cost(
+            prev_state, old_entries, next_state)
+        inventory_cost = (self._position_sum(start, old_entries) - self._position_sum(start, entries)) * \
+            self.prob_input.inventory_cost
+        num_late = self._num_late + self._count_late(start, entries) - self._count_late(start, old_entries)
+        return MoveDelta(transition_cost, inventory_cost, self._num_missing == 0 and num_late == 0), num_late
+
+    def _apply(self, start: int, stop: int, entries: List[int]) -> MoveDelta:
+        """Replaces the entries of the time periods [start, stop) by given entries and returns the effect."""
+        delta, self._num_late = self._assess(start, stop, entries)
+        new_positions: Dict[int, List[int]] = dict()
+        for time_period, state in enumerate(entries, start):
+            if state >= 0:
+                new_positions.setdefault(state, []).append(time_period)
+        for state, positions in new_positions.items():
+            type_positions = self._positions[state]
+            first = bisect_left(type_positions, start)
+            type_positions[first:first + len(positions)] = positions
+        first = bisect_left(self._productions, start)
+        productions = [time_period for time_period, state in enumerate(entries, start) if state >= 0]
+        self._productions[first:first + len(productions)] = productions
+        self.schedule[start:stop] = entries
+        self.transition_cost += delta.transition_cost
+        self.inventory_cost += delta.inventory_cost
+        return delta
+
+    def _neighbouring_states(self, start: int, stop: int):
+        """Returns the states of the last production before start and of the first production from stop on."""
+        first = bisect_left(self._productions, start)
+        last = bisect_left(self._productions, stop)
+        prev_state = self.schedule[self._productions[first - 1]] if first > 0 else -1
+        next_state = self.schedule[self._productions[last]] if last < len(self._productions) else -1
+        return prev_state, next_state
+
+    def _sequence_cost(self, prev_state: int, entries: List[int], next_state: int) -> int:
+        """Returns the transition cost of the productions in entries surrounded by given states."""
+        cost = 0
+        for state in entries + [next_state]:
+            if state == -1:
+                continue
+            if state != prev_state and prev_state != -1:
+                cost += self._transition_cost[prev_state][state]
+            prev_state = state
+        return cost
+
+    @staticmethod
+    def _position_sum(start: int, entries: List[int]) -> int:
+        """Returns the sum of the time periods of the productions in entries."""
+        return sum(time_period for time_period, state in enumerate(entries, start) if state >= 0)
+
+    def _count_late(self, start: int, entries: List[int]) -> int:
+        """Returns the number of productions in entries which are later than the deadline they are matched with."""
+        ranks = dict()
+        num_late = 0
+        for time_period, state in enumerate(entries, start):
+            if state < 0:
+                continue
+            rank = ranks.get(state)
+            if rank is None:
+                rank = bisect_left(self._positions[state], start)
+            ranks[state] = rank + 1
+            deadlines = self._deadlines[state]
+            if time_period > deadlines[min(rank, len(deadlines) - 1)]:
+                num_late += 1
+        return num_late
@@ -0,0 +1,83 @@
+"""Module responsible for generating random problem instances."""
+
+from typing import Optional
+
+import numpy as np
+
+from lot_sizing.input import Input, InputError
+
+COST_STRUCTURES = ('random', 'constant', 'euclidean')
+
+
+def generate_transition_cost(num_types: int, cost_structure: str = 'random', max_transition_cost: int = 100,
+                             rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """Returns a (num_types x num_types) transition cost matrix with zero diagonal.
+
+    The cost structure `random` draws each cost uniformly from [1, max_transition_cost], `constant` uses
+    max_transition_cost for every transition and `euclidean` places the machine types at random points of a square with
+    side length max_transition_cost / 2 and uses their rounded-up distances, i.e., the costs are symmetric and (almost)
+    satisfy the triangle inequality.
+
+    :param num_types: the number of machine types
+    :param cost_structure: one of COST_STRUCTURES
+    :param max_transition_cost: the maximal transition cost
+    :param rng: the random number generator to use
+    """
+    if cost_structure not in COST_STRUCTURES:
+        raise InputError(f'Given cost structure {cost_structure} expected to be one of {COST_STRUCTURES}.')
+    rng = np.random.default_rng() if rng is None else rng
+    if cost_structure == 'random':
+        transition_cost = rng.integers(1, max_transition_cost, size=(num_types, num_types), endpoint=True)
+    elif cost_structure == 'constant':
+        transition_cost = np.full((num_types, num_types), max_transition_cost)
+    else:
+        points = rng.random((num_types, 2)) * max_transition_cost / 2
+        distances = np.linalg.norm(points[:, None, :] - points[None, :, :], axis=2)
+        transition_cost = np.maximum(np.ceil(distances), 1).astype(np.int64)
+    np.fill_diagonal(transition_cost, 0)
+    return transition_cost
+
+
+def generate_input(num_types: int, num_time_periods: int, demand_density: float = 0.5, cost_structure: str = 'random',
+                   max_transition_cost: int = 100, inventory_cost: int = 1, mean_slack: float = 5.,
+                   seed: Optional[int] = None) -> Input:
+    """Returns a random feasible instance.
+
+    A random production schedule with round(demand_density * num_time_periods) productions (uniformly distributed over
+    the machine types) is drawn first; each production is then turned into a demand whose deadline lies a geometrically
+    distributed number of time periods (with mean mean_slack) after the production, moved to the next free time period
+    of its machine type (or the latest free one before) if necessary. Hence, the drawn schedule is feasible for the
+    generated instance. The same arguments (including the seed) always result in the same instance.
+
+    :param num_types: the number of machine types
+    :param num_time_periods: the number of time periods
+    :param demand_density: the fraction of time periods with a demand
+    :param cost_structure: the structure of the transition costs (see :func:`generate_transition_cost`)
+    :param max_transition_cost: the maximal transition cost
+    :param inventory_cost: the inventory cost per item per time period
+    :param mean_slack: the mean number of time periods between production and deadline
+    :param seed: the seed of the random number generator
+    """
+    if num_types < 1 or num_time_periods < 1:
+        raise InputError(f'Given numbers of types {num_types} and time periods {num_time_periods} expected to be '
+                         f'positive.')
+    if not 0. <= demand_density <= 1.:
+        raise InputError(f'Given demand density {demand_density} expected to be between 0 and 1.')
+    rng = np.random.default_rng(seed)
+    num_demands = int(round(demand_density * num_time_periods))
+    production_periods = np.sort(rng.choice(num_time_periods, size=num_demands, replace=False))
+    production_types = rng.integers(0, num_types, size=num_demands)
+    slacks = rng.geometric(1. / (mean_slack + 1.), size=num_demands) - 1
+    demand = np.zeros((num_types, num_time_periods), dtype=np.int8)
+    # productions are turned into demands from the last one on; all deadlines assigned before belong to later
+    # productions, so the production period itself is always free
+    for time_period, machine_type, slack in zip(production_periods[::-1].tolist(), production_types[::-1].tolist(),
+                                                slacks[::-1].tolist()):
+        deadline = min(time_period + slack, num_time_periods - 1)
+        if demand[machine_type, deadline]:
+            free = np.flatnonzero(demand[machine_type, time_period:] == 0) + time_period
+            later = free[free >= deadline]
+            deadline = later[0] if len(later) else free[-1]
+        demand[machine_type, deadline] = 1
+    transition_cost = generate_transition_cost(num_types, cost_structure, max_transition_cost, rng)
+    return Input.from_arrays(demand, inventory_cost, transition_cost)
@@ -0,0 +1,233 @@
+"""Module responsible for computing schedules heuristically."""
+
+import math
+import random
+import time
+from typing import Callable, List, Optional, Tuple
+
+from lot_sizing.evaluator import MoveDelta, ScheduleEvaluator
+from lot_sizing.input import Input, InputError
+
+Move = Tuple[str, Tuple[int, ...]]
+
+
+def earliest_deadline_schedule(prob_input: Input) -> List[int]:
+    """Returns a feasible schedule producing each demanded item as late as possible.
+
+    Time periods are filled backwards; each time period is assigned an item whose deadline is not earlier than the time
+    period, i.e., the items are produced in earliest-deadline-first order. Among the available items, the machine type
+    of the subsequent production is preferred in order to avoid transitions; otherwise, the machine type with the latest
+    pending deadline is chosen.
+
+    :param prob_input: the input problem instance to consider
+    """
+    pending = [prob_input.deadlines[machine_type, :num_demands].tolist() for machine_type, num_demands in
+               enumerate(prob_input.num_demands.tolist())]
+    schedule = [-1] * prob_input.num_time_periods
+    next_state = -1
+    for time_period in reversed(range(prob_input.num_time_periods)):
+        if next_state < 0 or not pending[next_state] or pending[next_state][-1] < time_period:
+            candidates = [machine_type for machine_type, deadlines in enumerate(pending) if
+                          deadlines and deadlines[-1] >= time_period]
+            if not candidates:
+                continue
+            next_state = max(candidates, key=lambda machine_type: pending[machine_type][-1])
+        pending[next_state].pop()
+        schedule[time_period] = next_state
+    if any(pending):
+        raise InputError('Given instance does not admit a feasible schedule.')
+    return schedule
+
+
+def repair_schedule(prob_input: Input, schedule: List[int]) -> List[int]:
+    """Returns a feasible schedule which keeps the productions and idle time periods of the given schedule (e.g., a
+    schedule of the instance before its demand changed) wherever possible.
+
+    Time periods are filled backwards as in :func:`earliest_deadline_schedule`. A time period keeps the machine type of
+    the given schedule if an item of this machine type is available; otherwise, it stays idle as long as the pending
+    items fit into the earlier time periods. Hence, a feasible schedule is returned unchanged.
+
+    :param prob_input: the input problem instance to consider
+    :param schedule: the schedule to repair
+    """
+    if len(schedule) != prob_input.num_time_periods:
+        raise InputError(f'Given schedule {schedule} expected to consist of {prob_input.num_time_periods} time '
+                         f'periods.')
+    pending = [prob_input.deadlines[machine_type, :num_demands].tolist() for machine_type, num_demands in
+               enumerate(prob_input.num_demands.tolist())]
+    num_pending = prob_input.overall_demand
+    repaired = [-1] * prob_input.num_time_periods
+    next_state = -1
+    for time_period in reversed(range(prob_input.num_time_periods)):
+        machine_type = schedule[time_period]
+        if not (0 <= machine_type < prob_input.num_types and pending[machine_type] and
+                pending[machine_type][-1] >= time_period):
+            if num_pending <= time_period:
+                continue
+            candidates = [machine_type for machine_type, deadlines in enumerate(pending) if
+                          deadlines and deadlines[-1] >= time_period]
+            if not candidates:
+                break
+            machine_type = max(candidates, key=lambda candidate: (candidate == next_state, pending[candidate][-1]))
+        pending[machine_type].pop()
+        num_pending -= 1
+        repaired[time_period] = next_state = machine_type
+    if num_pending:
+        raise InputError('Given instance does not admit a feasible schedule.')
+    return repaired
+
+
+class HeuristicSolver:
+    """Improves a feasible schedule via tabu search or simulated annealing.
+
+    Both methods explore swap, insert and shift moves (see :class:`lot_sizing.evaluator.ScheduleEvaluator`) between time
+    periods at most `max_distance` apart and only visit feasible schedules. Runs are reproducible under a given seed as
+    long as they are bounded by `max_iterations` rather than by `time_limit`. If given, `on_improvement` is called with the
+    cost of the start schedule and of each new best schedule.
+    """
+
+    METHODS = ('tabu', 'annealing')
+
+    def __init__(self, prob_input: Input, method: str = 'tabu', time_limit: float = 10., seed: Optional[int] = None,
+                 max_iterations: Optional[int] = None, max_distance: int = 32,
+                 on_improvement: Optional[Callable[[int], None]] = None):
+        if method not in self.METHODS:
+            raise ValueError(f'Given method {method} expected to be one of {self.METHODS}.')
+        self.prob_input = prob_input
+        self.method = method
+        self.time_limit = time_limit
+        self.max_iterations = max_iterations
+        self.max_distance = max_distance
+        self.on_improvement = on_improvement
+        self.random = random.Random(seed)
+        self.num_iterations = 0
+        self.best_cost = None
+
+    def solve(self, schedule: Optional[List[int]] = None) -> List[int]:
+        """Returns the best schedule found when starting from given feasible schedule.
+
+        :param schedule: the start schedule; the earliest deadline schedule is used if not given
+        """
+        if schedule is None:
+            schedule = earliest_deadline_schedule(self.prob_input)
+        evaluator = ScheduleEvaluator(self.prob_input, schedule)
+        if not evaluator.feasible:
+            raise InputError('Given start schedule is not feasible.')
+        self.num_iterations = 0
+        self._improved(evaluator.cost)
+        if self.prob_input.num_time_periods > 1:
+            if self.method == 'tabu':
+                best_schedule = self._tabu_search(evaluator)
+            else:
+                best_schedule = self._simulated_annealing(evaluator)
+        else:
+            best_schedule = list(evaluator.schedule)
+        if not self.prob_input.is_feasible(best_schedule):
+            raise RuntimeError(f'Computed schedule {best_schedule} is not feasible.')
+        self.best_cost = self.prob_input.compute_costs(best_schedule)
+        return best_schedule
+
+    def _improved(self, cost: int):
+        """Reports the cost of a new best schedule."""
+        if self.on_improvement is not None:
+            self.on_improvement(cost)
+
+    def _stop(self, start_time: float) -> bool:
+        """Returns true if the iteration limit or the time limit is reached."""
+        if self.max_iterations is not None and self.num_iterations >= self.max_iterations:
+            return True
+        return self.time_limit is not None and time.perf_counter() - start_time >= self.time_limit
+
+    def _random_move(self, schedule: List[int]) -> Move:
+        """Returns a random swap, insert or shift move between time periods at most max_distance apart."""
+        num_time_periods = len(schedule)
+        time_period = self.random.randrange(num_time_periods)
+        target = min(max(time_period + self.random.randint(-self.max_distance, self.max_distance), 0),
+                     num_time_periods - 1)
+        kind = self.random.random()
+        if kind < 0.4:
+            return 'swap', (time_period, target)
+        if kind < 0.8:
+            return 'insert', (time_period, target)
+        length = self.random.randint(1, min(4, num_time_periods - time_period))
+        offset = min(max(target - time_period, -time_period), num_time_periods - time_period - length)
+        return 'shift', (time_period, time_period + length, offset)
+
+    @staticmethod
+    def _placement(schedule: List[int], move: Move) -> Tuple[int, int]:
+        """Returns the (machine type, time period) pair a move places its primary entry at."""
+        kind, args = move
+        if kind == 'shift':
+            return schedule[args[0]], args[0] + args[2]
+        return schedule[args[0]], args[1]
+
+    @staticmethod
+    def _evaluate(evaluator: ScheduleEvaluator, move: Move) -> MoveDelta:
+        """Returns the effect of given move."""
+        kind, args = move
+        return getattr(evaluator, f'evaluate_{kind}')(*args)
+
+    @staticmethod
+    def _apply(evaluator: ScheduleEvaluator, move: Move) -> MoveDelta:
+        """Applies given move and returns its effect."""
+        kind, args = move
+        return getattr(evaluator, f'apply_{kind}')(*args)
+
+    def _tabu_search(self, evaluator: ScheduleEvaluator, num_candidates: int = 32, tenure: int = 20) -> List[int]:
+        """Applies the best admissible move out of a sample of candidate moves in each iteration.
+
+        A move is not admissible if it places a machine type into a time period which the machine type was moved out of
+        within the last tenure iterations, unless it leads to a new best schedule.
+        """
+        start_time = time.perf_counter()
+        best_schedule, best_cost = list(evaluator.schedule), evaluator.cost
+        tabu_until = dict()
+        while not self._stop(start_time):
+            self.num_iterations += 1
+            best_move, best_delta = None, None
+            for _ in range(num_candidates):
+                move = self._random_move(evaluator.schedule)
+                delta = self._evaluate(evaluator, move)
+                if not delta.feasible or (best_delta is not None and delta.cost >= best_delta.cost):
+                    continue
+                placement = self._placement(evaluator.schedule, move)
+                if placement[0] < 0 or (tabu_until.get(placement, 0) > self.num_iterations and
+                                        evaluator.cost + delta.cost >= best_cost):
+                    continue
+                best_move, best_delta = move, delta
+            if best_move is None:
+                continue
+            kind, args = best_move
+            tabu_until[(evaluator.schedule[args[0]], args[0])] = self.num_iterations + tenure
+            self._apply(evaluator, best_move)
+            if evaluator.cost < best_cost:
+                best_schedule, best_cost = list(evaluator.schedule), evaluator.cost
+                self._improved(best_cost)
+        return best_schedule
+
+    def _simulated_annealing(self, evaluator: ScheduleEvaluator, cooling_rate: float = 0.9995,
+                             min_temperature_ratio: float = 1e-3) -> List[int]:
+        """Applies random feasible moves which are accepted according to the Metropolis criterion.
+
+        The temperature decreases geometrically; once it falls below a fraction of the initial temperature, the search
+        is restarted from the best schedule at the initial temperature.
+        """
+        start_time = time.perf_counter()
+        best_schedule, best_cost = list(evaluator.schedule), evaluator.cost
+        samples = [abs(self._evaluate(evaluator, self._random_move(evaluator.schedule)).cost) for _ in range(100)]
+        initial_temperature = max(sum(samples) / len(samples), 1.)
+        temperature = initial_temperature
+        while not self._stop(start_time):
+            self.num_iterations += 1
+            move = self._random_move(evaluator.schedule)
+            delta = self._evaluate(evaluator, move)
+            if delta.feasible and (delta.cost <= 0 or self.random.random() < math.exp(-delta.cost / temperature)):
+                self._apply(evaluator, move)
+                if evaluator.cost < best_cost:
+                    best_schedule, best_cost = list(evaluator.schedule), evaluator.cost
+                    self._improved(best_cost)
+            temperature *= cooling_rate
+            if temperature < min_temperature_ratio * initial_temperature:
+                temperature = initial_temperature
+                evaluator = ScheduleEvaluator(self.prob_input, best_schedule)
+        return best_schedule
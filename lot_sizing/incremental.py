@@ -0,0 +1,85 @@
+"""Module responsible for re-solving the mip of an instance whose demand changes."""
+
+from typing import List, Optional
+
+from lot_sizing.heuristic import repair_schedule
+from lot_sizing.input import Input, InputError
+from lot_sizing.metrics import RunMetrics
+from lot_sizing.model import FORMULATIONS, BulkMipModel
+from lot_sizing.solve import SolveResult, SolverSettings, configure_solver, solve_model, warm_start_schedule
+
+
+class IncrementalSolver:
+    """Solves the mip of an instance and re-solves it after changes of the demand without rebuilding the model.
+
+    The mip is built once via the first backend of the settings. Demand changes are applied in place via the update
+    methods of :class:`lot_sizing.model.MipModel` on `mip_model` (or via :meth:`update_demand`); each solve is then
+    warm-started with the last computed schedule repaired for the current demand (see
+    :func:`lot_sizing.heuristic.repair_schedule`). Only formulations whose demand can be updated in place are supported,
+    i.e., the standard formulation (optionally built in bulk).
+    """
+
+    def __init__(self, prob_input: Input, settings: SolverSettings = SolverSettings(engine='mip'),
+                 verbose: bool = False):
+        """
+        :param prob_input: the input problem instance to consider
+        :param settings: the settings to use (the formulation, bulk build, first backend, mip time limit, number of
+            threads, relative gap and warm start apply)
+        :param verbose: whether to enable solver output
+        """
+        model_class = BulkMipModel if settings.bulk_build else FORMULATIONS[settings.formulation]
+        if not model_class.updatable:
+            raise ValueError(f'Formulation {settings.formulation} does not support demand updates.')
+        self.settings = settings
+        solver, self.parameters = configure_solver(settings, verbose)
+        if settings.bulk_build:
+            self.mip_model = BulkMipModel.build_mip(prob_input, solver, names=False)
+        else:
+            self.mip_model = model_class.build_mip(prob_input, solver)
+        self.schedule = None
+        self.num_solves = 0
+        self._result = None
+        self._solved_input = None
+
+    @property
+    def prob_input(self) -> Input:
+        """Returns the instance with the current demand."""
+        return self.mip_model.prob_input
+
+    def update_demand(self, demand, inventory_cost: Optional[int] = None) -> SolveResult:
+        """Changes the demand (and the inventory cost if given) in place and re-solves the mip (see
+        :meth:`lot_sizing.model.MipModel.update_demand`)."""
+        self.mip_model.update_demand(demand, inventory_cost)
+        return self.solve()
+
+    def start_schedule(self) -> Optional[List[int]]:
+        """Returns the last computed schedule repaired for the current demand (the earliest deadline schedule before
+        the first solve), or None if the current demand admits no feasible schedule."""
+        if self.schedule is None:
+            return warm_start_schedule(self.prob_input, None)
+        try:
+            return repair_schedule(self.prob_input, self.schedule)
+        except InputError:
+            return None
+
+    def solve(self, metrics: Optional[RunMetrics] = None) -> SolveResult:
+        """Solves the mip with the current demand, warm-started with :meth:`start_schedule` if warm start is enabled.
+
+        If the demand did not change since the last solve, its result is returned.
+
+        :param metrics: the metrics to record stage times and progress in
+        """
+        # backends such as SCIP fail on re-solving an unchanged solved model with a hint
+        if self._solved_input is self.prob_input:
+            return self._result
+        metrics = metrics or RunMetrics()
+        start_schedule = None
+        if self.settings.warm_start:
+            with metrics.stage('repair'):
+                start_schedule = self.start_schedule()
+        result = solve_model(self.mip_model, self.settings, self.parameters, start_schedule, metrics)
+        self.num_solves += 1
+        self._result, self._solved_input = result, self.prob_input
+        if result.schedule is not None:
+            self.schedule = result.schedule
+        return result
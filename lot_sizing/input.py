@@ -1,54 +1,216 @@
 """Module responsible for handling the input file."""
 
-from itertools import product
+from itertools import islice
+from typing import Iterable, Iterator, List, NamedTuple, Sequence, Tuple
 
-from typing import List
+import numpy as np
+
+BINARY_SUFFIX = '.npz'
 
 
 class InputError(Exception):
     """Base class for input exceptions."""
 
 
+class BatchEvaluation(NamedTuple):
+    """Feasibility flags and costs of a batch of schedules (one entry per schedule)."""
+    feasible: np.ndarray
+    transition_cost: np.ndarray
+    inventory_cost: np.ndarray
+
+    @property
+    def costs(self) -> np.ndarray:
+        """Returns the overall costs of the schedules."""
+        return self.transition_cost + self.inventory_cost
+
+
 class Input:
-    """Class responsible for reading the input file."""
+    """Class responsible for reading the input file.
+
+    Demand and transition costs are kept as NumPy arrays. Derived tables which are needed for checking feasibility and
+    computing costs, i.e., the cumulative demand and the per-type deadlines, are computed once after loading.
+    """
 
     def __init__(self):
         self.num_types = None
         self.num_time_periods = None
-        self.demand = dict()
+        self.demand = None
         self.overall_demand = None
         self.inventory_cost = None
-        self.transition_cost = dict()
+        self.transition_cost = None
+        self.cumulative_demand = None
+        self.num_demands = None
+        self.deadlines = None
 
     def __str__(self):
         """Return string representation."""
         return f'{self.num_time_periods}\n{self.num_types}\n' + "\n".join(
-            [str(v) for v in self.demand.values()]) + "\n" + str(self.inventory_cost) + "\n" + "\n".join(
-            [str(v) for v in self.transition_cost.values()])
+            [str(v) for v in self.demand.tolist()]) + "\n" + str(self.inventory_cost) + "\n" + "\n".join(
+            [str(v) for v in self.transition_cost.tolist()])
 
     @classmethod
     def read_file(cls, file: str):
         """Reads given input file and creates instance containing corresponding data.
 
+        The file is read line by line; each row of the demand and transition cost matrix is converted into an integer
+        array in bulk.
+
         :param file: the input filename (including path)
         """
-        ins = cls()
         try:
             with open(file, mode='r', encoding='utf8') as file_input:
-                times, types, *rest = (line.strip() for line in file_input if line.strip() != '')
-                ins.num_time_periods = int(times)
-                ins.num_types = int(types)
-                for i, demand in enumerate(rest[:ins.num_types]):
-                    ins.demand[i] = [int(j) for j in demand.split()]
-                ins.overall_demand = sum([sum(ins.demand[i]) for i in range(ins.num_types)])
-                ins.inventory_cost = int(rest[ins.num_types])
-                for i, cost in enumerate(rest[-ins.num_types:]):
-                    ins.transition_cost[i] = [int(j) for j in cost.split()]
+                return cls.read_lines(file_input)
+        except FileNotFoundError:
+            raise InputError(f'File {file} not found.')
 
+    @classmethod
+    def read_text(cls, text: str):
+        """Creates instance from given text in the format of :meth:`read_file`."""
+        return cls.read_lines(text.splitlines())
+
+    @classmethod
+    def read_lines(cls, lines: Iterable[str]):
+        """Creates instance from given lines in the format of :meth:`read_file` (empty lines are skipped)."""
+        lines = (line for line in lines if line.strip() != '')
+        num_time_periods = int(cls._read_row(lines, 1, 'number of time periods')[0])
+        num_types = int(cls._read_row(lines, 1, 'number of machine types')[0])
+        demand = np.empty((num_types, num_time_periods), dtype=np.int8)
+        for machine_type in range(num_types):
+            row = cls._read_row(lines, num_time_periods, f'demand of machine type {machine_type}')
+            if row.size and (row.min() < 0 or row.max() > np.iinfo(np.int8).max):
+                raise InputError(f'Demand of machine type {machine_type} expected to be between 0 and '
+                                 f'{np.iinfo(np.int8).max}.')
+            demand[machine_type] = row
+        inventory_cost = int(cls._read_row(lines, 1, 'inventory cost')[0])
+        transition_cost = np.empty((num_types, num_types), dtype=np.int64)
+        for machine_type in range(num_types):
+            transition_cost[machine_type] = cls._read_row(lines, num_types,
+                                                          f'transition cost of machine type {machine_type}')
+        if next(lines, None) is not None:
+            raise InputError('Unexpected content after transition costs.')
+        return cls.from_arrays(demand, inventory_cost, transition_cost, num_time_periods=num_time_periods)
+
+    @staticmethod
+    def _read_row(lines: Iterator[str], length: int, name: str) -> np.ndarray:
+        """Returns the integers of the next line as array; raises an input error unless there are exactly length."""
+        line = next(lines, None)
+        if line is None:
+            raise InputError(f'Input ended before {name}.')
+        try:
+            values = [int(token) for token in line.split()]
+        except ValueError:
+            values = None
+        if values is None or len(values) != length:
+            raise InputError(f'Line of {name} expected to consist of {length} integers: {line.strip()[:80]}')
+        bounds = np.iinfo(np.int64)
+        if any(value < bounds.min or value > bounds.max for value in values):
+            raise InputError(f'Line of {name} expected to consist of integers between {bounds.min} and {bounds.max}: '
+                             f'{line.strip()[:80]}')
+        return np.array(values, dtype=np.int64)
+
+    @classmethod
+    def read_binary(cls, file: str):
+        """Reads given binary input file (as written by :meth:`write_binary`) and creates instance containing
+        corresponding data.
+
+        :param file: the input filename (including path)
+        """
+        try:
+            with np.load(file) as data:
+                return cls.from_arrays(data['demand'], int(data['inventory_cost']), data['transition_cost'],
+                                       num_time_periods=int(data['num_time_periods']))
         except FileNotFoundError:
             raise InputError(f'File {file} not found.')
+        except (KeyError, ValueError, OSError) as error:
+            raise InputError(f'File {file} is not a valid binary input file: {error}')
+
+    @classmethod
+    def read(cls, file: str):
+        """Reads given input file in binary format if it ends with .npz and in text format otherwise.
+
+        :param file: the input filename (including path)
+        """
+        if file.endswith(BINARY_SUFFIX):
+            return cls.read_binary(file)
+        return cls.read_file(file)
+
+    def write_file(self, file: str):
+        """Writes the data of the instance to given file in the format expected by :meth:`read_file`.
+
+        :param file: the output filename (including path)
+        """
+        with open(file, mode='w', encoding='utf8') as file_output:
+            file_output.write(f'{self.num_time_periods}\n{self.num_types}\n')
+            file_output.writelines(' '.join(map(str, row)) + '\n' for row in self.demand.tolist())
+            file_output.write(f'{self.inventory_cost}\n')
+            file_output.writelines(' '.join(map(str, row)) + '\n' for row in self.transition_cost.tolist())
+
+    def write_binary(self, file: str):
+        """Writes the data of the instance to given file in compressed NumPy (.npz) format.
+
+        :param file: the output filename (including path); the suffix .npz is appended if missing
+        """
+        np.savez_compressed(file, num_time_periods=self.num_time_periods, inventory_cost=self.inventory_cost,
+                            demand=self.demand, transition_cost=self.transition_cost)
+
+    def write(self, file: str):
+        """Writes the data of the instance to given file in binary format if it ends with .npz and in text format
+        otherwise.
+
+        :param file: the output filename (including path)
+        """
+        if file.endswith(BINARY_SUFFIX):
+            self.write_binary(file)
         else:
-            return ins
+            self.write_file(file)
+
+    @classmethod
+    def from_arrays(cls, demand: Sequence[Sequence[int]], inventory_cost: int,
+                    transition_cost: Sequence[Sequence[int]], num_time_periods: int = None):
+        """Creates instance from given demand matrix, inventory cost and transition cost matrix.
+
+        :param demand: the (num_types x num_time_periods) demand matrix
+        :param inventory_cost: the inventory cost per item per time period
+        :param transition_cost: the (num_types x num_types) transition cost matrix
+        :param num_time_periods: the number of time periods; derived from the demand matrix if not given
+        """
+        ins = cls()
+        ins.demand = np.array(demand, dtype=np.int8, ndmin=2)
+        ins.transition_cost = np.array(transition_cost, dtype=np.int64, ndmin=2)
+        ins.num_types = ins.demand.shape[0]
+        ins.num_time_periods = ins.demand.shape[1] if num_time_periods is None else num_time_periods
+        ins.inventory_cost = int(inventory_cost)
+        if ins.demand.shape != (ins.num_types, ins.num_time_periods):
+            raise InputError(
+                f'Shape of demand {ins.demand.shape} does not coincide with expected shape '
+                f'{(ins.num_types, ins.num_time_periods)}.')
+        if ins.transition_cost.shape != (ins.num_types, ins.num_types):
+            raise InputError(
+                f'Shape of transition cost {ins.transition_cost.shape} does not coincide with expected shape '
+                f'{(ins.num_types, ins.num_types)}.')
+        ins.update_indexes()
+        return ins
+
+    def update_indexes(self):
+        """(Re)computes the tables derived from the demand matrix.
+
+        The cumulative demand table holds the overall demand of each machine type until (inclusive) each time period.
+        The deadline table holds, for each machine type, the time periods of its demanded items in increasing order,
+        padded with the last time period, i.e., the $k$-th produced item of machine type $t$ is due in time period
+        `deadlines[t, min(k, num_demands[t])]`.
+        """
+        self.cumulative_demand = np.cumsum(self.demand, axis=1, dtype=np.int32)
+        self.num_demands = self.cumulative_demand[:, -1].copy() if self.num_time_periods else np.zeros(
+            self.num_types, dtype=np.int32)
+        self.overall_demand = int(self.num_demands.sum())
+        max_demand = int(self.num_demands.max()) if self.num_types else 0
+        self.deadlines = np.full((self.num_types, max_demand + 1), self.num_time_periods - 1, dtype=np.int32)
+        machine_types, time_periods = np.nonzero(self.demand)
+        # a time period with a demand of d items is the deadline of d consecutive items
+        counts = self.demand[machine_types, time_periods]
+        machine_types, time_periods = np.repeat(machine_types, counts), np.repeat(time_periods, counts)
+        starts = np.cumsum(self.num_demands) - self.num_demands
+        self.deadlines[machine_types, np.arange(len(machine_types)) - starts[machine_types]] = time_periods
 
     def get_demand(self, machine_type: int, time_period: int) -> int:
         """Returns the demand of machine type at time slot.
@@ -62,7 +224,7 @@ class Input:
         if machine_type >= self.num_types:
             raise InputError(
                 f'Given machine type {machine_type} expected to be smaller than overall number {self.num_types}.')
-        return self.demand[machine_type][time_period]
+        return int(self.demand[machine_type, time_period])
 
     def get_overall_demand(self, machine_type: int, time_period: int) -> int:
         """Returns the overall demand of machine type until (inclusive) time period.
@@ -76,36 +238,47 @@ class Input:
         if machine_type >= self.num_types:
             raise InputError(
                 f'Given machine type {machine_type} expected to be smaller than overall number {self.num_types}.')
-        return sum(self.demand[machine_type][:time_period + 1])
+        return int(self.cumulative_demand[machine_type, time_period])
 
     def is_feasible(self, solution: List[int]) -> bool:
         """Returns true if given solution is feasible. Otherwise, false.
 
+        A solution is feasible if and only if, for each machine type, the $k$-th produced item is produced no later than
+        the $k$-th demanded item is due.
+
         :param solution: the schedule to check feasibility for
         """
         if len(solution) != self.num_time_periods:
             raise InputError(
                 f'Length of given solution {len(solution)} does not coincide with expected length {self.num_time_periods}.')
-        num_produced_items_schedule = dict()
-        for machine_type in range(self.num_types):
-            num_produced_items_schedule[machine_type] = self.__compute_num_produced_item_schedule(machine_type,
-                                                                                                  solution)
-        for machine_type, time_slot in product(range(self.num_types), range(self.num_time_periods)):
-            if num_produced_items_schedule[machine_type][time_slot] < self.get_overall_demand(machine_type, time_slot):
-                return False
-        return True
-
-    def __compute_num_produced_item_schedule(self, machine_type: int, solution: List[int]) -> List[int]:
-        """Computes the schedule representing the number of produced items for given machine type based on given
-        solution.
-        """
-        schedule = [0] * self.num_time_periods
-        num_produced = 0
-        for time_slot, item in enumerate(solution):
-            if item == machine_type:
-                num_produced += 1
-                schedule[time_slot:] = [num_produced] * len(schedule[time_slot:])
-        return schedule
+        machine_types, time_periods, ranks, num_produced = self._production_ranks(solution)
+        if np.any(num_produced < self.num_demands):
+            return False
+        return bool(np.all(time_periods <= self._deadline_of(machine_types, ranks)))
+
+    def _production_ranks(self, schedule: List[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Groups the productions of given schedule by machine type.
+
+        :param schedule: the schedule to consider
+        :return: the machine type, time period and rank (among the productions of the same machine type) of each
+         production, ordered by machine type and time period, as well as the number of produced items per machine type
+        """
+        schedule = np.asarray(schedule, dtype=np.int16)
+        time_periods = np.flatnonzero(schedule >= 0)
+        machine_types = schedule[time_periods]
+        if len(machine_types) and machine_types.max() >= self.num_types:
+            raise InputError(
+                f'Given machine type {machine_types.max()} expected to be smaller than overall number {self.num_types}.')
+        order = np.argsort(machine_types, kind='stable')
+        machine_types, time_periods = machine_types[order], time_periods[order]
+        num_produced = np.bincount(machine_types, minlength=self.num_types)
+        starts = np.cumsum(num_produced) - num_produced
+        ranks = np.arange(len(machine_types)) - starts[machine_types]
+        return machine_types, time_periods, ranks, num_produced
+
+    def _deadline_of(self, machine_types: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+        """Returns the due time period of the items with given ranks of given machine types."""
+        return self.deadlines[machine_types, np.minimum(ranks, self.deadlines.shape[1] - 1)]
 
     def compute_costs(self, schedule: List[int]) -> int:
         """Returns the overall costs of given schedule.
@@ -116,23 +289,110 @@ class Input:
 
     def compute_transition_cost(self, schedule: List[int]) -> int:
         """Returns the transition cost of the given schedule."""
-        prev_state = -1
-        transition_cost = 0
+        schedule = np.asarray(schedule)
+        states = schedule[schedule >= 0]
+        prev_states, next_states = states[:-1], states[1:]
+        changes = prev_states != next_states
+        return int(self.transition_cost[prev_states[changes], next_states[changes]].sum())
+
+    def compute_model_costs(self, schedule: List[int]) -> int:
+        """Returns the overall costs of the given schedule as charged by the mip and cp models (see
+        :meth:`compute_reconfiguration_cost`).
+
+        :param schedule: the schedule to compute the costs for
+        """
+        return self.compute_reconfiguration_cost(schedule) + self.compute_inventory_cost(schedule)
+
+    def compute_reconfiguration_cost(self, schedule: List[int]) -> int:
+        """Returns the minimal transition cost of the given schedule if the machine may be reconfigured in idle time
+        periods.
+
+        As in the mip and cp models, the machine is configured for some machine type in each time period and each change
+        of the configuration between consecutive time periods incurs its transition cost. Hence, an idle time period
+        may route a changeover through a cheaper intermediate machine type, so that the result is at most
+        :meth:`compute_transition_cost`.
+        """
+        transition_cost = self.transition_cost.astype(np.int64)
+        np.fill_diagonal(transition_cost, 0)
+        # costs[t] is the minimal transition cost so far if the machine is configured for machine type t
+        costs = np.zeros(self.num_types, dtype=np.int64)
         for state in schedule:
-            if state == -1:
-                continue
-            if state != prev_state and prev_state != -1:
-                transition_cost += self.transition_cost[prev_state][state]
-            prev_state = state
-        return transition_cost
+            if state < 0:
+                costs = (costs[:, None] + transition_cost).min(axis=0)
+            else:
+                cost = (costs + transition_cost[:, state]).min()
+                costs = np.full(self.num_types, np.iinfo(np.int64).max // 2, dtype=np.int64)
+                costs[state] = cost
+        return int(costs.min())
 
     def compute_inventory_cost(self, schedule: List[int]) -> int:
-        """Returns the inventory cost of the given schedule."""
-        inventory_cost = 0
-        for machine_type in range(self.num_types):
-            demand = [index for index, item in enumerate(self.demand[machine_type]) if item == 1]
-            production = [index for index, item in enumerate(schedule) if item == machine_type]
-            demand += [self.num_time_periods - 1] * (len(production) - len(demand))
-            difference = [d - p for d, p in zip(demand, production)]
-            inventory_cost += sum(difference) * self.inventory_cost
-        return inventory_cost
+        """Returns the inventory cost of the given schedule.
+
+        Items produced beyond the demand of their machine type are stocked until the last time period.
+        """
+        machine_types, time_periods, ranks, _ = self._production_ranks(schedule)
+        difference = self._deadline_of(machine_types, ranks).sum(dtype=np.int64) - time_periods.sum(dtype=np.int64)
+        return int(difference) * self.inventory_cost
+
+    def evaluate_batch(self, schedules: Sequence[Sequence[int]]) -> BatchEvaluation:
+        """Returns feasibility flags, transition costs and inventory costs of given schedules.
+
+        Each row of the given (num_schedules x num_time_periods) array is a schedule where -1 represents an idle time
+        period. The result coincides with :meth:`is_feasible`, :meth:`compute_transition_cost` and
+        :meth:`compute_inventory_cost` applied to each row.
+
+        :param schedules: the schedules to evaluate
+        """
+        schedules = np.asarray(schedules, dtype=np.int16)
+        if schedules.ndim != 2 or schedules.shape[1] != self.num_time_periods:
+            raise InputError(
+                f'Shape of given schedules {schedules.shape} expected to be (num_schedules, {self.num_time_periods}).')
+        if schedules.size and (schedules.min() < -1 or schedules.max() >= self.num_types):
+            raise InputError(f'Given schedules expected to contain values between -1 and {self.num_types - 1}.')
+        time_periods = np.arange(self.num_time_periods)
+        # transition costs: each production is compared with the last non-idle time period before it
+        last_production = np.maximum.accumulate(np.where(schedules >= 0, time_periods, -1), axis=1)
+        prev_production = np.empty_like(last_production)
+        prev_production[:, 0] = -1
+        prev_production[:, 1:] = last_production[:, :-1]
+        prev_states = np.take_along_axis(schedules, np.maximum(prev_production, 0), axis=1)
+        changes = (schedules >= 0) & (prev_production >= 0) & (prev_states != schedules)
+        transition_cost = np.where(changes, self.transition_cost[np.maximum(prev_states, 0), np.maximum(schedules, 0)],
+                                   0).sum(axis=1)
+        # inventory costs and feasibility: each production is matched with the deadline of the same rank
+        productions = np.argsort(schedules, axis=1, kind='stable')
+        machine_types = np.take_along_axis(schedules, productions, axis=1)
+        group_starts = np.zeros_like(productions)
+        group_starts[:, 1:] = machine_types[:, 1:] != machine_types[:, :-1]
+        ranks = time_periods - np.maximum.accumulate(group_starts * time_periods, axis=1)
+        produced = machine_types >= 0
+        machine_types = np.maximum(machine_types, 0)
+        deadlines = self._deadline_of(machine_types, ranks)
+        inventory_cost = np.where(produced, deadlines - productions, 0).sum(axis=1) * self.inventory_cost
+        late = (produced & (productions > deadlines)).any(axis=1)
+        last_demanded = (produced & (ranks == self.num_demands[machine_types] - 1)).sum(axis=1)
+        feasible = ~late & (last_demanded == np.count_nonzero(self.num_demands))
+        return BatchEvaluation(feasible, transition_cost.astype(np.int64), inventory_cost.astype(np.int64))
+
+    def iter_evaluate_batch(self, schedules: Iterable[Sequence[int]],
+                            chunk_size: int = 4096) -> Iterator[BatchEvaluation]:
+        """Evaluates given schedules chunk by chunk via :meth:`evaluate_batch`.
+
+        Only one chunk of schedules is materialized at a time; hence, `schedules` may be a (memory-mapped) array or any
+        iterable, e.g., a generator, of schedules.
+
+        :param schedules: the schedules to evaluate
+        :param chunk_size: the maximal number of schedules evaluated at once
+        :return: an iterator over the evaluations of consecutive chunks
+        """
+        if chunk_size <= 0:
+            raise InputError(f'Given chunk size {chunk_size} expected to be positive.')
+        if isinstance(schedules, np.ndarray):
+            for start in range(0, len(schedules), chunk_size):
+                yield self.evaluate_batch(schedules[start:start + chunk_size])
+        else:
+            schedules = iter(schedules)
+            chunk = list(islice(schedules, chunk_size))
+            while chunk:
+                yield self.evaluate_batch(chunk)
+                chunk = list(islice(schedules, chunk_size))
@@ -0,0 +1,103 @@
+"""Module responsible for collecting machine-readable metrics of a run."""
+
+import cProfile
+import json
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from typing import Callable, ContextManager, Dict, Iterable, Optional
+
+from lot_sizing.model import MipModel
+
+# a hook returns a context manager which is entered for the duration of the stage of the given name
+StageHook = Callable[[str], ContextManager]
+VARIABLE_FAMILIES = ('production', 'state', 'stock', 'transition')
+
+
+def model_size(mip_model: MipModel) -> Dict:
+    """Returns the number of variables and constraints of the given mip per family.
+
+    Variables are counted per family of :class:`lot_sizing.model.MipModel`; constraints are counted per family as
+    recorded while building (see :class:`lot_sizing.model.BulkMipModel`) or else grouped by their names without indices
+    (e.g., `demand` or `flow`). Constraints without names and without recorded family are counted as `unnamed`.
+    """
+    variables = {family: len(getattr(mip_model, f'{family}_vars')) for family in VARIABLE_FAMILIES}
+    if mip_model.constraint_families is not None:
+        constraints = Counter(mip_model.constraint_families)
+    else:
+        families = (re.sub(r'(_-?\d+)+$', '', constraint.name()) for constraint in mip_model.solver.constraints())
+        # the solver names constraints without names auto_c_<index>
+        constraints = Counter('unnamed' if family in ('', 'auto_c') else family for family in families)
+    return {'variables': variables, 'constraints': dict(constraints),
+            'num_variables': mip_model.solver.NumVariables(), 'num_constraints': mip_model.solver.NumConstraints()}
+
+
+class RunMetrics:
+    """Collects stage times, model sizes and solver progress of a run.
+
+    Stage times accumulate over repeated stages of the same name. Progress events consist of the time (in seconds since
+    the creation of the metrics), the objective value of the incumbent and the best bound (None if unknown). CP-SAT and
+    the heuristics report each improvement; the mip backends SCIP and CBC offer no callback via OR-Tools, so their
+    progress consists of the warm start and the final result only. Each hook is entered around each stage, e.g., to
+    enable an external profiler (see :func:`profile_hook`).
+    """
+
+    def __init__(self, hooks: Iterable[StageHook] = ()):
+        """
+        :param hooks: the hooks entered around each stage
+        """
+        self.hooks = list(hooks)
+        self.start_time = time.perf_counter()
+        self.times = dict()
+        self.model = None
+        self.progress = []
+        self.info = dict()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Context manager measuring the time of the stage of the given name."""
+        with ExitStack() as hooks:
+            for hook in self.hooks:
+                hooks.enter_context(hook(name))
+            start_time = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.times[name] = self.times.get(name, 0.) + time.perf_counter() - start_time
+
+    def record_model(self, mip_model: MipModel):
+        """Records the size of the given mip (see :func:`model_size`)."""
+        self.model = model_size(mip_model)
+
+    def record_progress(self, objective: Optional[float], bound: Optional[float] = None):
+        """Records the objective value of the current incumbent and the best bound."""
+        self.progress.append({'time': time.perf_counter() - self.start_time, 'objective': objective, 'bound': bound})
+
+    def to_dict(self) -> Dict:
+        """Returns the metrics as JSON serializable record."""
+        return {'times': dict(self.times), 'total_time': time.perf_counter() - self.start_time, 'model': self.model,
+                'progress': list(self.progress), 'info': dict(self.info)}
+
+    def write(self, filepath: str):
+        """Writes the metrics as JSON record to the given file."""
+        with open(filepath, 'w') as file:
+            json.dump(self.to_dict(), file, indent=1)
+
+
+def profile_hook(profile: cProfile.Profile, stages: Optional[Iterable[str]] = None) -> StageHook:
+    """Returns a hook which enables the given profiler during the given stages (all stages if None)."""
+    stages = None if stages is None else set(stages)
+
+    @contextmanager
+    def hook(name: str):
+        if stages is not None and name not in stages:
+            yield
+            return
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+
+    return hook
@@ -1,14 +1,23 @@
 """Module responsible for modelling the lot sizing problem mathematically."""
 
-from itertools import product
+from collections.abc import Mapping
+from itertools import chain, product, repeat
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
 
-from ortools.linear_solver import pywraplp
+import numpy as np
+from ortools.linear_solver import linear_solver_pb2, pywraplp
+from ortools.sat.python import cp_model
 
-from lot_sizing.input import Input
+from lot_sizing.input import Input, InputError
 
 
 class MipModel:
-    """Models the lot sizing problem via mixed integer programming."""
+    """Models the lot sizing problem via mixed integer programming.
+
+    The demand only enters the right-hand sides of the demand constraints. Hence, the demand (and the inventory cost)
+    can be changed in place (see :meth:`update_demand`) unless a subclass derives further bounds from the demand.
+    """
+    updatable = True
 
     def __init__(self, prob_input: Input, solver: pywraplp):
         self.prob_input = prob_input
@@ -17,6 +26,9 @@ class MipModel:
         self.state_vars = None
         self.stock_vars = None
         self.transition_vars = None
+        self.demand_constraints = None
+        # number of constraints per family if recorded while building (see BulkMipModel)
+        self.constraint_families = None
 
     @staticmethod
     def _add_production_variables(num_types: int, num_time_periods: int, solver: pywraplp):
@@ -100,12 +112,14 @@ class MipModel:
         time period $p-1$ plus the value of the production variable $x^t_p$ equals the demand of $t$ in time period
         $p$ plus the stock in time period $p$.
         """
+        self.demand_constraints = dict()
         for (machine_type, time_period) in product(range(self.prob_input.num_types),
                                                    range(self.prob_input.num_time_periods)):
             lhs = self.stock_vars[(machine_type, time_period - 1)] + self.production_vars[(machine_type, time_period)]
             rhs = self.prob_input.get_demand(machine_type, time_period) + self.stock_vars[
                 (machine_type, time_period)]
-            self.solver.Add(lhs == rhs, name=f'demand_{machine_type}_{time_period}')
+            self.demand_constraints[(machine_type, time_period)] = self.solver.Add(
+                lhs == rhs, name=f'demand_{machine_type}_{time_period}')
 
     def _add_state_constraints(self):
         """Add state constraints.
@@ -183,3 +197,561 @@ class MipModel:
         ins._add_transition_constraints()
         ins._add_objective()
         return ins
+
+    @staticmethod
+    def setup_states(schedule: List[int]) -> List[int]:
+        """Returns the machine configuration in each time period of the given schedule.
+
+        In idle time periods, the machine keeps the configuration of the previous production (or, before the first
+        production, the configuration of the first production).
+        """
+        states = []
+        state = next((machine_type for machine_type in schedule if machine_type >= 0), 0)
+        for machine_type in schedule:
+            state = machine_type if machine_type >= 0 else state
+            states.append(state)
+        return states
+
+    def hint_values(self, schedule: List[int]) -> Tuple[List[pywraplp.Variable], List[float]]:
+        """Returns the values of all model variables corresponding to the given feasible schedule.
+
+        In idle time periods, the machine keeps the configuration of the previous production (or, before the first
+        production, the configuration of the first production). Hence, the transition costs of the hint coincide with
+        the ones computed by :meth:`lot_sizing.input.Input.compute_transition_cost`.
+
+        Only the variables present in the model are considered.
+
+        :param schedule: the feasible schedule to derive the variable values from
+        :return: the variables together with their values
+        """
+        if not self.prob_input.is_feasible(schedule):
+            raise InputError(f'Given schedule {schedule} is not feasible.')
+        states = self.setup_states(schedule)
+        production = np.arange(self.prob_input.num_types)[:, None] == np.asarray(schedule)[None, :]
+        # stock[t, p + 1] is the stock of machine type t at the end of time period p
+        stock = np.zeros((self.prob_input.num_types, self.prob_input.num_time_periods + 1))
+        stock[:, 1:] = np.cumsum(production, axis=1) - self.prob_input.cumulative_demand
+        variables, values = [], []
+        for (machine_type, time_period), production_var in self.production_vars.items():
+            variables.append(production_var)
+            values.append(float(schedule[time_period] == machine_type))
+        for (machine_type, time_period), state_var in self.state_vars.items():
+            variables.append(state_var)
+            values.append(float(states[time_period] == machine_type))
+        for (machine_type, time_period), stock_var in self.stock_vars.items():
+            variables.append(stock_var)
+            values.append(float(stock[machine_type, time_period + 1]))
+        for (type_i, type_j, time_period), transition_var in self.transition_vars.items():
+            variables.append(transition_var)
+            values.append(float(states[time_period - 1] == type_i and states[time_period] == type_j))
+        return variables, values
+
+    def set_hint(self, schedule: List[int]):
+        """Warm-starts the solver by hinting the variable values corresponding to the given feasible schedule.
+
+        :param schedule: the feasible schedule to use as hint
+        """
+        self.solver.SetHint(*self.hint_values(schedule))
+
+    def update_demand(self, demand: Sequence[Sequence[int]], inventory_cost: Optional[int] = None) -> int:
+        """Changes the demand matrix (and the inventory cost if given) of the model in place.
+
+        Only the right-hand sides of the demand constraints whose demand changes and, if the inventory cost changes, the
+        objective coefficients of the stock variables are modified; the remaining model is kept. The next solve passes
+        the modifications to the backend, either incrementally (e.g., SCIP) or by loading the model again (e.g., CBC).
+
+        :param demand: the new (num_types x num_time_periods) demand matrix
+        :param inventory_cost: the new inventory cost per item per time period (unchanged if None)
+        :return: the number of modified demand constraints (the model is kept as is if nothing changes)
+        :raises ValueError: if the formulation does not support demand updates (see :attr:`updatable`)
+        """
+        if not self.updatable:
+            raise ValueError(f'{type(self).__name__} derives bounds from the demand and has to be rebuilt.')
+        previous = self.prob_input
+        prob_input = Input.from_arrays(demand, previous.inventory_cost if inventory_cost is None else inventory_cost,
+                                       previous.transition_cost, num_time_periods=previous.num_time_periods)
+        changed = np.nonzero(prob_input.demand != previous.demand)
+        if not len(changed[0]) and prob_input.inventory_cost == previous.inventory_cost:
+            return 0
+        for machine_type, time_period in zip(*(index.tolist() for index in changed)):
+            value = float(prob_input.demand[machine_type, time_period])
+            self._demand_constraint(machine_type, time_period).SetBounds(value, value)
+        if prob_input.inventory_cost != previous.inventory_cost:
+            objective = self.solver.Objective()
+            for (machine_type, time_period), stock_var in self.stock_vars.items():
+                if time_period >= 0:
+                    objective.SetCoefficient(stock_var, float(prob_input.inventory_cost))
+        self.prob_input = prob_input
+        return len(changed[0])
+
+    def add_demand(self, machine_type: int, time_period: int, count: int = 1) -> int:
+        """Adds count items of the given machine type due in the given time period (see :meth:`update_demand`)."""
+        demand = self.prob_input.demand.astype(np.int64)
+        demand[machine_type, time_period] += count
+        return self.update_demand(self._checked(demand))
+
+    def remove_demand(self, machine_type: int, time_period: int, count: int = 1) -> int:
+        """Removes count items of the given machine type due in the given time period (see :meth:`update_demand`)."""
+        return self.add_demand(machine_type, time_period, -count)
+
+    def move_demand(self, machine_type: int, time_period: int, new_time_period: int, count: int = 1) -> int:
+        """Moves the deadline of count items of the given machine type from the given time period to the new one (see
+        :meth:`update_demand`)."""
+        demand = self.prob_input.demand.astype(np.int64)
+        demand[machine_type, time_period] -= count
+        demand[machine_type, new_time_period] += count
+        return self.update_demand(self._checked(demand))
+
+    @staticmethod
+    def _checked(demand: np.ndarray) -> np.ndarray:
+        """Returns the given demand matrix if its entries are valid demands."""
+        if demand.size and (demand.min() < 0 or demand.max() > np.iinfo(np.int8).max):
+            raise InputError(f'Demand expected to be between 0 and {np.iinfo(np.int8).max}.')
+        return demand
+
+    def _demand_constraint(self, machine_type: int, time_period: int) -> pywraplp.Constraint:
+        """Returns the demand constraint of the given machine type and time period."""
+        return self.demand_constraints[(machine_type, time_period)]
+
+
+class FlowMipModel(MipModel):
+    """Models the lot sizing problem via a flow-based mixed integer programming formulation.
+
+    In contrast to :class:`MipModel`, transition variables $u^ij_p$ only exist for $i \\neq j$ and changeovers are
+    modelled as a flow between the machine configurations of consecutive time periods. As the flow is integral for
+    integral state variables, the transition variables are continuous. Furthermore, stock variables are bounded by the
+    remaining demand, production variables are fixed to zero after the last demand of their machine type and the overall
+    stock is bounded from below by the number of items which have to be produced ahead of time.
+    """
+    updatable = False
+
+    @staticmethod
+    def _add_transition_variables(num_types: int, num_time_periods: int, solver: pywraplp):
+        """Create transition variables.
+
+        A transition variable $u^ij_p$, $i \\neq j$, is a non-negative real variable which is one if and only if the
+        machine's state changed from being configured for machine type $i$ in time period $p-1$ to machine type $j$ in
+        time period $p$.
+        """
+        transition_vars = dict()
+        for type_i, type_j, time_period in product(range(num_types), range(num_types), range(1, num_time_periods)):
+            if type_i != type_j:
+                transition_vars[(type_i, type_j, time_period)] = solver.NumVar(
+                    lb=0., ub=1., name=f'u_{type_i}_{type_j}_{time_period}')
+        return transition_vars
+
+    def _add_transition_constraints(self):
+        """Add flow conservation constraints.
+
+        For machine type $i$ and time period $p$, the flow conservation constraint
+        $y^i_{p-1} - \\sum_{j \\neq i} u^ij_p = y^i_p - \\sum_{j \\neq i} u^ji_p$ states that the machine stays configured
+        for $i$ unless it changes from or to $i$. The stay constraint $\\sum_{j \\neq i} u^ij_p \\leq y^i_{p-1}$ ensures
+        that the machine only changes from $i$ if it was configured for $i$.
+        """
+        num_types = self.prob_input.num_types
+        for (machine_type, time_period) in product(range(num_types), range(1, self.prob_input.num_time_periods)):
+            outflow = self.solver.Sum([self.transition_vars[(machine_type, other_type, time_period)] for other_type in
+                                       range(num_types) if other_type != machine_type])
+            inflow = self.solver.Sum([self.transition_vars[(other_type, machine_type, time_period)] for other_type in
+                                      range(num_types) if other_type != machine_type])
+            prev_state = self.state_vars[(machine_type, time_period - 1)]
+            state = self.state_vars[(machine_type, time_period)]
+            self.solver.Add(prev_state - outflow == state - inflow, name=f'flow_{machine_type}_{time_period}')
+            self.solver.Add(outflow <= prev_state, name=f'stay_{machine_type}_{time_period}')
+
+    def _add_window_constraints(self):
+        """Add stock bounds and fix production variables outside of the production windows.
+
+        In an optimal solution, no item is produced beyond the overall demand of its machine type. Hence, the stock of
+        machine type $t$ in time period $p$ is at most the demand of $t$ after $p$ and no item of $t$ is produced after
+        the last demand of $t$. Moreover, if the demand of the time periods $p+1, \\dots, q$ exceeds $q - p$, the excess
+        has to be on stock at the end of time period $p$.
+        """
+        num_types, num_time_periods = self.prob_input.num_types, self.prob_input.num_time_periods
+        for (machine_type, time_period) in product(range(num_types), range(num_time_periods)):
+            remaining = self.prob_input.num_demands[machine_type] - self.prob_input.cumulative_demand[
+                machine_type, time_period]
+            self.stock_vars[(machine_type, time_period)].SetUb(float(remaining))
+            if time_period > self.prob_input.deadlines[machine_type, self.prob_input.num_demands[machine_type] - 1] or \
+                    self.prob_input.num_demands[machine_type] == 0:
+                self.production_vars[(machine_type, time_period)].SetUb(0.)
+        overall_cumulative_demand = self.prob_input.cumulative_demand.sum(axis=0) - np.arange(num_time_periods)
+        later_maximum = np.maximum.accumulate(overall_cumulative_demand[::-1])[::-1]
+        for time_period in range(num_time_periods - 1):
+            excess = int(later_maximum[time_period + 1] - overall_cumulative_demand[time_period])
+            if excess > 0:
+                overall_stock = self.solver.Sum(
+                    [self.stock_vars[(machine_type, time_period)] for machine_type in range(num_types)])
+                self.solver.Add(overall_stock >= excess, name=f'min_stock_{time_period}')
+
+    @classmethod
+    def build_mip(cls, prob_input: Input, solver):
+        """Build flow-based mip formulation for the given lot sizing instance via the given solver.
+
+        :param prob_input: the input problem instance to consider
+        :param solver: the solver instance to use
+        """
+        ins = super().build_mip(prob_input, solver)
+        ins._add_window_constraints()
+        return ins
+
+
+class IndexedVariables(Mapping):
+    """Read-only mapping from index tuples to solver variables backed by a dense array of variable indices.
+
+    The key $(k_1, \\dots, k_d)$ refers to the variable with index `indices[k_1 - offset_1, ..., k_d - offset_d]`.
+    """
+
+    def __init__(self, model: 'BulkMipModel', indices: np.ndarray, offset: Tuple[int, ...]):
+        self._model = model
+        self.indices = indices
+        self.offset = offset
+
+    def __getitem__(self, key: Tuple[int, ...]) -> pywraplp.Variable:
+        position = tuple(k - o for k, o in zip(key, self.offset))
+        if any(not 0 <= k < size for k, size in zip(position, self.indices.shape)):
+            raise KeyError(key)
+        return self._model.variables[self.indices[position]]
+
+    def __iter__(self) -> Iterator[Tuple[int, ...]]:
+        for position in np.ndindex(*self.indices.shape):
+            yield tuple(k + o for k, o in zip(position, self.offset))
+
+    def __len__(self) -> int:
+        return self.indices.size
+
+
+class BulkMipModel(MipModel):
+    """Models the lot sizing problem via the formulation of :class:`MipModel`, built in bulk.
+
+    Instead of adding variables and constraints one by one via the solver's modelling operators, the model is assembled
+    as an `MPModelProto` from dense arrays of variable indices and loaded into the solver at once. Variable and
+    constraint names are optional. The variables are kept as dense index arrays; the attributes `production_vars`,
+    `state_vars`, `stock_vars` and `transition_vars` are mappings backed by these arrays which resolve solver
+    variables on access. The number of constraints per family is recorded in `constraint_families` while building, so
+    that it is known without names.
+    """
+
+    def __init__(self, prob_input: Input, solver: pywraplp):
+        super().__init__(prob_input, solver)
+        self.production_index = None
+        self.state_index = None
+        self.stock_index = None
+        self.transition_index = None
+        self._variables = None
+        self.constraint_families = dict()
+
+    @property
+    def variables(self) -> List[pywraplp.Variable]:
+        """Returns all solver variables ordered by index."""
+        if self._variables is None:
+            self._variables = self.solver.variables()
+        return self._variables
+
+    def _demand_constraint(self, machine_type: int, time_period: int) -> pywraplp.Constraint:
+        """Returns the demand constraint of the given machine type and time period (see :meth:`_add_constraints`)."""
+        return self.solver.constraint(
+            self.prob_input.num_types + machine_type * self.prob_input.num_time_periods + time_period)
+
+    def _create_indices(self):
+        """Assign consecutive variable indices to production, state, stock and transition variables."""
+        num_types, num_time_periods = self.prob_input.num_types, self.prob_input.num_time_periods
+        shapes = [(num_types, num_time_periods), (num_types, num_time_periods), (num_types, num_time_periods + 1),
+                  (num_types, num_types, max(num_time_periods - 1, 0))]
+        start = 0
+        indices = []
+        for shape in shapes:
+            size = int(np.prod(shape))
+            indices.append(np.arange(start, start + size, dtype=np.int64).reshape(shape))
+            start += size
+        self.production_index, self.state_index, self.stock_index, self.transition_index = indices
+        self.production_vars = IndexedVariables(self, self.production_index, (0, 0))
+        self.state_vars = IndexedVariables(self, self.state_index, (0, 0))
+        self.stock_vars = IndexedVariables(self, self.stock_index, (0, -1))
+        self.transition_vars = IndexedVariables(self, self.transition_index, (0, 0, 1))
+        return start
+
+    @staticmethod
+    def _family_names(prefix: str, shape: Tuple[int, ...], offset: Tuple[int, ...]) -> Iterator[str]:
+        """Yields the names `prefix_k1_..._kd` of a family of variables or constraints in index order."""
+        for position in np.ndindex(*shape):
+            yield prefix + ''.join(f'_{k + o}' for k, o in zip(position, offset))
+
+    @staticmethod
+    def _chunks(*arrays: np.ndarray, chunk_size: int = 2 ** 16) -> Iterator[List]:
+        """Yields the rows of the given arrays as lists, converting only chunk_size rows at a time."""
+        for start in range(0, len(arrays[0]), chunk_size):
+            yield from zip(*(array[start:start + chunk_size].tolist() for array in arrays))
+
+    def _add_variables(self, proto: linear_solver_pb2.MPModelProto, names: bool):
+        """Add production, state, stock and transition variables together with their objective coefficients."""
+        num_variables = self._create_indices()
+        num_types = self.prob_input.num_types
+        upper_bounds = np.ones(num_variables)
+        upper_bounds[self.stock_index] = np.inf
+        is_integer = np.ones(num_variables, dtype=bool)
+        is_integer[self.stock_index] = False
+        objective = np.zeros(num_variables)
+        objective[self.stock_index[:, 1:]] = self.prob_input.inventory_cost
+        transition_cost = self.prob_input.transition_cost.astype(float)
+        transition_cost[np.arange(num_types), np.arange(num_types)] = 0.
+        objective[self.transition_index] = transition_cost[:, :, None]
+        if names:
+            variable_names = chain(self._family_names('x', self.production_index.shape, (0, 0)),
+                                   self._family_names('y', self.state_index.shape, (0, 0)),
+                                   self._family_names('s', self.stock_index.shape, (0, -1)),
+                                   self._family_names('u', self.transition_index.shape, (0, 0, 1)))
+        else:
+            variable_names = repeat('')
+        for (ub, integer, coefficient), name in zip(self._chunks(upper_bounds, is_integer, objective), variable_names):
+            proto.variable.add(lower_bound=0., upper_bound=ub, is_integer=integer, objective_coefficient=coefficient,
+                               name=name)
+
+    def _add_constraint_family(self, proto: linear_solver_pb2.MPModelProto, family: str, var_indices: np.ndarray,
+                               coefficients: List[float], lower_bounds, upper_bounds, shape: Tuple[int, ...],
+                               offset: Tuple[int, ...], names: bool):
+        """Add constraints of the given family whose i-th member has the variables `var_indices[i]` with the given
+        coefficients; the constraints are named after the family and their index within the given shape."""
+        count = len(var_indices)
+        self.constraint_families[family] = self.constraint_families.get(family, 0) + count
+        lower_bounds = np.broadcast_to(np.asarray(lower_bounds, dtype=float), (count,))
+        upper_bounds = np.broadcast_to(np.asarray(upper_bounds, dtype=float), (count,))
+        constraint_names = self._family_names(family, shape, offset) if names else repeat('')
+        for (indices, lb, ub), name in zip(self._chunks(var_indices, lower_bounds, upper_bounds), constraint_names):
+            proto.constraint.add(var_index=indices, coefficient=coefficients, lower_bound=lb, upper_bound=ub,
+                                 name=name)
+
+    def _add_constraints(self, proto: linear_solver_pb2.MPModelProto, names: bool):
+        """Add initial stock, demand, state, configuration and transition constraints (in this order)."""
+        num_types, num_time_periods = self.prob_input.num_types, self.prob_input.num_time_periods
+        self._add_constraint_family(proto, 'init_stock', self.stock_index[:, :1], [1.], 0., 0., (num_types,), (0,),
+                                    names)
+        demand = self.prob_input.demand.reshape(-1)
+        self._add_constraint_family(
+            proto, 'demand', np.stack([self.production_index, self.stock_index[:, :-1], self.stock_index[:, 1:]],
+                                      axis=-1).reshape(-1, 3), [1., 1., -1.], demand, demand,
+            (num_types, num_time_periods), (0, 0), names)
+        self._add_constraint_family(
+            proto, 'state', np.stack([self.production_index, self.state_index], axis=-1).reshape(-1, 2), [1., -1.],
+            -np.inf, 0., (num_types, num_time_periods), (0, 0), names)
+        self._add_constraint_family(proto, 'config', self.state_index.T, [1.] * num_types, 1., 1., (num_time_periods,),
+                                    (0,), names)
+        prev_states = np.broadcast_to(self.state_index[:, None, :-1], self.transition_index.shape)
+        states = np.broadcast_to(self.state_index[None, :, 1:], self.transition_index.shape)
+        self._add_constraint_family(
+            proto, 'transition', np.stack([prev_states, states, self.transition_index], axis=-1).reshape(-1, 3),
+            [-1., -1., 1.], -1., np.inf, self.transition_index.shape, (0, 0, 1), names)
+
+    @classmethod
+    def build_mip(cls, prob_input: Input, solver, names: bool = True):
+        """Build mip formulation for the given lot sizing instance via the given solver in bulk.
+
+        :param prob_input: the input problem instance to consider
+        :param solver: the solver instance to use
+        :param names: whether to name variables and constraints
+        """
+        ins = cls(prob_input, solver)
+        proto = linear_solver_pb2.MPModelProto()
+        proto.name = solver.Name() if hasattr(solver, 'Name') else ''
+        ins._add_variables(proto, names)
+        ins._add_constraints(proto, names)
+        # newer OR-Tools versions drop names in LoadModelFromProto
+        load_model = getattr(solver, 'LoadModelFromProtoKeepNames', solver.LoadModelFromProto)
+        error = load_model(proto)
+        if error:
+            raise RuntimeError(f'Loading model failed: {error}')
+        return ins
+
+
+class SolutionReporter(cp_model.CpSolverSolutionCallback):
+    """Reports objective value and best bound of each solution found by CP-SAT to the given function."""
+
+    def __init__(self, on_solution: Callable[[float, float], None]):
+        super().__init__()
+        self.on_solution = on_solution
+
+    def on_solution_callback(self):
+        self.on_solution(self.ObjectiveValue(), self.BestObjectiveBound())
+
+
+class CpSatModel:
+    """Models the lot sizing problem via constraint programming for the CP-SAT solver.
+
+    The model has the same optimal value as :class:`MipModel`. Production literals $x^t_p$ and setup literals $y^t_p$
+    (exactly one per time period) are linked by $x^t_p \\Rightarrow y^t_p$. Changeovers are modelled by arc literals
+    $u^ij_p$ of a layered graph whose layers are the setups of consecutive time periods; each layer is entered and left
+    by exactly one arc. Instead of stock variables, the number of productions of machine type $t$ up to each deadline is
+    bounded from below by the cumulative demand (see :attr:`lot_sizing.input.Input.deadlines`) and the inventory costs
+    are expressed via the production literals: an item produced in time period $p$ is on stock in time periods
+    $p, \\dots, n-1$, which is offset by the constant overall cumulative demand.
+    """
+
+    def __init__(self, prob_input: Input, model: cp_model.CpModel):
+        self.prob_input = prob_input
+        self.model = model
+        self.solver = None
+        self.production_vars = None
+        self.state_vars = None
+        self.transition_vars = None
+
+    def _add_variables(self):
+        """Create production, setup and changeover arc literals."""
+        num_types, num_time_periods = self.prob_input.num_types, self.prob_input.num_time_periods
+        self.production_vars, self.state_vars, self.transition_vars = dict(), dict(), dict()
+        for (machine_type, time_period) in product(range(num_types), range(num_time_periods)):
+            self.production_vars[(machine_type, time_period)] = self.model.NewBoolVar(
+                f'x_{machine_type}_{time_period}')
+            self.state_vars[(machine_type, time_period)] = self.model.NewBoolVar(f'y_{machine_type}_{time_period}')
+        for type_i, type_j, time_period in product(range(num_types), range(num_types), range(1, num_time_periods)):
+            self.transition_vars[(type_i, type_j, time_period)] = self.model.NewBoolVar(
+                f'u_{type_i}_{type_j}_{time_period}')
+
+    def _add_setup_constraints(self):
+        """Add setup constraints.
+
+        In each time period, the machine is set up for exactly one machine type and it can only produce that type.
+        """
+        num_types = self.prob_input.num_types
+        for time_period in range(self.prob_input.num_time_periods):
+            self.model.Add(sum(self.state_vars[(machine_type, time_period)] for machine_type in range(num_types)) == 1)
+            for machine_type in range(num_types):
+                self.model.AddImplication(self.production_vars[(machine_type, time_period)],
+                                          self.state_vars[(machine_type, time_period)])
+
+    def _add_changeover_constraints(self):
+        """Add changeover constraints.
+
+        The arcs leaving setup $i$ of time period $p-1$ sum up to $y^i_{p-1}$ and the arcs entering setup $j$ of time
+        period $p$ sum up to $y^j_p$.
+        """
+        num_types = self.prob_input.num_types
+        for time_period, machine_type in product(range(1, self.prob_input.num_time_periods), range(num_types)):
+            self.model.Add(sum(self.transition_vars[(machine_type, type_j, time_period)] for type_j in
+                               range(num_types)) == self.state_vars[(machine_type, time_period - 1)])
+            self.model.Add(sum(self.transition_vars[(type_i, machine_type, time_period)] for type_i in
+                               range(num_types)) == self.state_vars[(machine_type, time_period)])
+
+    def _add_demand_constraints(self):
+        """Add cumulative demand constraints.
+
+        The number of items of machine type $t$ produced up to the deadline of its $k$-th demand is at least $k$; the
+        overall number of produced items of $t$ equals its overall demand, so no item is produced after the last
+        deadline of $t$.
+        """
+        for machine_type in range(self.prob_input.num_types):
+            num_demands = int(self.prob_input.num_demands[machine_type])
+            deadlines = self.prob_input.deadlines[machine_type, :num_demands].tolist()
+            for rank, deadline in enumerate(deadlines):
+                if rank + 1 < num_demands and deadlines[rank + 1] == deadline:
+                    continue
+                self.model.Add(sum(self.production_vars[(machine_type, time_period)] for time_period in
+                                   range(deadline + 1)) >= rank + 1)
+            last_deadline = deadlines[-1] if deadlines else -1
+            for time_period in range(last_deadline + 1, self.prob_input.num_time_periods):
+                self.model.Add(self.production_vars[(machine_type, time_period)] == 0)
+            self.model.Add(sum(self.production_vars[(machine_type, time_period)] for time_period in
+                               range(self.prob_input.num_time_periods)) == num_demands)
+
+    def _add_objective(self):
+        """Add objective function, i.e., the sum of inventory costs and transition costs, and minimization direction."""
+        num_time_periods = self.prob_input.num_time_periods
+        inventory_cost = self.prob_input.inventory_cost
+        stock_objective = sum(inventory_cost * (num_time_periods - time_period) * production_var for
+                              (_, time_period), production_var in self.production_vars.items())
+        stock_offset = inventory_cost * int(self.prob_input.cumulative_demand.astype(np.int64).sum())
+        transition_objective = sum(
+            int(self.prob_input.transition_cost[type_i][type_j]) * transition_var for
+            (type_i, type_j, _), transition_var in self.transition_vars.items() if type_i != type_j)
+        self.model.Minimize(stock_objective + transition_objective - stock_offset)
+
+    @classmethod
+    def build_model(cls, prob_input: Input):
+        """Build constraint programming model for the given lot sizing instance.
+
+        :param prob_input: the input problem instance to consider
+        """
+        ins = cls(prob_input, cp_model.CpModel())
+        ins._add_variables()
+        ins._add_setup_constraints()
+        ins._add_changeover_constraints()
+        ins._add_demand_constraints()
+        ins._add_objective()
+        return ins
+
+    def set_hint(self, schedule: List[int]):
+        """Hints the literal values corresponding to the given feasible schedule (as in :meth:`MipModel.hint_values`).
+
+        :param schedule: the feasible schedule to use as hint
+        """
+        if not self.prob_input.is_feasible(schedule):
+            raise InputError(f'Given schedule {schedule} is not feasible.')
+        states = MipModel.setup_states(schedule)
+        for (machine_type, time_period), production_var in self.production_vars.items():
+            self.model.AddHint(production_var, int(schedule[time_period] == machine_type))
+            self.model.AddHint(self.state_vars[(machine_type, time_period)], int(states[time_period] == machine_type))
+        for (type_i, type_j, time_period), transition_var in self.transition_vars.items():
+            self.model.AddHint(transition_var, int(states[time_period - 1] == type_i and states[time_period] == type_j))
+
+    def solve(self, num_workers: int = 8, time_limit: float = None, relative_gap: float = None,
+              verbose: bool = False, on_solution: Optional[Callable[[float, float], None]] = None) -> int:
+        """Solve the model via CP-SAT and return the solver status.
+
+        All constraints are linearized (linearization level 2) since the linear relaxation of the changeover arcs
+        provides the bounds CP-SAT lacks otherwise.
+
+        :param num_workers: the number of parallel search workers
+        :param time_limit: the time limit (in seconds); unlimited if None
+        :param relative_gap: the relative gap at which the search stops; proven optimality if None
+        :param verbose: whether to enable solver output
+        :param on_solution: called with the objective value and the best bound whenever a new solution is found
+        """
+        self.solver = cp_model.CpSolver()
+        self.solver.parameters.num_search_workers = num_workers
+        self.solver.parameters.linearization_level = 2
+        if time_limit is not None:
+            self.solver.parameters.max_time_in_seconds = time_limit
+        if relative_gap is not None:
+            self.solver.parameters.relative_gap_limit = relative_gap
+        self.solver.parameters.log_search_progress = verbose
+        if on_solution is None:
+            return self.solver.Solve(self.model)
+        return self.solver.Solve(self.model, SolutionReporter(on_solution))
+
+    def create_schedule(self) -> List[int]:
+        """Return the schedule based on the computed solution (in the form of :func:`create_schedule`)."""
+        schedule = [-1] * self.prob_input.num_time_periods
+        for (machine_type, time_period), production_var in self.production_vars.items():
+            if self.solver.Value(production_var):
+                schedule[time_period] = machine_type
+        return schedule
+
+
+BACKENDS = {'scip': pywraplp.Solver.SCIP_MIXED_INTEGER_PROGRAMMING,
+            'cbc': pywraplp.Solver.CBC_MIXED_INTEGER_PROGRAMMING,
+            'cp-sat': pywraplp.Solver.SAT_INTEGER_PROGRAMMING}
+
+
+def create_solver(backend: str = 'scip') -> pywraplp.Solver:
+    """Return a solver instance of the given backend (SCIP by default)."""
+    if backend not in BACKENDS:
+        raise ValueError(f'Given backend {backend} expected to be one of {tuple(BACKENDS)}.')
+    return pywraplp.Solver('solver', BACKENDS[backend])
+
+
+def create_schedule(model: MipModel) -> List[int]:
+    """Return the schedule based on the computed solution."""
+    epsilon = 0.01
+    produced_types = [[] for _ in range(model.prob_input.num_time_periods)]
+    for (machine_type, time_period), production_var in sorted(model.production_vars.items()):
+        if production_var.solution_value() > 1. - epsilon:
+            produced_types[time_period].append(machine_type)
+    schedule = [-1] * model.prob_input.num_time_periods
+    for time_period, produced_type in enumerate(produced_types):
+        if len(produced_type) == 1:
+            schedule[time_period] = produced_type[0]
+        elif len(produced_type) > 1:
+            raise RuntimeError(f'Several machine types {produced_type} produced in time period {time_period}')
+    return schedule
+
+
+FORMULATIONS = {'standard': MipModel, 'flow': FlowMipModel}
@@ -0,0 +1,243 @@
+"""Module responsible for computing schedules of long planning horizons via rolling-horizon decomposition."""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from ortools.linear_solver import pywraplp
+
+from lot_sizing.heuristic import earliest_deadline_schedule
+from lot_sizing.input import Input, InputError
+from lot_sizing.model import FORMULATIONS, create_schedule, create_solver
+
+
+class Window(NamedTuple):
+    """Sub-problem of the time periods start, ..., stop - 1.
+
+    The sub-problem is an instance of its own whose demand consists of the items to be produced within the window (with
+    deadlines relative to start). The machine is configured for the initial setup before the window and has to change to
+    the final setup after the window (None if unconstrained). The hint is a feasible schedule of the sub-problem.
+    """
+    start: int
+    stop: int
+    sub_input: Input
+    initial_setup: Optional[int] = None
+    final_setup: Optional[int] = None
+    hint: Optional[List[int]] = None
+
+
+def _sub_input(prob_input: Input, start: int, stop: int, types: List[int], deadlines: List[int]) -> Input:
+    """Returns the instance of the time periods start, ..., stop - 1 demanding items of the given types and deadlines."""
+    demand = np.zeros((prob_input.num_types, stop - start), dtype=np.int64)
+    np.add.at(demand, (np.asarray(types, dtype=np.int64), np.asarray(deadlines, dtype=np.int64) - start), 1)
+    if demand.size and demand.max() > np.iinfo(np.int8).max:
+        raise InputError(f'Demand of window [{start}, {stop}) expected to be at most {np.iinfo(np.int8).max} per time '
+                         f'period.')
+    return Input.from_arrays(demand, prob_input.inventory_cost, prob_input.transition_cost)
+
+
+def _last_production(schedule: List[int]) -> Optional[int]:
+    """Returns the machine type of the last production of the given (partial) schedule (or None if there is none)."""
+    return next((machine_type for machine_type in reversed(schedule) if machine_type >= 0), None)
+
+
+def free_window(prob_input: Input, prefix: List[int], stop: int) -> Window:
+    """Returns the sub-problem following the given committed prefix up to (exclusive) time period stop.
+
+    The stock built up by the prefix is carried over by netting it against the demand, i.e., the items already produced
+    for a machine type are the ones with the earliest deadlines. The remaining items due within the window are demanded
+    at their deadlines. The remaining items due after the window are assigned to the time periods stop, ..., n - 1
+    backwards, latest deadline first; the items which do not fit have to be produced within the window and are demanded
+    in its last time period. The initial setup is the machine type of the last production of the prefix.
+
+    :param prob_input: the input problem instance to consider
+    :param prefix: the committed schedule of the time periods 0, ..., start - 1
+    :param stop: the time period after the window
+    """
+    start = len(prefix)
+    produced = np.bincount([machine_type for machine_type in prefix if machine_type >= 0],
+                           minlength=prob_input.num_types)
+    types, deadlines, later = [], [], []
+    for machine_type in range(prob_input.num_types):
+        remaining = prob_input.deadlines[machine_type, produced[machine_type]:prob_input.num_demands[machine_type]]
+        if len(remaining) and remaining[0] < start:
+            raise InputError(f'Committed prefix misses demand of machine type {machine_type} due in time period '
+                             f'{remaining[0]}.')
+        inside = remaining[remaining < stop].tolist()
+        types += [machine_type] * len(inside)
+        deadlines += inside
+        later += [(deadline, machine_type) for deadline in remaining[remaining >= stop].tolist()]
+    slot = prob_input.num_time_periods
+    for deadline, machine_type in sorted(later, reverse=True):
+        slot = min(slot - 1, deadline)
+        if slot < stop:
+            types.append(machine_type)
+            deadlines.append(stop - 1)
+    return Window(start, stop, _sub_input(prob_input, start, stop, types, deadlines), _last_production(prefix))
+
+
+def fixed_window(prob_input: Input, schedule: List[int], start: int, stop: int) -> Window:
+    """Returns the sub-problem of re-scheduling the time periods start, ..., stop - 1 of the given feasible schedule.
+
+    The window produces the same number of items of each machine type as the schedule does within the window, i.e.,
+    the items of the corresponding ranks, with their deadlines capped at the last time period of the window. Initial and
+    final setup are the machine types of the adjacent productions of the schedule. Hence, replacing the window of the
+    schedule by any feasible schedule of the sub-problem results in a feasible schedule whose costs differ by the
+    difference of the objective values of the sub-problem (for costs as in :class:`lot_sizing.model.MipModel`).
+
+    :param prob_input: the input problem instance to consider
+    :param schedule: the feasible schedule to re-schedule a window of
+    :param start: the first time period of the window
+    :param stop: the time period after the window
+    """
+    types, deadlines = [], []
+    for machine_type in range(prob_input.num_types):
+        before = schedule[:start].count(machine_type)
+        within = schedule[start:stop].count(machine_type)
+        ranks = np.minimum(np.arange(before, before + within), prob_input.deadlines.shape[1] - 1)
+        types += [machine_type] * within
+        deadlines += np.minimum(prob_input.deadlines[machine_type, ranks], stop - 1).tolist()
+    final_setup = next((machine_type for machine_type in schedule[stop:] if machine_type >= 0), None)
+    return Window(start, stop, _sub_input(prob_input, start, stop, types, deadlines),
+                  _last_production(schedule[:start]), final_setup, list(schedule[start:stop]))
+
+
+def solve_window(window: Window, formulation: str = 'standard', backend: str = 'scip',
+                 time_limit: Optional[float] = None) -> List[int]:
+    """Solve the sub-problem of the given window via the mip and return its schedule.
+
+    The transitions from the initial setup and to the final setup are charged via the objective coefficients of the
+    state variables of the first and the last time period. The solver is warm-started with the hint of the window (or
+    the earliest deadline schedule of the sub-problem), which is returned if the solver does not find a schedule within
+    the time limit.
+
+    :param window: the window to solve
+    :param formulation: the mip formulation to use (see :data:`lot_sizing.model.FORMULATIONS`)
+    :param backend: the mip backend to use
+    :param time_limit: the time limit (in seconds); unlimited if None
+    """
+    sub_input = window.sub_input
+    hint = window.hint if window.hint is not None else earliest_deadline_schedule(sub_input)
+    solver = create_solver(backend)
+    if time_limit is not None:
+        solver.SetTimeLimit(int(time_limit * 1000))
+    mip_model = FORMULATIONS[formulation].build_mip(sub_input, solver)
+    setup_costs = np.zeros((sub_input.num_types, sub_input.num_time_periods))
+    if window.initial_setup is not None:
+        setup_costs[:, 0] += sub_input.transition_cost[window.initial_setup]
+    if window.final_setup is not None:
+        setup_costs[:, -1] += sub_input.transition_cost[:, window.final_setup]
+    for machine_type, time_period in zip(*np.nonzero(setup_costs)):
+        solver.Objective().SetCoefficient(mip_model.state_vars[(int(machine_type), int(time_period))],
+                                          float(setup_costs[machine_type, time_period]))
+    mip_model.set_hint(hint)
+    status = solver.Solve()
+    if status not in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE):
+        return hint
+    return create_schedule(mip_model)
+
+
+class RollingHorizonSolver:
+    """Computes a schedule by solving mip sub-problems over windows of window_size time periods.
+
+    Sequentially (one worker), the windows overlap by `overlap` time periods: the schedule of the first
+    `window_size - overlap` time periods of a window is committed and the next window starts after the committed prefix,
+    carrying over its stock and machine setup (see :func:`free_window`). The last window is committed completely.
+
+    In parallel (several workers), the horizon is split into consecutive blocks of window_size time periods which are
+    solved simultaneously as re-scheduling sub-problems of the earliest deadline schedule (see :func:`fixed_window`)
+    and stitched together.
+
+    Finally, the stitched schedule is polished by re-scheduling windows centred on the boundaries of the committed
+    prefixes (respectively blocks); a re-scheduled window is only accepted if it does not increase the costs.
+    """
+
+    def __init__(self, prob_input: Input, window_size: int = 30, overlap: int = 10, formulation: str = 'standard',
+                 backend: str = 'scip', time_limit: Optional[float] = None, num_workers: int = 1,
+                 polish: bool = True):
+        """
+        :param prob_input: the input problem instance to consider
+        :param window_size: the number of time periods of a window
+        :param overlap: the number of time periods by which consecutive windows overlap (sequentially)
+        :param formulation: the mip formulation to use (see :data:`lot_sizing.model.FORMULATIONS`)
+        :param backend: the mip backend to use
+        :param time_limit: the time limit (in seconds) per window; unlimited if None
+        :param num_workers: the number of windows solved simultaneously
+        :param polish: whether to polish the stitched schedule
+        """
+        if not 0 <= overlap < window_size:
+            raise ValueError(f'Given overlap {overlap} expected to be non-negative and smaller than window size '
+                             f'{window_size}.')
+        if formulation not in FORMULATIONS:
+            raise ValueError(f'Given formulation {formulation} expected to be one of {tuple(FORMULATIONS)}.')
+        self.prob_input = prob_input
+        self.window_size = window_size
+        self.overlap = overlap
+        self.formulation = formulation
+        self.backend = backend
+        self.time_limit = time_limit
+        self.num_workers = num_workers
+        self.polish = polish
+        self.num_windows = 0
+        self.stitched_cost = None
+        self.best_cost = None
+
+    def _solve(self, window: Window) -> List[int]:
+        """Solve the sub-problem of the given window."""
+        self.num_windows += 1
+        return solve_window(window, self.formulation, self.backend, self.time_limit)
+
+    def _solve_sequentially(self) -> Tuple[List[int], List[int]]:
+        """Return the schedule of overlapping windows solved one after another and the boundaries of their prefixes."""
+        schedule, boundaries = [], []
+        num_time_periods = self.prob_input.num_time_periods
+        while len(schedule) < num_time_periods:
+            stop = min(len(schedule) + self.window_size, num_time_periods)
+            window = free_window(self.prob_input, schedule, stop)
+            commit = self.window_size - self.overlap if stop < num_time_periods else stop - window.start
+            schedule += self._solve(window)[:commit]
+            boundaries.append(len(schedule))
+        return schedule, boundaries[:-1]
+
+    def _solve_in_parallel(self) -> Tuple[List[int], List[int]]:
+        """Return the schedule of consecutive blocks solved simultaneously and the boundaries of the blocks."""
+        reference = earliest_deadline_schedule(self.prob_input)
+        boundaries = list(range(0, self.prob_input.num_time_periods, self.window_size))[1:]
+        windows = [fixed_window(self.prob_input, reference, start, stop) for start, stop in
+                   zip([0] + boundaries, boundaries + [self.prob_input.num_time_periods])]
+        with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
+            schedules = list(executor.map(solve_window, windows, [self.formulation] * len(windows),
+                                          [self.backend] * len(windows), [self.time_limit] * len(windows)))
+        self.num_windows += len(windows)
+        return [machine_type for schedule in schedules for machine_type in schedule], boundaries
+
+    def _polish(self, schedule: List[int], boundaries: List[int]) -> List[int]:
+        """Re-schedule windows centred on the given boundaries as long as this does not increase the costs."""
+        cost = self.prob_input.compute_model_costs(schedule)
+        for boundary in boundaries:
+            start = max(boundary - self.window_size // 2, 0)
+            stop = min(start + self.window_size, self.prob_input.num_time_periods)
+            candidate = schedule[:start] + self._solve(fixed_window(self.prob_input, schedule, start, stop)) + \
+                schedule[stop:]
+            candidate_cost = self.prob_input.compute_model_costs(candidate)
+            if candidate_cost <= cost and self.prob_input.is_feasible(candidate):
+                schedule, cost = candidate, candidate_cost
+        return schedule
+
+    def solve(self) -> List[int]:
+        """Returns the stitched (and polished) schedule; raises InputError if the instance does not admit a feasible
+        schedule."""
+        self.num_windows = 0
+        # fails upfront on infeasible instances instead of in whichever window first misses a demand
+        earliest_deadline_schedule(self.prob_input)
+        if self.num_workers > 1:
+            schedule, boundaries = self._solve_in_parallel()
+        else:
+            schedule, boundaries = self._solve_sequentially()
+        if not self.prob_input.is_feasible(schedule):
+            raise RuntimeError('Stitched schedule is not feasible.')
+        self.stitched_cost = self.prob_input.compute_model_costs(schedule)
+        if self.polish:
+            schedule = self._polish(schedule, boundaries)
+        self.best_cost = self.prob_input.compute_model_costs(schedule)
+        return schedule
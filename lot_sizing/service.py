@@ -0,0 +1,368 @@
+"""Module responsible for serving solve requests from a resident pool of worker processes."""
+
+import json
+import multiprocessing
+import queue
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Dict, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from lot_sizing.batch import kill_worker, solve_record, start_worker
+from lot_sizing.cache import SolutionCache
+from lot_sizing.input import Input, InputError
+from lot_sizing.metrics import RunMetrics
+from lot_sizing.model import BACKENDS, FORMULATIONS, create_solver
+from lot_sizing.solve import ENGINES, SolverSettings, solve_instance
+
+
+class ServiceBusy(Exception):
+    """Raised if the request queue of the service is full."""
+
+
+def _serve_solves(connection, cache_dir: Optional[str], cache_size: int):
+    """Solves the instances received via connection until None is received and sends back the result (or the error)
+    together with the stage times; run in a worker."""
+    cache = None if cache_dir is None else SolutionCache(cache_dir, max_size=cache_size)
+    # loads the solver libraries before the first request arrives
+    create_solver()
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        prob_input, settings = request
+        metrics = RunMetrics()
+        try:
+            result = solve_instance(prob_input, settings, cache=cache, metrics=metrics)
+            connection.send(('ok' if result.schedule is not None else 'no_solution', result, None, metrics.times))
+        except Exception as error:
+            connection.send(('error', None, ''.join(traceback.format_exception_only(type(error), error)).strip(),
+                             metrics.times))
+    connection.close()
+
+
+def _summary(values: Sequence[float]) -> Dict:
+    """Returns the count, mean, median, 95th percentile and maximum of the given values (None if there are none)."""
+    if not values:
+        return {'count': 0, 'mean': None, 'p50': None, 'p95': None, 'max': None}
+    values = np.asarray(values)
+    return {'count': len(values), 'mean': round(float(values.mean()), 3),
+            'p50': round(float(np.percentile(values, 50)), 3), 'p95': round(float(np.percentile(values, 95)), 3),
+            'max': round(float(values.max()), 3)}
+
+
+class SolveRequest:
+    """Instance submitted to a :class:`SolverService` together with its settings; the record is available once the
+    request is done."""
+
+    def __init__(self, prob_input: Input, settings: SolverSettings, timeout: Optional[float]):
+        self.prob_input = prob_input
+        self.settings = settings
+        self.timeout = timeout
+        self.submit_time = time.perf_counter()
+        self.record = None
+        self._done = threading.Event()
+
+    def done(self) -> bool:
+        """Returns whether the request is done."""
+        return self._done.is_set()
+
+    def result(self, timeout: Optional[float] = None) -> Optional[Dict]:
+        """Waits until the request is done (at most timeout seconds if given) and returns its record (None if the
+        request is not done yet)."""
+        self._done.wait(timeout)
+        return self.record
+
+    def _finish(self, record: Dict):
+        self.record = record
+        self._done.set()
+
+
+class SolverService:
+    """Resident pool of worker processes solving submitted instances.
+
+    Each worker process is started once (with the solver libraries loaded) and solves one request after the other, so
+    that a request does not pay for starting python, importing OR-Tools or opening the cache. Requests wait in a bounded
+    queue; if it is full, :meth:`submit` raises :class:`ServiceBusy`. A solve exceeding its timeout (or crashing) kills
+    its worker process, which is replaced by a fresh one. A record of a request is a record of
+    :func:`lot_sizing.batch.solve_batch` (without file) extended by the cost of the schedule (see
+    :meth:`lot_sizing.input.Input.compute_costs`) and the time (in seconds) the request waited in the queue.
+    """
+
+    def __init__(self, settings: SolverSettings = SolverSettings(), num_workers: int = 1, queue_size: int = 64,
+                 timeout: Optional[float] = None, cache_dir: Optional[str] = None, cache_size: int = 256 * 2 ** 20,
+                 history: int = 1000):
+        """
+        :param settings: the default settings of a request
+        :param num_workers: the number of worker processes, i.e., the maximal number of simultaneous solves
+        :param queue_size: the maximal number of requests waiting for a worker
+        :param timeout: the default and maximal wall time (in seconds) after which a solve is killed (unlimited if
+            None)
+        :param cache_dir: the directory of the solution cache (no cache is used if None)
+        :param cache_size: the maximal size (in bytes) of the solution cache
+        :param history: the number of most recent requests the latency statistics are computed over
+        """
+        self.settings = settings
+        self.num_workers = num_workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._threads = []
+        self._closed = False
+        self._start_time = time.perf_counter()
+        self._busy = 0
+        self._submitted = 0
+        self._rejected = 0
+        self._statuses = Counter()
+        self._latencies = deque(maxlen=history)
+        self._queue_times = deque(maxlen=history)
+        self._wall_times = deque(maxlen=history)
+
+    def start(self):
+        """Starts the worker processes."""
+        for _ in range(self.num_workers):
+            thread = threading.Thread(target=self._dispatch, args=(self._start_worker(),), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def close(self):
+        """Solves the requests left in the queue and stops the worker processes."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def submit(self, prob_input: Input, settings: Optional[SolverSettings] = None,
+               timeout: Optional[float] = None) -> SolveRequest:
+        """Queues the given instance and returns the request (whose record becomes available once solved).
+
+        :param prob_input: the input problem instance to solve
+        :param settings: the settings to use (the default settings of the service if None)
+        :param timeout: the wall time (in seconds) after which the solve is killed (default timeout if None); it is
+            capped by the default timeout
+        """
+        if timeout is None or (self.timeout is not None and self.timeout < timeout):
+            timeout = self.timeout
+        request = SolveRequest(prob_input, settings or self.settings, timeout)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('Service is closed.')
+            try:
+                self._queue.put_nowait(request)
+            except queue.Full:
+                self._rejected += 1
+                raise ServiceBusy(f'Request queue is full ({self.queue_size} requests).')
+            self._submitted += 1
+        return request
+
+    def solve(self, prob_input: Input, settings: Optional[SolverSettings] = None,
+              timeout: Optional[float] = None) -> Dict:
+        """Submits the given instance (see :meth:`submit`) and waits for its record."""
+        return self.submit(prob_input, settings, timeout).result()
+
+    def stats(self) -> Dict:
+        """Returns the queue depth, the number of busy workers, the number of requests per status and the latency,
+        queue time and wall time statistics (in seconds) of the most recent requests."""
+        with self._lock:
+            return {'uptime': round(time.perf_counter() - self._start_time, 3), 'num_workers': self.num_workers,
+                    'busy_workers': self._busy, 'queue_depth': self._queue.qsize(), 'queue_size': self.queue_size,
+                    'submitted': self._submitted, 'rejected': self._rejected, 'completed': dict(self._statuses),
+                    'latency': _summary(self._latencies), 'queue_time': _summary(self._queue_times),
+                    'wall_time': _summary(self._wall_times)}
+
+    def _start_worker(self) -> Tuple[multiprocessing.Process, object]:
+        connection, worker_connection = multiprocessing.Pipe()
+        process = start_worker(_serve_solves, (worker_connection, self.cache_dir, self.cache_size))
+        worker_connection.close()
+        return process, connection
+
+    def _dispatch(self, worker: Tuple[multiprocessing.Process, object]):
+        """Passes the queued requests to the given worker process until None is dequeued; run in a thread."""
+        while True:
+            request = self._queue.get()
+            if request is None:
+                break
+            with self._lock:
+                self._busy += 1
+            worker, record = self._run(worker, request)
+            record['cost'] = None
+            if record['schedule'] is not None:
+                record['cost'] = int(request.prob_input.compute_costs(record['schedule']))
+            with self._lock:
+                self._busy -= 1
+                self._statuses[record['status']] += 1
+                self._latencies.append(record['queue_time'] + record['wall_time'])
+                self._queue_times.append(record['queue_time'])
+                self._wall_times.append(record['wall_time'])
+            request._finish(record)
+        process, connection = worker
+        try:
+            connection.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        process.join()
+        connection.close()
+
+    def _run(self, worker: Tuple[multiprocessing.Process, object], request: SolveRequest) -> Tuple[Tuple, Dict]:
+        """Solves the given request via the given worker process and returns the (possibly replaced) worker and the
+        record of the request."""
+        process, connection = worker
+        start_time = time.perf_counter()
+        queue_time = round(start_time - request.submit_time, 3)
+        try:
+            connection.send((request.prob_input, request.settings))
+            if connection.poll(request.timeout):
+                status, result, error, times = connection.recv()
+                record = solve_record(status, time.perf_counter() - start_time, result, error, times)
+                return worker, {**record, 'queue_time': queue_time}
+            record = solve_record('timeout', time.perf_counter() - start_time,
+                                  error=f'Solve exceeded timeout of {request.timeout}s.')
+            kill_worker(process)
+        except (EOFError, BrokenPipeError, ConnectionResetError):
+            # kills the processes the crashed worker left behind
+            kill_worker(process)
+            record = solve_record('crashed', time.perf_counter() - start_time,
+                                  error=f'Worker exited with code {process.exitcode}.')
+        process.join()
+        connection.close()
+        return self._start_worker(), {**record, 'queue_time': queue_time}
+
+
+def settings_from(values: Dict, base: SolverSettings = SolverSettings()) -> SolverSettings:
+    """Returns the given settings with the fields given by values replaced.
+
+    :raises ValueError: if values contain an unknown field, engine, formulation or backend
+    """
+    unknown = set(values) - set(SolverSettings._fields)
+    if unknown:
+        raise ValueError(f'Unknown settings {sorted(unknown)}.')
+    if 'backends' in values:
+        backends = values['backends']
+        values = {**values, 'backends': (backends,) if isinstance(backends, str) else tuple(backends)}
+    settings = base._replace(**values)
+    if settings.engine not in ENGINES:
+        raise ValueError(f'Given engine {settings.engine} expected to be one of {ENGINES}.')
+    if settings.formulation not in FORMULATIONS:
+        raise ValueError(f'Given formulation {settings.formulation} expected to be one of {tuple(FORMULATIONS)}.')
+    if not settings.backends or not set(settings.backends) <= set(BACKENDS):
+        raise ValueError(f'Given backends {settings.backends} expected to be among {tuple(BACKENDS)}.')
+    return settings
+
+
+def _query_value(value: str):
+    """Returns the JSON value given in a query string, or the string itself if it is no JSON."""
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def parse_request(body: bytes, query: str = '', base: SolverSettings = SolverSettings()) \
+        -> Tuple[Input, SolverSettings, Optional[float]]:
+    """Returns the instance, settings and timeout of a solve request.
+
+    The body either contains the instance in the text format of :meth:`lot_sizing.input.Input.read_file` or a JSON
+    object with fields `demand`, `inventory_cost` and `transition_cost` (see :meth:`lot_sizing.input.Input.from_arrays`)
+    and optional fields `settings` (an object of fields of :class:`lot_sizing.solve.SolverSettings`) and `timeout`. For
+    a text body, settings and timeout are given as query parameters instead, e.g., `engine=mip&mip_time_limit=10`.
+
+    :raises InputError: if the instance is invalid
+    :raises ValueError: if the request is malformed
+    """
+    text = body.decode('utf8')
+    values = {key: _query_value(value[-1]) for key, value in parse_qs(query).items()}
+    if text.lstrip().startswith('{'):
+        data = json.loads(text)
+        missing = {'demand', 'inventory_cost', 'transition_cost'} - set(data)
+        if missing:
+            raise ValueError(f'Missing fields {sorted(missing)}.')
+        prob_input = Input.from_arrays(data['demand'], data['inventory_cost'], data['transition_cost'])
+        values = {**values, **data.get('settings', dict())}
+        if 'timeout' in data:
+            values['timeout'] = data['timeout']
+    else:
+        prob_input = Input.read_text(text)
+    timeout = values.pop('timeout', None)
+    return prob_input, settings_from(values, base), None if timeout is None else float(timeout)
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """Handles `POST /solve` (see :func:`parse_request`), answered by the record of the request, and `GET /stats`,
+    answered by the statistics of the service (see :meth:`SolverService.stats`)."""
+
+    def do_GET(self):
+        if urlsplit(self.path).path == '/stats':
+            self._send(200, self.server.service.stats())
+        else:
+            self._send(404, {'error': f'Unknown path {self.path}.'})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != '/solve':
+            self._send(404, {'error': f'Unknown path {self.path}.'})
+            return
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        service = self.server.service
+        try:
+            prob_input, settings, timeout = parse_request(body, url.query, service.settings)
+        except (InputError, ValueError, TypeError) as error:
+            self._send(400, {'error': str(error)})
+            return
+        try:
+            request = service.submit(prob_input, settings, timeout)
+        except ServiceBusy as error:
+            self._send(503, {'error': str(error)})
+            return
+        self._send(200, request.result())
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _send(self, code: int, record: Dict):
+        content = json.dumps(record).encode('utf8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class ServiceServer(ThreadingMixIn, HTTPServer):
+    """HTTP server handling each connection in a thread of its own and passing solve requests to the given
+    service."""
+    daemon_threads = True
+
+    def __init__(self, service: SolverService, address: Tuple[str, int] = ('127.0.0.1', 8000), quiet: bool = False):
+        """
+        :param service: the service solving the requests
+        :param address: the host and port to listen on
+        :param quiet: whether to suppress the log line per request
+        """
+        self.service = service
+        self.quiet = quiet
+        super().__init__(address, ServiceRequestHandler)
+
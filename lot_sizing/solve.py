@@ -0,0 +1,375 @@
+"""Module responsible for computing schedules via the available engines."""
+
+import multiprocessing
+import os
+import time
+import traceback
+from multiprocessing.connection import wait
+from typing import List, NamedTuple, Optional, Tuple
+
+from ortools.linear_solver import pywraplp
+from ortools.sat.python import cp_model
+
+from lot_sizing.dynamic_program import DpCertificate, solve_exactly
+from lot_sizing.heuristic import HeuristicSolver, earliest_deadline_schedule
+from lot_sizing.input import Input, InputError
+from lot_sizing.metrics import RunMetrics
+from lot_sizing.model import FORMULATIONS, BulkMipModel, CpSatModel, MipModel, create_schedule, create_solver
+from lot_sizing.rolling_horizon import RollingHorizonSolver
+
+ENGINES = ('auto', 'mip', 'heuristic', 'dp', 'cp', 'rolling')
+# default number of parallel search workers of CP-SAT
+CP_SAT_WORKERS = min(os.cpu_count() or 1, 8)
+# time (in seconds) granted to raced backends beyond the mip time limit for returning their incumbent
+RACE_GRACE_TIME = 5.
+
+
+class SolverSettings(NamedTuple):
+    """Settings determining how a schedule is computed.
+
+    The engine `auto` uses the dynamic program if its states fit into the memory limit (in MiB) and the mip otherwise.
+    The time limit (in seconds) and the seed apply to the heuristic engine; the mip time limit (in seconds, unlimited if
+    None), the number of threads (solver default if None), the relative gap at which a solve stops (proven optimality
+    if None) and the backends apply to the mip engine. If several backends are given, they are raced against each other
+    (see :func:`race_mip`). The cp engine solves :class:`lot_sizing.model.CpSatModel` via CP-SAT under the mip time
+    limit and relative gap with the number of threads as number of search workers. The rolling engine solves mip
+    sub-problems of window_size time periods overlapping by window_overlap time periods (see
+    :class:`lot_sizing.rolling_horizon.RollingHorizonSolver`) with window_workers windows solved simultaneously; the
+    formulation, the first backend and the mip time limit (per window) apply.
+    """
+    engine: str = 'auto'
+    formulation: str = 'standard'
+    bulk_build: bool = False
+    method: str = 'tabu'
+    time_limit: float = 10.
+    seed: Optional[int] = None
+    memory_limit: int = 1024
+    warm_start: bool = True
+    mip_time_limit: Optional[float] = None
+    num_threads: Optional[int] = None
+    relative_gap: Optional[float] = None
+    backends: Tuple[str, ...] = ('scip',)
+    window_size: int = 30
+    window_overlap: int = 10
+    window_workers: int = 1
+
+
+class SolveResult(NamedTuple):
+    """Schedule computed by an engine together with its objective value and the best known bound.
+
+    The schedule is None if the engine did not compute a schedule. The backend is the mip backend which computed the
+    schedule. All engines share the objective of the mip and cp models, in which the machine may be reconfigured in idle
+    time periods (see :meth:`lot_sizing.input.Input.compute_model_costs`).
+    """
+    schedule: Optional[List[int]]
+    objective: Optional[float]
+    bound: Optional[float]
+    engine: str
+    optimal: bool
+    certificate: Optional[DpCertificate] = None
+    backend: Optional[str] = None
+
+
+def compute_gap(objective: Optional[float], bound: Optional[float]) -> Optional[float]:
+    """Returns the relative gap between objective value and bound (or None if one of them is unknown)."""
+    if objective is None or bound is None:
+        return None
+    if objective == bound:
+        return 0.
+    return abs(objective - bound) / max(abs(objective), 1e-9)
+
+
+def warm_start_schedule(prob_input: Input, start_schedule: Optional[List[int]]) -> Optional[List[int]]:
+    """Return the better of the given schedule and the earliest deadline schedule (or None if neither is feasible)."""
+    try:
+        return better_schedule(prob_input, start_schedule, earliest_deadline_schedule(prob_input))
+    except InputError:
+        return None
+
+
+def better_schedule(prob_input: Input, *schedules: Optional[List[int]]) -> Optional[List[int]]:
+    """Return the cheapest feasible schedule among the given ones (or None if there is none)."""
+    feasible = [schedule for schedule in schedules if
+                schedule is not None and len(schedule) == prob_input.num_time_periods and
+                prob_input.is_feasible(schedule)]
+    return min(feasible, key=prob_input.compute_model_costs, default=None)
+
+
+def solve_dp(prob_input: Input, settings: SolverSettings, metrics: Optional[RunMetrics] = None) -> SolveResult:
+    """Compute an optimal schedule via the dynamic program; raises InputError if the instance does not admit a feasible
+    schedule."""
+    metrics = metrics or RunMetrics()
+    with metrics.stage('dp'):
+        exact_solution = solve_exactly(prob_input, memory_limit=settings.memory_limit * 2 ** 20)
+    if exact_solution is None:
+        return SolveResult(None, None, None, 'dp', False)
+    schedule, certificate = exact_solution
+    metrics.record_progress(certificate.cost, certificate.cost)
+    metrics.info.update(num_states=certificate.num_states, num_dominated=certificate.num_dominated)
+    return SolveResult(schedule, certificate.cost, certificate.cost, 'dp', True, certificate)
+
+
+def solve_heuristic(prob_input: Input, settings: SolverSettings, start_schedule: Optional[List[int]] = None,
+                    metrics: Optional[RunMetrics] = None) -> SolveResult:
+    """Compute a schedule via tabu search or simulated annealing, starting from the given schedule if feasible.
+
+    The heuristics minimize the costs of :meth:`lot_sizing.input.Input.compute_costs`; the objective value of the
+    result is the cost of the schedule under the mip objective (see :meth:`lot_sizing.input.Input.compute_model_costs`)
+    like for the other engines.
+    """
+    metrics = metrics or RunMetrics()
+    heuristic = HeuristicSolver(prob_input, method=settings.method, time_limit=settings.time_limit, seed=settings.seed,
+                                on_improvement=metrics.record_progress)
+    with metrics.stage('solve'):
+        schedule = heuristic.solve(better_schedule(prob_input, start_schedule))
+    metrics.info['num_iterations'] = heuristic.num_iterations
+    return SolveResult(schedule, prob_input.compute_model_costs(schedule), None, 'heuristic', False)
+
+
+def solve_cp(prob_input: Input, settings: SolverSettings, start_schedule: Optional[List[int]] = None,
+             verbose: bool = False, metrics: Optional[RunMetrics] = None) -> SolveResult:
+    """Compute a schedule via CP-SAT, warm-started with the given schedule (or the earliest deadline schedule)."""
+    metrics = metrics or RunMetrics()
+    if settings.warm_start:
+        with metrics.stage('warm_start'):
+            start_schedule = warm_start_schedule(prob_input, start_schedule)
+    with metrics.stage('build'):
+        cp_sat_model = CpSatModel.build_model(prob_input)
+        if settings.warm_start and start_schedule is not None:
+            cp_sat_model.set_hint(start_schedule)
+    with metrics.stage('solve'):
+        status = cp_sat_model.solve(num_workers=settings.num_threads or CP_SAT_WORKERS,
+                                    time_limit=settings.mip_time_limit, relative_gap=settings.relative_gap,
+                                    verbose=verbose, on_solution=metrics.record_progress)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return SolveResult(None, None, None, 'cp', False)
+    objective, bound = cp_sat_model.solver.ObjectiveValue(), cp_sat_model.solver.BestObjectiveBound()
+    metrics.record_progress(objective, bound)
+    with metrics.stage('schedule'):
+        schedule = cp_sat_model.create_schedule()
+    return SolveResult(schedule, objective, bound, 'cp',
+                       status == cp_model.OPTIMAL and compute_gap(objective, bound) <= 1e-6)
+
+
+def solve_rolling(prob_input: Input, settings: SolverSettings, metrics: Optional[RunMetrics] = None) -> SolveResult:
+    """Compute a schedule via rolling-horizon decomposition into mip sub-problems."""
+    metrics = metrics or RunMetrics()
+    rolling_horizon = RollingHorizonSolver(prob_input, window_size=settings.window_size,
+                                           overlap=settings.window_overlap, formulation=settings.formulation,
+                                           backend=settings.backends[0], time_limit=settings.mip_time_limit,
+                                           num_workers=settings.window_workers)
+    with metrics.stage('solve'):
+        schedule = rolling_horizon.solve()
+    metrics.info.update(num_windows=rolling_horizon.num_windows, stitched_cost=rolling_horizon.stitched_cost)
+    metrics.record_progress(rolling_horizon.best_cost)
+    return SolveResult(schedule, rolling_horizon.best_cost, None, 'rolling', False)
+
+
+def solve_mip(prob_input: Input, settings: SolverSettings, start_schedule: Optional[List[int]] = None,
+              verbose: bool = False, metrics: Optional[RunMetrics] = None) -> SolveResult:
+    """Compute a schedule via the mip backend, warm-started with the given schedule (or the earliest deadline schedule).
+
+    If several backends are given by the settings, they are raced against each other.
+
+    :param prob_input: the input problem instance to consider
+    :param settings: the settings to use
+    :param start_schedule: the schedule to warm-start with
+    :param verbose: whether to enable solver output
+    :param metrics: the metrics to record stage times, model size and progress in
+    """
+    metrics = metrics or RunMetrics()
+    if len(settings.backends) > 1:
+        with metrics.stage('race'):
+            return race_mip(prob_input, settings, start_schedule, metrics)
+    if settings.warm_start:
+        with metrics.stage('warm_start'):
+            start_schedule = warm_start_schedule(prob_input, start_schedule)
+    solver, parameters = configure_solver(settings, verbose)
+    with metrics.stage('build'):
+        if settings.bulk_build:
+            mip_model = BulkMipModel.build_mip(prob_input, solver, names=False)
+        else:
+            mip_model = FORMULATIONS[settings.formulation].build_mip(prob_input, solver)
+    metrics.record_model(mip_model)
+    return solve_model(mip_model, settings, parameters, start_schedule if settings.warm_start else None, metrics)
+
+
+def configure_solver(settings: SolverSettings, verbose: bool = False) \
+        -> Tuple[pywraplp.Solver, pywraplp.MPSolverParameters]:
+    """Create the solver of the first backend of the settings together with the solve parameters, applying the mip
+    time limit, the number of threads and the relative gap of the settings."""
+    solver = create_solver(settings.backends[0])
+    if verbose:
+        solver.EnableOutput()
+    if settings.mip_time_limit is not None:
+        solver.SetTimeLimit(int(settings.mip_time_limit * 1000))
+    if settings.num_threads is not None:
+        solver.SetNumThreads(settings.num_threads)
+    parameters = pywraplp.MPSolverParameters()
+    if settings.relative_gap is not None:
+        parameters.SetDoubleParam(pywraplp.MPSolverParameters.RELATIVE_MIP_GAP, settings.relative_gap)
+    return solver, parameters
+
+
+def solve_model(mip_model: MipModel, settings: SolverSettings, parameters: pywraplp.MPSolverParameters,
+                start_schedule: Optional[List[int]] = None, metrics: Optional[RunMetrics] = None) -> SolveResult:
+    """Solve the given (built) mip, warm-started with the given feasible schedule, and extract the schedule.
+
+    :param mip_model: the mip to solve via its solver, created by the first backend of the settings
+    :param settings: the settings to use
+    :param parameters: the solve parameters (see :func:`configure_solver`)
+    :param start_schedule: the feasible schedule to hint (no hint if None)
+    :param metrics: the metrics to record stage times and progress in
+    """
+    metrics = metrics or RunMetrics()
+    backend, solver, prob_input = settings.backends[0], mip_model.solver, mip_model.prob_input
+    if start_schedule is not None:
+        with metrics.stage('hint'):
+            mip_model.set_hint(start_schedule)
+        metrics.record_progress(prob_input.compute_model_costs(start_schedule))
+    with metrics.stage('solve'):
+        status = solver.Solve(parameters)
+    metrics.info.update(backend=backend, nodes=solver.nodes(), iterations=solver.iterations())
+    if status not in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE):
+        return SolveResult(None, None, None, 'mip', False, backend=backend)
+    objective, bound = solver.Objective().Value(), solver.Objective().BestBound()
+    metrics.record_progress(objective, bound)
+    with metrics.stage('schedule'):
+        schedule = create_schedule(mip_model)
+    return SolveResult(schedule, objective, bound, 'mip',
+                       status == pywraplp.Solver.OPTIMAL and compute_gap(objective, bound) <= 1e-6, backend=backend)
+
+
+def _race_worker(prob_input: Input, settings: SolverSettings, start_schedule: Optional[List[int]], connection):
+    """Solves the mip via the single backend of the settings and sends the result (or the error) together with the
+    metrics record via connection."""
+    metrics = RunMetrics()
+    try:
+        result = solve_mip(prob_input, settings, start_schedule, metrics=metrics)
+        connection.send((result, None, metrics.to_dict()))
+    except Exception as error:
+        connection.send((None, ''.join(traceback.format_exception_only(type(error), error)).strip(), metrics.to_dict()))
+    finally:
+        connection.close()
+
+
+def race_mip(prob_input: Input, settings: SolverSettings, start_schedule: Optional[List[int]] = None,
+             metrics: Optional[RunMetrics] = None) -> SolveResult:
+    """Solve the mip via all backends of the settings concurrently (one process each) and return the winning result.
+
+    A backend wins as soon as it proves optimality or reaches the relative gap of the settings; the remaining backends
+    are then terminated. If no backend wins within the mip time limit (plus a grace time for returning incumbents), the
+    best incumbent among the finished backends is returned. The bound of the returned result is the best bound reported
+    by any finished backend. The metrics records of the finished backends are stored in the info of the given metrics.
+
+    :param prob_input: the input problem instance to consider
+    :param settings: the settings to use
+    :param start_schedule: the schedule to warm-start with
+    :param metrics: the metrics to store the metrics records of the backends in
+    """
+    metrics = metrics or RunMetrics()
+    metrics.info['backends'] = dict()
+    deadline = None
+    if settings.mip_time_limit is not None:
+        deadline = time.perf_counter() + settings.mip_time_limit + RACE_GRACE_TIME
+    running = dict()
+    for backend in settings.backends:
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(
+            target=_race_worker, daemon=True,
+            args=(prob_input, settings._replace(backends=(backend,)), start_schedule, sender))
+        process.start()
+        sender.close()
+        running[receiver] = (backend, process)
+    best, bound, errors, winner = None, None, [], None
+    while running and winner is None:
+        timeout = None if deadline is None else max(deadline - time.perf_counter(), 0.)
+        ready = wait(list(running), timeout=timeout)
+        if not ready:
+            break
+        for receiver in ready:
+            backend, process = running.pop(receiver)
+            try:
+                result, error, metrics.info['backends'][backend] = receiver.recv()
+            except EOFError:
+                result, error = None, f'Backend exited with code {process.exitcode}.'
+            receiver.close()
+            process.join()
+            if result is None:
+                errors.append(f'{backend}: {error}')
+                continue
+            if result.bound is not None:
+                bound = result.bound if bound is None else max(bound, result.bound)
+            if result.schedule is not None and (best is None or result.objective < best.objective):
+                best = result
+                metrics.record_progress(best.objective, bound)
+            if result.schedule is not None and (result.optimal or (
+                    settings.relative_gap is not None and
+                    compute_gap(result.objective, result.bound) <= settings.relative_gap)):
+                winner = result
+    for backend, process in running.values():
+        process.kill()
+        process.join()
+    for receiver in running:
+        receiver.close()
+    best = winner or best
+    if best is None:
+        if errors:
+            raise RuntimeError(f'All raced backends failed: {"; ".join(errors)}')
+        return SolveResult(None, None, bound, 'mip', False)
+    return best._replace(bound=bound)
+
+
+def solve_instance(prob_input: Input, settings: SolverSettings = SolverSettings(),
+                   start_schedule: Optional[List[int]] = None, cache=None, verbose: bool = False,
+                   metrics: Optional[RunMetrics] = None) -> SolveResult:
+    """Compute a schedule for the given instance via the engine given by the settings.
+
+    If a cache (see :class:`lot_sizing.cache.SolutionCache`) is given, a result stored for the same instance and
+    settings is returned right away; otherwise, the best schedule stored for the same instance (under any settings) is
+    used as start schedule and the computed result is stored if it has a schedule.
+
+    :param prob_input: the input problem instance to consider
+    :param settings: the settings to use
+    :param start_schedule: the schedule to warm-start the mip, cp and heuristic engines with
+    :param cache: the cache to use
+    :param verbose: whether to enable solver output
+    :param metrics: the metrics to record stage times, model size and solver progress in
+    :raises InputError: if the instance does not admit a feasible schedule and the engine (dp, heuristic or rolling)
+        needs one to start from; the mip and cp engines return a result without schedule instead
+    """
+    if settings.engine not in ENGINES:
+        raise ValueError(f'Given engine {settings.engine} expected to be one of {ENGINES}.')
+    metrics = metrics or RunMetrics()
+    if cache is not None:
+        with metrics.stage('cache'):
+            cached = cache.get(prob_input, settings)
+            if cached is None:
+                start_schedule = better_schedule(prob_input, start_schedule, cache.best_schedule(prob_input))
+        metrics.info['cached'] = cached is not None
+        if cached is not None:
+            return cached
+    result = None
+    if settings.engine == 'dp':
+        result = solve_dp(prob_input, settings, metrics)
+    elif settings.engine == 'auto':
+        try:
+            result = solve_dp(prob_input, settings, metrics)
+        except InputError:
+            # e.g., an infeasible instance; the mip reports it like any other instance without a solution
+            result = None
+        if result is not None and result.schedule is None:
+            result = None
+    if result is None and settings.engine == 'heuristic':
+        result = solve_heuristic(prob_input, settings, start_schedule, metrics)
+    if result is None and settings.engine == 'cp':
+        result = solve_cp(prob_input, settings, start_schedule, verbose, metrics)
+    if result is None and settings.engine == 'rolling':
+        result = solve_rolling(prob_input, settings, metrics)
+    if result is None:
+        result = solve_mip(prob_input, settings, start_schedule, verbose, metrics)
+    metrics.info['engine'] = result.engine
+    if cache is not None and result.schedule is not None:
+        with metrics.stage('cache'):
+            cache.put(prob_input, settings, result)
+    return result
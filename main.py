@@ -1,50 +1,225 @@
 #!/usr/bin/env python3
 
+import cProfile
+import json
+import os
+import sys
+import re
+import time
 from argparse import ArgumentParser
+from typing import List, Optional
 
-from ortools.linear_solver import pywraplp
+from lot_sizing.batch import find_instances, solve_batch
+from lot_sizing.cache import SolutionCache
+from lot_sizing.heuristic import HeuristicSolver, earliest_deadline_schedule
+from lot_sizing.input import Input, InputError
+from lot_sizing.metrics import RunMetrics, profile_hook
+from lot_sizing.model import BACKENDS, FORMULATIONS, create_solver
+from lot_sizing.service import ServiceServer, SolverService
+from lot_sizing.solve import ENGINES, SolverSettings, compute_gap, solve_instance
 
-from lot_sizing.input import Input
-from lot_sizing.model import MipModel
 
+def read_schedule(filepath: str) -> List[int]:
+    """Return the schedule given in the file, i.e., the machine type (or -1) of each time period."""
+    with open(filepath, 'r') as file:
+        return [int(state) for state in re.findall(r'-?\d+', file.read())]
 
-def write_model(filepath: str, solver: pywraplp):
-    with open(filepath, 'w') as file:
-        file.write(solver.ExportModelAsLpFormat(False))
 
-
-def create_schedule(model: MipModel):
-    """Return the schedule based on the computed solution."""
-    epsilon = 0.01
-    schedule = [-1] * model.prob_input.num_time_periods
-    for time_period in range(model.prob_input.num_time_periods):
-        solver_vars = [model.production_vars[(machine_type, time_period)] for machine_type in
-                       range(model.prob_input.num_types)]
-        solution_values = [x.solution_value() for x in solver_vars]
-        produced_type = [index for index, value in enumerate(solution_values) if value > 1. - epsilon]
-        if len(produced_type) == 1:
-            schedule[time_period] = produced_type[0]
-        elif len(produced_type) > 1:
-            raise RuntimeError(f'Several machine types {produced_type} produced in time period {time_period}')
-    return schedule
+def measure_first_incumbent(prob_input: Input, schedule: Optional[List[int]] = None,
+                            formulation: str = 'standard') -> float:
+    """Return the time (in seconds) SCIP needs to find its first incumbent, optionally warm-started by schedule."""
+    solver = create_solver()
+    mip_model = FORMULATIONS[formulation].build_mip(prob_input, solver)
+    if schedule is not None:
+        mip_model.set_hint(schedule)
+    solver.SetSolverSpecificParametersAsString('limits/solutions = 1\n')
+    start_time = time.perf_counter()
+    solver.Solve()
+    return time.perf_counter() - start_time
 
 
 cmd_parser = ArgumentParser(
     description='Integer programming formulations for the discrete, single-machine, multi-item, single-level lot sizing problem.')
-cmd_parser.add_argument('-f', '--file', metavar="input_file", type=str,
-                        help='File containing the input data',
-                        required=True)
+input_group = cmd_parser.add_mutually_exclusive_group(required=True)
+input_group.add_argument('-f', '--file', metavar="input_file", type=str,
+                         help='File containing the input data (in binary format if it ends with .npz)')
+input_group.add_argument('-b', '--batch', metavar='directory_or_glob', type=str,
+                         help='Solve all instances in the given directory (or matching the given glob pattern) in '
+                              'parallel and print one JSON line per instance as soon as its solve finishes')
+input_group.add_argument('--serve', metavar='[host:]port', type=str,
+                         help='Run a solver service answering POST /solve (instance as text or JSON) and GET /stats '
+                              'via HTTP on the given port (host 127.0.0.1 unless given)')
+cmd_parser.add_argument('-e', '--engine', choices=ENGINES, default='auto',
+                        help='Engine used for computing the schedule; auto uses the dynamic program if its states fit '
+                             'into the memory limit and the mip otherwise; cp uses the CP-SAT model; rolling solves the '
+                             'mip over overlapping windows of time periods')
+cmd_parser.add_argument('--formulation', choices=tuple(FORMULATIONS), default='standard',
+                        help='Mip formulation used by the mip engine')
+cmd_parser.add_argument('--bulk-build', action='store_true',
+                        help='Build the standard formulation in bulk (without variable and constraint names)')
+cmd_parser.add_argument('-m', '--method', choices=HeuristicSolver.METHODS, default='tabu',
+                        help='Metaheuristic used by the heuristic engine')
+cmd_parser.add_argument('-t', '--time-limit', metavar='seconds', type=float, default=10.,
+                        help='Time limit of the heuristic engine')
+cmd_parser.add_argument('--seed', type=int, default=None,
+                        help='Seed of the heuristic engine')
+cmd_parser.add_argument('--memory-limit', metavar='MiB', type=int, default=1024,
+                        help='Memory limit of the dynamic program')
+cmd_parser.add_argument('-s', '--start-schedule', metavar='schedule_file', type=str, default=None,
+                        help='File containing a feasible schedule used to warm-start the mip (default: earliest '
+                             'deadline schedule)')
+cmd_parser.add_argument('--no-warm-start', action='store_true',
+                        help='Solve the mip without hinting a start schedule')
+cmd_parser.add_argument('--report-first-incumbent', action='store_true',
+                        help='Report the time to the first incumbent of the mip with and without warm start')
+cmd_parser.add_argument('--mip-time-limit', metavar='seconds', type=float, default=None,
+                        help='Time limit of the mip and cp engines (default: unlimited)')
+cmd_parser.add_argument('--gap', metavar='relative_gap', type=float, default=None,
+                        help='Relative gap at which the mip and cp engines stop (default: proven optimality)')
+cmd_parser.add_argument('--backends', choices=tuple(BACKENDS), nargs='+', default=['scip'],
+                        help='Backends of the mip engine; several backends are raced in separate processes and the '
+                             'first one proving optimality (or reaching the gap) wins')
+cmd_parser.add_argument('--threads', metavar='num_threads', type=int, default=None,
+                        help='Number of threads per solve, i.e., search workers of the cp engine (default: solver default, '
+                             '1 in batch mode)')
+cmd_parser.add_argument('--window-size', metavar='time_periods', type=int, default=30,
+                        help='Number of time periods of a window of the rolling engine')
+cmd_parser.add_argument('--window-overlap', metavar='time_periods', type=int, default=None,
+                        help='Number of time periods by which consecutive windows of the rolling engine overlap '
+                             '(default: 10); only available for a single window worker, since blocks solved in '
+                             'parallel do not overlap')
+cmd_parser.add_argument('--window-workers', metavar='num_workers', type=int, default=1,
+                        help='Number of windows of the rolling engine solved simultaneously; several workers solve '
+                             'consecutive blocks of time periods in parallel and stitch them together')
+cmd_parser.add_argument('-w', '--workers', metavar='num_workers', type=int, default=None,
+                        help='Number of simultaneous solves in batch and service mode (default: number of CPUs)')
+cmd_parser.add_argument('--timeout', metavar='seconds', type=float, default=None,
+                        help='Wall time after which a solve is killed in batch and service mode (default: unlimited; requests of '
+                             'the service may only lower it)')
+cmd_parser.add_argument('--queue-size', metavar='num_requests', type=int, default=64,
+                        help='Maximal number of requests waiting for a worker in service mode; further requests are '
+                             'rejected with status 503')
+cmd_parser.add_argument('--cache-dir', metavar='directory', type=str, default=SolutionCache.default_directory(),
+                        help='Directory of the cache of computed schedules')
+cmd_parser.add_argument('--cache-size', metavar='MiB', type=int, default=256,
+                        help='Maximal size of the cache of computed schedules')
+cmd_parser.add_argument('--no-cache', action='store_true',
+                        help='Neither look up nor store computed schedules in the cache')
+cmd_parser.add_argument('--metrics', metavar='metrics_file', type=str, nargs='?', const='-', default=None,
+                        help='Write stage times, model size per variable and constraint family and incumbent and bound '
+                             'progress as JSON record to the given file (default: standard output)')
+cmd_parser.add_argument('--profile', metavar='stats_file', type=str, default=None,
+                        help='Profile the stages of the solve via cProfile and write the statistics to the given file')
+cmd_parser.add_argument('--clear-cache', action='store_true',
+                        help='Remove all entries from the cache before solving')
 
 if __name__ == '__main__':
     cmd_args = cmd_parser.parse_args()
-    prob_input = Input.read_file(cmd_args.file)
-    solver = pywraplp.Solver.CreateSolver('solver', 'SCIP')
-    solver.EnableOutput()
-    mip_model = MipModel.build_mip(prob_input, solver)
-    status = solver.Solve()
-    if status == pywraplp.Solver.OPTIMAL:
-        production_schedule = create_schedule(mip_model)
-        print(f'Computed schedule: {production_schedule}')
-        print(f'Objective value: {solver.Objective().Value()}')
+    if cmd_args.bulk_build and cmd_args.formulation != 'standard':
+        cmd_parser.error('--bulk-build is only available for the standard formulation')
+    if cmd_args.window_overlap is None:
+        cmd_args.window_overlap = 0 if cmd_args.window_workers > 1 else 10
+    elif cmd_args.window_workers > 1 and cmd_args.window_overlap > 0:
+        cmd_parser.error('--window-overlap is only available for a single window worker')
+    if not 0 <= cmd_args.window_overlap < cmd_args.window_size:
+        cmd_parser.error('--window-overlap has to be non-negative and smaller than --window-size')
+    num_threads = cmd_args.threads
+    if (cmd_args.batch is not None or cmd_args.serve is not None) and num_threads is None:
+        num_threads = 1
+    settings = SolverSettings(engine=cmd_args.engine, formulation=cmd_args.formulation,
+                              bulk_build=cmd_args.bulk_build, method=cmd_args.method,
+                              time_limit=cmd_args.time_limit, seed=cmd_args.seed,
+                              memory_limit=cmd_args.memory_limit, warm_start=not cmd_args.no_warm_start,
+                              mip_time_limit=cmd_args.mip_time_limit, num_threads=num_threads,
+                              relative_gap=cmd_args.gap, backends=tuple(cmd_args.backends),
+                              window_size=cmd_args.window_size, window_overlap=cmd_args.window_overlap,
+                              window_workers=cmd_args.window_workers)
+    if cmd_args.serve is not None:
+        host, _, port = cmd_args.serve.rpartition(':')
+        if not port.isdigit():
+            cmd_parser.error(f'invalid port {port}')
+        if cmd_args.no_cache:
+            cache_dir = None
+        else:
+            cache_dir = cmd_args.cache_dir
+            if cmd_args.clear_cache:
+                SolutionCache(cache_dir).clear()
+        with SolverService(settings, num_workers=cmd_args.workers or os.cpu_count() or 1,
+                           queue_size=cmd_args.queue_size, timeout=cmd_args.timeout, cache_dir=cache_dir,
+                           cache_size=cmd_args.cache_size * 2 ** 20) as service:
+            server = ServiceServer(service, (host or '127.0.0.1', int(port)))
+            print(f'Serving on http://{server.server_address[0]}:{server.server_address[1]}', flush=True)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                server.server_close()
+    elif cmd_args.batch is not None:
+        filepaths = find_instances(cmd_args.batch)
+        if not filepaths:
+            cmd_parser.error(f'no instances found for {cmd_args.batch}')
+        if cmd_args.no_cache:
+            cache_dir = None
+        else:
+            cache_dir = cmd_args.cache_dir
+            if cmd_args.clear_cache:
+                SolutionCache(cache_dir).clear()
+        for record in solve_batch(filepaths, settings, num_workers=cmd_args.workers, timeout=cmd_args.timeout,
+                                  cache_dir=cache_dir, cache_size=cmd_args.cache_size * 2 ** 20):
+            print(json.dumps(record), flush=True)
     else:
-        print('No optimial solution was computed.')
+        profile = None if cmd_args.profile is None else cProfile.Profile()
+        metrics = RunMetrics(hooks=[] if profile is None else [profile_hook(profile)])
+        with metrics.stage('read'):
+            prob_input = Input.read(cmd_args.file)
+        start_schedule = None
+        if cmd_args.start_schedule is not None:
+            start_schedule = read_schedule(cmd_args.start_schedule)
+            if len(start_schedule) != prob_input.num_time_periods or not prob_input.is_feasible(start_schedule):
+                cmd_parser.error(f'start schedule {start_schedule} is not feasible')
+        if cmd_args.report_first_incumbent:
+            print(f'Time to first incumbent without warm start: '
+                  f'{measure_first_incumbent(prob_input, formulation=cmd_args.formulation):.3f}s')
+            try:
+                hint = start_schedule or earliest_deadline_schedule(prob_input)
+                print(f'Time to first incumbent with warm start: '
+                      f'{measure_first_incumbent(prob_input, hint, cmd_args.formulation):.3f}s')
+            except InputError as error:
+                print(f'No start schedule available: {error}')
+        cache = None
+        if not cmd_args.no_cache:
+            cache = SolutionCache(cmd_args.cache_dir, max_size=cmd_args.cache_size * 2 ** 20)
+            if cmd_args.clear_cache:
+                cache.clear()
+        try:
+            result = solve_instance(prob_input, settings, start_schedule=start_schedule, cache=cache, verbose=True,
+                                    metrics=metrics)
+        except InputError as error:
+            print(f'No schedule was computed: {error}')
+        else:
+            if result.schedule is not None:
+                print(f'Computed schedule: {result.schedule}')
+                print(f'Objective value: {result.objective}')
+                if result.backend is not None:
+                    print(f'Bound: {result.bound} (backend: {result.backend})')
+                elif result.engine == 'cp':
+                    print(f'Bound: {result.bound}')
+                if result.certificate is not None:
+                    print(f'Optimality certificate: {result.certificate}')
+                if result.engine == 'rolling' and cache is not None:
+                    optimum = cache.optimal_objective(prob_input)
+                    if optimum is not None:
+                        print(f'Monolithic optimum: {optimum} '
+                              f'(relative gap: {compute_gap(result.objective, optimum):.4f})')
+            elif result.engine == 'dp':
+                print(f'Dynamic program exceeds memory limit of {cmd_args.memory_limit} MiB.')
+            else:
+                print('No optimial solution was computed.')
+        if profile is not None:
+            profile.dump_stats(cmd_args.profile)
+        if cmd_args.metrics == '-':
+            json.dump(metrics.to_dict(), sys.stdout)
+            print()
+        elif cmd_args.metrics is not None:
+            metrics.write(cmd_args.metrics)
@@ -0,0 +1,12 @@
+from lot_sizing.input import Input
+
+
+def example_input() -> Input:
+    """Returns the instance with 6 time periods and 3 machine types shared by the unit tests."""
+    return Input.from_arrays([[1, 0, 0, 0, 1, 0],
+                              [0, 1, 0, 0, 1, 0],
+                              [0, 0, 0, 0, 0, 1]],
+                             10,
+                             [[0, 1, 1],
+                              [3, 0, 2],
+                              [4, 5, 0]])
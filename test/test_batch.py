@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from lot_sizing.batch import find_instances, solve_batch
+from lot_sizing.solve import SolverSettings
+
+
+class BatchTest(unittest.TestCase):
+    """Tests for module: batch"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        instances = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instances')
+        for name in ('5timeslots_2types.txt', '15timeslots_10types.txt'):
+            shutil.copy(os.path.join(instances, name), self.directory.name)
+        with open(os.path.join(self.directory.name, 'broken.txt'), 'w') as file:
+            file.write('no instance\n')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_find_instances(self):
+        self.assertEqual(3, len(find_instances(self.directory.name)))
+        self.assertEqual(2, len(find_instances(os.path.join(self.directory.name, '*timeslots*'))))
+
+    def test_solve_batch(self):
+        filepaths = find_instances(self.directory.name)
+        records = {os.path.basename(record['file']): record for record in
+                   solve_batch(filepaths, SolverSettings(engine='dp', num_threads=1), num_workers=2)}
+        self.assertEqual(set(os.path.basename(filepath) for filepath in filepaths), set(records))
+        self.assertEqual('error', records['broken.txt']['status'])
+        self.assertEqual('ok', records['5timeslots_2types.txt']['status'])
+        self.assertEqual(0., records['15timeslots_10types.txt']['gap'])
+        self.assertEqual(1486, records['15timeslots_10types.txt']['objective'])
+        self.assertIn('dp', records['15timeslots_10types.txt']['times'])
+
+    def test_race(self):
+        filepath = os.path.join(self.directory.name, '5timeslots_2types.txt')
+        records = list(solve_batch([filepath], SolverSettings(engine='mip', backends=('scip', 'cbc'), num_threads=1)))
+        self.assertEqual('ok', records[0]['status'])
+        self.assertIn(records[0]['backend'], ('scip', 'cbc'))
+
+    def test_parallel_rolling(self):
+        filepath = os.path.join(self.directory.name, '15timeslots_10types.txt')
+        records = list(solve_batch([filepath], SolverSettings(engine='rolling', window_size=5, window_overlap=1,
+                                                              window_workers=2, num_threads=1)))
+        self.assertEqual('ok', records[0]['status'])
+        self.assertEqual('rolling', records[0]['engine'])
+
+    def test_timeout(self):
+        filepath = os.path.join(self.directory.name, '15timeslots_10types.txt')
+        records = list(solve_batch([filepath], SolverSettings(engine='mip'), timeout=0.5))
+        self.assertEqual('timeout', records[0]['status'])
@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from lot_sizing.cache import SolutionCache, input_digest, settings_digest
+from lot_sizing.input import Input
+from lot_sizing.solve import SolveResult, SolverSettings, solve_instance
+from test import example_input
+
+
+class CacheTest(unittest.TestCase):
+    """Tests for module: cache"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = SolutionCache(self.directory.name)
+        self.input = example_input()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_input_digest(self):
+        other = Input.from_arrays(self.input.demand, 11, self.input.transition_cost)
+        self.assertEqual(input_digest(self.input), input_digest(Input.from_arrays(
+            self.input.demand, 10, self.input.transition_cost)))
+        self.assertNotEqual(input_digest(self.input), input_digest(other))
+
+    def test_settings_digest(self):
+        self.assertEqual(settings_digest(SolverSettings(engine='mip', time_limit=1.)),
+                         settings_digest(SolverSettings(engine='mip', time_limit=2.)))
+        self.assertEqual(settings_digest(SolverSettings(engine='mip', mip_time_limit=1.)),
+                         settings_digest(SolverSettings(engine='mip', mip_time_limit=2.)))
+        self.assertNotEqual(settings_digest(SolverSettings(engine='heuristic', seed=0)),
+                            settings_digest(SolverSettings(engine='heuristic', seed=1)))
+        self.assertNotEqual(settings_digest(SolverSettings(engine='cp', num_threads=1)),
+                            settings_digest(SolverSettings(engine='cp', num_threads=2)))
+        self.assertNotEqual(settings_digest(SolverSettings(engine='mip')),
+                            settings_digest(SolverSettings(engine='mip', formulation='flow')))
+
+    def test_get(self):
+        settings = SolverSettings(engine='dp')
+        self.assertIsNone(self.cache.get(self.input, settings))
+        result = solve_instance(self.input, settings, cache=self.cache)
+        self.assertEqual(result, self.cache.get(self.input, settings))
+        self.assertIsNone(self.cache.get(self.input, SolverSettings(engine='heuristic')))
+
+    def test_get_time_limit(self):
+        result = SolveResult([0, 1, -1, 0, 1, 2], 1, 0, 'mip', False)
+        self.cache.put(self.input, SolverSettings(engine='mip', mip_time_limit=2.), result)
+        self.assertEqual(result, self.cache.get(self.input, SolverSettings(engine='mip', mip_time_limit=1.)))
+        self.assertEqual(result, self.cache.get(self.input, SolverSettings(engine='mip', mip_time_limit=2.)))
+        self.assertIsNone(self.cache.get(self.input, SolverSettings(engine='mip', mip_time_limit=3.)))
+        self.assertIsNone(self.cache.get(self.input, SolverSettings(engine='mip')))
+        optimal = result._replace(bound=1, optimal=True)
+        self.cache.put(self.input, SolverSettings(engine='mip', mip_time_limit=2.), optimal)
+        self.assertEqual(optimal, self.cache.get(self.input, SolverSettings(engine='mip')))
+
+    def test_no_schedule_not_cached(self):
+        prob_input = Input.from_arrays([[1, 1], [0, 1]], 1, [[0, 1], [1, 0]])
+        self.assertIsNone(solve_instance(prob_input, SolverSettings(engine='mip'), cache=self.cache).schedule)
+        self.assertEqual(0, self.cache.size())
+
+    def test_put_leaves_no_temporary_files(self):
+        for seed in range(2):
+            self.cache.put(self.input, SolverSettings(engine='heuristic', seed=seed),
+                           SolveResult([0, 1, -1, 0, 1, 2], 1, None, 'heuristic', False))
+        directory = os.path.join(self.directory.name, input_digest(self.input))
+        self.assertTrue(all(name.endswith('.json') for name in os.listdir(directory)))
+
+    def test_best_schedule(self):
+        self.assertIsNone(self.cache.best_schedule(self.input))
+        schedule = [0, 1, -1, 0, 1, 2]
+        self.cache.put(self.input, SolverSettings(engine='heuristic', seed=0),
+                       SolveResult([0, 1, 0, -1, 1, 2], 1, None, 'heuristic', False))
+        self.cache.put(self.input, SolverSettings(engine='heuristic', seed=1),
+                       SolveResult(schedule, 1, None, 'heuristic', False))
+        self.assertEqual(schedule, self.cache.best_schedule(self.input))
+
+    def test_optimal_objective(self):
+        self.cache.put(self.input, SolverSettings(engine='heuristic', seed=0),
+                       SolveResult([0, 1, 0, -1, 1, 2], 20, None, 'heuristic', False))
+        self.assertIsNone(self.cache.optimal_objective(self.input))
+        result = solve_instance(self.input, SolverSettings(engine='dp'), cache=self.cache)
+        self.assertEqual(result.objective, self.cache.optimal_objective(self.input))
+
+    def test_evict(self):
+        result = SolveResult([0, 1, -1, 0, 1, 2], 1, None, 'heuristic', False)
+        self.cache.put(self.input, SolverSettings(engine='heuristic', seed=0), result)
+        path = os.path.join(self.directory.name, input_digest(self.input),
+                            settings_digest(SolverSettings(engine='heuristic', seed=0)) + '.json')
+        os.utime(path, (0, 0))
+        self.cache.max_size = self.cache.size()
+        self.cache.put(self.input, SolverSettings(engine='heuristic', seed=1), result)
+        self.assertIsNone(self.cache.get(self.input, SolverSettings(engine='heuristic', seed=0)))
+        self.assertEqual(result, self.cache.get(self.input, SolverSettings(engine='heuristic', seed=1)))
+
+    def test_concurrent_evict(self):
+        result = SolveResult([0, 1, -1, 0, 1, 2], 1, None, 'heuristic', False)
+        for seed in range(2):
+            self.cache.put(self.input, SolverSettings(engine='heuristic', seed=seed), result)
+        entries = self.cache._entries()
+        self.cache.clear()
+        self.cache.max_size = 0
+        # another process sharing the cache evicted the entries in between
+        with patch.object(self.cache, '_entries', return_value=entries):
+            self.cache.evict()
+        self.assertEqual([], self.cache._entries())
+
+    def test_clear(self):
+        solve_instance(self.input, SolverSettings(engine='dp'), cache=self.cache)
+        self.assertGreater(self.cache.size(), 0)
+        self.cache.clear()
+        self.assertEqual(0, self.cache.size())
@@ -0,0 +1,43 @@
+import unittest
+from itertools import product
+
+from lot_sizing.dynamic_program import DynamicProgramSolver, solve_exactly
+from lot_sizing.input import Input, InputError
+from test import example_input
+
+
+class DynamicProgramSolverTest(unittest.TestCase):
+    """Tests for class: DynamicProgramSolver"""
+
+    def setUp(self):
+        self.input = example_input()
+
+    def test_solve_matches_enumeration(self):
+        schedule, certificate = DynamicProgramSolver(self.input).solve()
+        feasible_costs = [self.input.compute_model_costs(list(s)) for s in product(range(-1, 3), repeat=6) if
+                          self.input.is_feasible(list(s))]
+        self.assertEqual(min(feasible_costs), certificate.cost)
+        self.assertEqual(certificate.cost, self.input.compute_model_costs(schedule))
+        self.assertTrue(self.input.is_feasible(schedule))
+        self.assertLessEqual(certificate.cost, certificate.upper_bound)
+
+    def test_idle_period_reconfigures_machine(self):
+        ins = Input.from_arrays([[1, 0, 0], [0, 0, 0], [0, 0, 1]], 1, [[0, 1, 100], [1, 0, 1], [1, 1, 0]])
+        schedule, certificate = DynamicProgramSolver(ins).solve()
+        # the machine changes from machine type 0 to 2 via machine type 1 in the idle time period
+        self.assertEqual([0, -1, 2], schedule)
+        self.assertEqual(2, certificate.cost)
+        self.assertEqual(100, ins.compute_costs(schedule))
+
+    def test_infeasible_instance(self):
+        ins = Input.from_arrays([[1, 1], [0, 1]], 1, [[0, 1], [1, 0]])
+        self.assertRaises(InputError, DynamicProgramSolver(ins).solve)
+
+    def test_memory_limit(self):
+        self.assertIsNone(solve_exactly(self.input, memory_limit=0))
+        self.assertRaises(MemoryError, DynamicProgramSolver(self.input, memory_limit=0).solve)
+        self.assertGreater(DynamicProgramSolver.estimate_memory(self.input), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+from lot_sizing.evaluator import ScheduleEvaluator
+from lot_sizing.input import InputError
+from test import example_input
+
+
+class ScheduleEvaluatorTest(unittest.TestCase):
+    """Tests for class: ScheduleEvaluator"""
+
+    def setUp(self):
+        self.input = example_input()
+        self.evaluator = ScheduleEvaluator(self.input, [0, 1, 2, 0, 1, -1])
+
+    def assert_consistent(self):
+        self.assertEqual(self.input.compute_costs(self.evaluator.schedule), self.evaluator.cost)
+        self.assertEqual(self.input.is_feasible(self.evaluator.schedule), self.evaluator.feasible)
+
+    def test_initial_state(self):
+        self.assertEqual(48, self.evaluator.cost)
+        self.assertTrue(self.evaluator.feasible)
+
+    def test_swap(self):
+        delta = self.evaluator.evaluate_swap(1, 2)
+        self.assertFalse(delta.feasible)
+        self.assertEqual([0, 1, 2, 0, 1, -1], self.evaluator.schedule)
+        self.assertEqual(delta, self.evaluator.apply_swap(1, 2))
+        self.assertEqual([0, 2, 1, 0, 1, -1], self.evaluator.schedule)
+        self.assertEqual(48 + delta.cost, self.evaluator.cost)
+        self.assert_consistent()
+
+    def test_insert(self):
+        delta = self.evaluator.apply_insert(2, 5)
+        self.assertEqual([0, 1, 0, 1, -1, 2], self.evaluator.schedule)
+        self.assertTrue(delta.feasible)
+        self.assertEqual(37 - 48, delta.cost)
+        self.assert_consistent()
+
+    def test_shift(self):
+        delta = self.evaluator.apply_shift(3, 5, -1)
+        self.assertEqual([0, 1, 0, 1, 2, -1], self.evaluator.schedule)
+        self.assertEqual(self.input.compute_costs([0, 1, 0, 1, 2, -1]) - 48, delta.cost)
+        self.assert_consistent()
+        self.evaluator.apply_shift(0, 2, 4)
+        self.assert_consistent()
+
+    def test_invalid_moves(self):
+        self.assertRaises(InputError, self.evaluator.evaluate_swap, 0, 6)
+        self.assertRaises(InputError, self.evaluator.evaluate_shift, 4, 6, 1)
+        self.assertRaises(InputError, self.evaluator.evaluate_shift, 2, 2, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+import numpy as np
+
+from lot_sizing.generator import COST_STRUCTURES, generate_input, generate_transition_cost
+from lot_sizing.heuristic import earliest_deadline_schedule
+from lot_sizing.input import InputError
+
+
+class GeneratorTest(unittest.TestCase):
+    """Tests for module: generator"""
+
+    def test_generate_input(self):
+        for cost_structure in COST_STRUCTURES:
+            for demand_density in (0., 0.3, 1.):
+                ins = generate_input(5, 40, demand_density, cost_structure, seed=1)
+                self.assertEqual((5, 40), ins.demand.shape)
+                self.assertEqual(round(demand_density * 40), ins.overall_demand)
+                self.assertTrue(ins.is_feasible(earliest_deadline_schedule(ins)))
+
+    def test_generate_input_seed(self):
+        ins, other = generate_input(4, 30, seed=3), generate_input(4, 30, seed=3)
+        self.assertTrue(np.array_equal(ins.demand, other.demand))
+        self.assertTrue(np.array_equal(ins.transition_cost, other.transition_cost))
+        self.assertFalse(np.array_equal(ins.demand, generate_input(4, 30, seed=4).demand))
+
+    def test_generate_input_invalid(self):
+        self.assertRaises(InputError, generate_input, 0, 10)
+        self.assertRaises(InputError, generate_input, 2, 10, demand_density=1.5)
+        self.assertRaises(InputError, generate_transition_cost, 2, 'unknown')
+
+    def test_generate_transition_cost(self):
+        rng = np.random.default_rng(0)
+        for cost_structure in COST_STRUCTURES:
+            transition_cost = generate_transition_cost(6, cost_structure, 50, rng)
+            self.assertTrue(np.all(np.diag(transition_cost) == 0))
+            off_diagonal = transition_cost[~np.eye(6, dtype=bool)]
+            self.assertTrue(np.all((off_diagonal >= 1) & (off_diagonal <= 50)))
+        transition_cost = generate_transition_cost(6, 'euclidean', 50, rng)
+        self.assertTrue(np.array_equal(transition_cost, transition_cost.T))
@@ -0,0 +1,56 @@
+import unittest
+
+from lot_sizing.heuristic import HeuristicSolver, earliest_deadline_schedule, repair_schedule
+from lot_sizing.input import Input, InputError
+from test import example_input
+
+
+class HeuristicTest(unittest.TestCase):
+    """Tests for module: heuristic"""
+
+    def setUp(self):
+        self.input = example_input()
+
+    def test_earliest_deadline_schedule(self):
+        schedule = earliest_deadline_schedule(self.input)
+        self.assertTrue(self.input.is_feasible(schedule))
+        self.assertEqual(-1, schedule[2])
+
+    def test_earliest_deadline_schedule_infeasible(self):
+        ins = Input.from_arrays([[1, 1], [0, 1]], 1, [[0, 1], [1, 0]])
+        self.assertRaises(InputError, earliest_deadline_schedule, ins)
+
+    def test_repair_schedule(self):
+        schedule = [0, 1, -1, 1, 0, 2]
+        self.assertEqual(schedule, repair_schedule(self.input, schedule))
+        # an item of machine type 2 is added in time period 3 and the item of machine type 1 due in 1 is removed
+        ins = Input.from_arrays([[1, 0, 0, 0, 1, 0],
+                                 [0, 0, 0, 0, 1, 0],
+                                 [0, 0, 0, 1, 0, 1]], 10, self.input.transition_cost)
+        repaired = repair_schedule(ins, schedule)
+        self.assertTrue(ins.is_feasible(repaired))
+        # the productions of time periods 2 to 5 are kept, the item of machine type 2 is produced in time period 1
+        self.assertEqual([0, 2, -1, 1, 0, 2], repaired)
+        self.assertRaises(InputError, repair_schedule, Input.from_arrays([[1, 1], [0, 1]], 1, [[0, 1], [1, 0]]),
+                          [0, 1])
+
+    def test_tabu_search(self):
+        heuristic = HeuristicSolver(self.input, method='tabu', time_limit=None, seed=0, max_iterations=200)
+        schedule = heuristic.solve()
+        self.assertTrue(self.input.is_feasible(schedule))
+        self.assertEqual(self.input.compute_costs(schedule), heuristic.best_cost)
+        self.assertLessEqual(heuristic.best_cost, self.input.compute_costs(earliest_deadline_schedule(self.input)))
+
+    def test_simulated_annealing_reproducible(self):
+        schedules = [HeuristicSolver(self.input, method='annealing', time_limit=None, seed=1,
+                                     max_iterations=500).solve() for _ in range(2)]
+        self.assertEqual(schedules[0], schedules[1])
+        self.assertTrue(self.input.is_feasible(schedules[0]))
+
+    def test_infeasible_start_schedule(self):
+        heuristic = HeuristicSolver(self.input, max_iterations=1)
+        self.assertRaises(InputError, heuristic.solve, [0, 2, 1, 0, 1, -1])
+
+
+if __name__ == '__main__':
+    unittest.main()
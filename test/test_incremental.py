@@ -0,0 +1,49 @@
+import unittest
+
+from lot_sizing.incremental import IncrementalSolver
+from lot_sizing.input import Input
+from lot_sizing.solve import SolverSettings, solve_mip
+from test import example_input
+
+
+class IncrementalSolverTest(unittest.TestCase):
+    """Tests for module: incremental"""
+
+    def setUp(self):
+        self.input = example_input()
+        self.settings = SolverSettings(engine='mip')
+
+    def test_same_optimum_as_fresh_build(self):
+        incremental = IncrementalSolver(self.input, self.settings)
+        self.assertEqual(solve_mip(self.input, self.settings).objective, incremental.solve().objective)
+        for update in (lambda model: model.move_demand(0, 0, 2),
+                       lambda model: model.add_demand(2, 3),
+                       lambda model: model.remove_demand(1, 4),
+                       lambda model: model.update_demand(model.prob_input.demand, inventory_cost=3)):
+            update(incremental.mip_model)
+            result = incremental.solve()
+            fresh = solve_mip(incremental.prob_input, self.settings)
+            self.assertTrue(result.optimal)
+            self.assertAlmostEqual(fresh.objective, result.objective)
+            self.assertTrue(incremental.prob_input.is_feasible(result.schedule))
+        self.assertEqual(5, incremental.num_solves)
+
+    def test_update_demand(self):
+        incremental = IncrementalSolver(self.input, self.settings._replace(bulk_build=True))
+        incremental.solve()
+        demand = self.input.demand.copy()
+        demand[:, -1] = 0
+        result = incremental.update_demand(demand)
+        fresh = solve_mip(Input.from_arrays(demand, self.input.inventory_cost, self.input.transition_cost),
+                          self.settings)
+        self.assertAlmostEqual(fresh.objective, result.objective)
+        # an unchanged demand is not solved again
+        self.assertEqual(result, incremental.update_demand(demand))
+        self.assertEqual(2, incremental.num_solves)
+
+    def test_unsupported_formulation(self):
+        self.assertRaises(ValueError, IncrementalSolver, self.input, self.settings._replace(formulation='flow'))
+
+
+if __name__ == '__main__':
+    unittest.main()
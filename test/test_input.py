@@ -1,7 +1,11 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import Mock, patch
 
-from lot_sizing.input import Input
+import numpy as np
+
+from lot_sizing.input import Input, InputError
 
 
 class InputTest(unittest.TestCase):
@@ -51,6 +55,64 @@ class InputTest(unittest.TestCase):
         self.assertEqual(0, self.input.get_overall_demand(2, 2))
         self.assertEqual(1, self.input.get_overall_demand(2, 5))
 
+    def test_deadlines(self):
+        self.assertEqual([2, 2, 1], self.input.num_demands.tolist())
+        self.assertEqual([[0, 4, 5], [1, 4, 5], [5, 5, 5]], self.input.deadlines.tolist())
+
+    def test_check_feasibility_overproduction(self):
+        self.assertTrue(self.input.is_feasible([0, 1, 0, 1, 2, 2]))
+        self.assertFalse(self.input.is_feasible([0, 1, 0, 0, 2, 2]))
+
+    def test_from_arrays(self):
+        ins = Input.from_arrays([[0, 1], [1, 0]], 2, [[0, 5], [3, 0]])
+        self.assertEqual(2, ins.num_time_periods)
+        self.assertEqual(2, ins.overall_demand)
+        self.assertTrue(ins.is_feasible([1, 0]))
+        self.assertRaises(InputError, Input.from_arrays, [[0, 1], [1, 0]], 2, [[0, 5]])
+
+    def test_write_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'instance.txt')
+            self.input.write_file(filepath)
+            ins = Input.read_file(filepath)
+        self.assertEqual(str(self.input), str(ins))
+
+    def test_read_binary(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'instance.npz')
+            self.input.write(filepath)
+            ins = Input.read(filepath)
+            self.assertRaises(InputError, Input.read_binary, os.path.join(directory, 'missing.npz'))
+        self.assertEqual(str(self.input), str(ins))
+        self.assertTrue(np.array_equal(self.input.deadlines, ins.deadlines))
+
+    def test_read_file_malformed(self):
+        lines = ['2', '2', '0 1', '1 0', '1', '0 3', '2 0']
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'instance.txt')
+            for malformed in (lines + ['1 1'], lines[:-1], lines[:2] + ['0 1 0'] + lines[3:],
+                              lines[:2] + ['0 x'] + lines[3:], lines[:2] + ['0 -1'] + lines[3:]):
+                with open(filepath, 'w') as file:
+                    file.write('\n'.join(malformed))
+                self.assertRaises(InputError, Input.read_file, filepath)
+            with open(filepath, 'w') as file:
+                file.write('\n\n'.join(lines))
+            self.assertEqual([[0, 3], [2, 0]], Input.read_file(filepath).transition_cost.tolist())
+
+    def test_multiple_items_per_time_period(self):
+        ins = Input.from_arrays([[0, 2, 0, 1]], 1, [[0]])
+        self.assertEqual([1, 1, 3, 3], ins.deadlines[0].tolist())
+        self.assertFalse(ins.is_feasible([-1, 0, 0, 0]))
+        self.assertTrue(ins.is_feasible([0, 0, -1, 0]))
+
+    def test_read_text(self):
+        ins = Input.read_text('2\n2\n0 1\n1 0\n\n1\n0 3\n2 0\n')
+        self.assertEqual([[0, 1], [1, 0]], ins.demand.tolist())
+        self.assertEqual([[0, 3], [2, 0]], ins.transition_cost.tolist())
+        self.assertRaises(InputError, Input.read_text, '2\n2\n0 1\n')
+        self.assertRaises(InputError, Input.read_text, '2\n2\n0 1\n1 0\n1\n0 1.5\n2 0\n')
+        self.assertRaises(InputError, Input.read_text, '2\n2\n0 1\n1 0\n1\n0 99999999999999999999\n2 0\n')
+
     def test_compute_transition_cost(self):
         self.assertEqual(8, self.input.compute_transition_cost(self.feasible_schedule))
         self.assertEqual(5, self.input.compute_transition_cost(self.other_feasible_schedule))
@@ -58,11 +120,40 @@ class InputTest(unittest.TestCase):
     def test_compute_inventory_cost(self):
         self.assertEqual(40, self.input.compute_inventory_cost(self.feasible_schedule))
         self.assertEqual(10, self.input.compute_inventory_cost(self.other_feasible_schedule))
+        self.assertEqual(40, self.input.compute_inventory_cost([0, 1, 0, 1, 2, 2]))
 
     def test_compute_cost(self):
         self.assertEqual(48, self.input.compute_costs(self.feasible_schedule))
         self.assertEqual(15, self.input.compute_costs(self.other_feasible_schedule))
 
+    def test_compute_reconfiguration_cost(self):
+        self.assertEqual(self.input.compute_transition_cost(self.feasible_schedule),
+                         self.input.compute_reconfiguration_cost(self.feasible_schedule))
+        ins = Input.from_arrays([[1, 0, 0], [0, 0, 0], [0, 0, 1]], 1, [[0, 1, 100], [1, 0, 1], [1, 1, 0]])
+        self.assertEqual(100, ins.compute_transition_cost([0, -1, 2]))
+        # the machine changes from machine type 0 to 2 via machine type 1 in the idle time period
+        self.assertEqual(2, ins.compute_reconfiguration_cost([0, -1, 2]))
+        self.assertEqual(100, ins.compute_reconfiguration_cost([0, 2, -1]))
+        self.assertEqual(2, ins.compute_model_costs([0, -1, 2]))
+
+    def test_evaluate_batch(self):
+        schedules = [self.feasible_schedule, self.other_feasible_schedule, self.infeasible_schedule]
+        evaluation = self.input.evaluate_batch(schedules)
+        self.assertEqual([True, True, False], evaluation.feasible.tolist())
+        self.assertEqual([self.input.compute_transition_cost(s) for s in schedules],
+                         evaluation.transition_cost.tolist())
+        self.assertEqual([self.input.compute_inventory_cost(s) for s in schedules], evaluation.inventory_cost.tolist())
+        self.assertEqual([48, 15, self.input.compute_costs(self.infeasible_schedule)], evaluation.costs.tolist())
+        self.assertRaises(InputError, self.input.evaluate_batch, [[0, 1, 2]])
+        self.assertRaises(InputError, self.input.evaluate_batch, [[0, 1, 2, 3, -1, -1]])
+
+    def test_iter_evaluate_batch(self):
+        schedules = (s for s in [self.feasible_schedule, self.infeasible_schedule, self.other_feasible_schedule])
+        evaluations = list(self.input.iter_evaluate_batch(schedules, chunk_size=2))
+        self.assertEqual(2, len(evaluations))
+        self.assertEqual([True, False], evaluations[0].feasible.tolist())
+        self.assertEqual([15], evaluations[1].costs.tolist())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,74 @@
+import cProfile
+import json
+import os
+import tempfile
+import unittest
+from contextlib import contextmanager
+
+from lot_sizing.metrics import RunMetrics, model_size, profile_hook
+from lot_sizing.model import BulkMipModel, FlowMipModel, MipModel, create_solver
+from lot_sizing.solve import SolverSettings, solve_instance
+from test import example_input
+
+
+class MetricsTest(unittest.TestCase):
+    """Tests for module: metrics"""
+
+    def setUp(self):
+        self.input = example_input()
+
+    def test_model_size(self):
+        size = model_size(MipModel.build_mip(self.input, create_solver()))
+        self.assertEqual({'production': 18, 'state': 18, 'stock': 21, 'transition': 45}, size['variables'])
+        self.assertEqual({'init_stock': 3, 'demand': 18, 'state': 18, 'config': 6, 'transition': 45},
+                         size['constraints'])
+        self.assertEqual(sum(size['variables'].values()), size['num_variables'])
+        self.assertIn('flow', model_size(FlowMipModel.build_mip(self.input, create_solver()))['constraints'])
+        bulk_size = model_size(BulkMipModel.build_mip(self.input, create_solver(), names=False))
+        self.assertEqual(size['constraints'], bulk_size['constraints'])
+
+    def test_stages(self):
+        entered = []
+
+        @contextmanager
+        def hook(name: str):
+            entered.append(name)
+            yield
+
+        metrics = RunMetrics(hooks=[profile_hook(cProfile.Profile(), stages=['build']), hook])
+        for _ in range(2):
+            with metrics.stage('build'):
+                pass
+        self.assertEqual(['build', 'build'], entered)
+        self.assertEqual(['build'], list(metrics.times))
+        with self.assertRaises(RuntimeError):
+            with metrics.stage('solve'):
+                raise RuntimeError()
+        self.assertIn('solve', metrics.times)
+
+    def test_solve_metrics(self):
+        metrics = RunMetrics()
+        result = solve_instance(self.input, SolverSettings(engine='mip'), metrics=metrics)
+        self.assertTrue({'warm_start', 'build', 'solve', 'schedule'} <= set(metrics.times))
+        self.assertEqual(18, metrics.model['variables']['production'])
+        self.assertEqual((result.objective, result.bound),
+                         (metrics.progress[-1]['objective'], metrics.progress[-1]['bound']))
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'metrics.json')
+            metrics.write(filepath)
+            with open(filepath, 'r') as file:
+                self.assertEqual('mip', json.load(file)['info']['engine'])
+
+    def test_progress_callbacks(self):
+        for engine in ('cp', 'heuristic'):
+            metrics = RunMetrics()
+            result = solve_instance(self.input, SolverSettings(engine=engine, num_threads=1, time_limit=0.1, seed=0),
+                                    metrics=metrics)
+            self.assertTrue(metrics.progress)
+            self.assertEqual(result.objective, metrics.progress[-1]['objective'])
+            times = [event['time'] for event in metrics.progress]
+            self.assertEqual(sorted(times), times)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+import unittest
+
+from ortools.linear_solver import linear_solver_pb2, pywraplp
+from ortools.sat.python import cp_model
+
+from lot_sizing.generator import generate_input
+from lot_sizing.input import InputError
+from lot_sizing.model import BulkMipModel, CpSatModel, FlowMipModel, MipModel
+from test import example_input
+
+
+class MipModelTest(unittest.TestCase):
+    """Tests for class: MipModel"""
+
+    def setUp(self):
+        self.input = example_input()
+        self.solver = pywraplp.Solver('test', pywraplp.Solver.SCIP_MIXED_INTEGER_PROGRAMMING)
+        self.model = MipModel.build_mip(self.input, self.solver)
+
+    def test_hint_values_satisfy_constraints(self):
+        schedule = [0, 1, -1, 1, 0, 2]
+        variables, values = self.model.hint_values(schedule)
+        self.assertEqual(self.solver.NumVariables(), len(variables))
+        for constraint in self.solver.constraints():
+            activity = sum(constraint.GetCoefficient(var) * value for var, value in zip(variables, values))
+            self.assertTrue(constraint.lb() - 1e-9 <= activity <= constraint.ub() + 1e-9, constraint.name())
+        objective = sum(self.solver.Objective().GetCoefficient(var) * value for var, value in zip(variables, values))
+        self.assertEqual(self.input.compute_costs(schedule), objective)
+
+    def test_hint_infeasible_schedule(self):
+        self.assertRaises(InputError, self.model.set_hint, [0, 2, 1, 0, 1, -1])
+
+    def test_solve_with_hint(self):
+        self.model.set_hint([0, 1, 2, 0, 1, -1])
+        self.assertEqual(pywraplp.Solver.OPTIMAL, self.solver.Solve())
+        self.assertEqual(15, self.solver.Objective().Value())
+
+    def test_update_demand(self):
+        self.assertEqual(pywraplp.Solver.OPTIMAL, self.solver.Solve())
+        num_constraints = self.solver.NumConstraints()
+        self.assertEqual(2, self.model.move_demand(1, 1, 3))
+        self.assertEqual(1, self.model.add_demand(2, 2))
+        self.assertEqual(0, self.model.update_demand(self.model.prob_input.demand))
+        self.model.update_demand(self.model.prob_input.demand, inventory_cost=4)
+        self.assertEqual(num_constraints, self.solver.NumConstraints())
+        self.assertEqual([[1, 0, 0, 0, 1, 0], [0, 0, 0, 1, 1, 0], [0, 0, 1, 0, 0, 1]],
+                         self.model.prob_input.demand.tolist())
+        self.assertEqual(pywraplp.Solver.OPTIMAL, self.solver.Solve())
+        fresh_solver = pywraplp.Solver('test', pywraplp.Solver.SCIP_MIXED_INTEGER_PROGRAMMING)
+        MipModel.build_mip(self.model.prob_input, fresh_solver)
+        self.assertEqual(pywraplp.Solver.OPTIMAL, fresh_solver.Solve())
+        self.assertAlmostEqual(fresh_solver.Objective().Value(), self.solver.Objective().Value())
+        self.assertRaises(InputError, self.model.remove_demand, 1, 0)
+
+
+class FlowMipModelTest(unittest.TestCase):
+    """Tests for class: FlowMipModel"""
+
+    def setUp(self):
+        self.input = example_input()
+        self.solver = pywraplp.Solver('test', pywraplp.Solver.SCIP_MIXED_INTEGER_PROGRAMMING)
+        self.model = FlowMipModel.build_mip(self.input, self.solver)
+
+    def test_no_diagonal_transition_variables(self):
+        self.assertEqual(3 * 2 * 5, len(self.model.transition_vars))
+        self.assertTrue(all(type_i != type_j for type_i, type_j, _ in self.model.transition_vars))
+
+    def test_same_optimum_as_standard_formulation(self):
+        standard_solver = pywraplp.Solver('standard', pywraplp.Solver.SCIP_MIXED_INTEGER_PROGRAMMING)
+        MipModel.build_mip(self.input, standard_solver)
+        self.assertEqual(pywraplp.Solver.OPTIMAL, standard_solver.Solve())
+        self.assertEqual(pywraplp.Solver.OPTIMAL, self.solver.Solve())
+        self.assertEqual(standard_solver.Objective().Value(), self.solver.Objective().Value())
+
+    def test_hint_values_satisfy_constraints(self):
+        variables, values = self.model.hint_values([0, 1, -1, 1, 0, 2])
+        for constraint in self.solver.constraints():
+            activity = sum(constraint.GetCoefficient(var) * value for var, value in zip(variables, values))
+            self.assertTrue(constraint.lb() - 1e-9 <= activity <= constraint.ub() + 1e-9, constraint.name())
+        for var, value in zip(variables, values):
+            self.assertTrue(var.lb() <= value <= var.ub(), var.name())
+
+    def test_update_demand_unsupported(self):
+        self.assertRaises(ValueError, self.model.add_demand, 0, 2)
+
+
+class BulkMipModelTest(unittest.TestCase):
+    """Tests for class: BulkMipModel"""
+
+    def setUp(self):
+        self.input = example_input()
+
+    @staticmethod
+    def export(solver: pywraplp.Solver) -> linear_solver_pb2.MPModelProto:
+        proto = linear_solver_pb2.MPModelProto()
+        solver.ExportModelToProto(proto)
+        for constraint in proto.constraint:
+            terms = sorted(zip(constraint.var_index, constraint.coefficient))
+            del constraint.var_index[:]
+            del constraint.coefficient[:]
+            constraint.var_index.extend([index for index, _ in terms])
+            constraint.coefficient.extend([coefficient for _, coefficient in terms])
+        return proto
+
+    def test_same_model_as_standard_build(self):
+        standard_solver = pywraplp.Solver('test', pywraplp.Solver.SCIP_MIXED_INTEGER_PROGRAMMING)
+        MipModel.build_mip(self.input, standard_solver)
+        bulk_solver = pywraplp.Solver('test', pywraplp.Solver.SCIP_MIXED_INTEGER_PROGRAMMING)
+        BulkMipModel.build_mip(self.input, bulk_solver)
+        self.assertEqual(self.export(standard_solver), self.export(bulk_solver))
+
+    def test_unnamed_model(self):
+        solver = pywraplp.Solver('test', pywraplp.Solver.SCIP_MIXED_INTEGER_PROGRAMMING)
+        model = BulkMipModel.build_mip(self.input, solver, names=False)
+        self.assertEqual((3, 6), model.production_index.shape)
+        self.assertEqual(3 * 7, len(model.stock_vars))
+        self.assertEqual(model.variables[model.stock_index[1, 0]].index(), model.stock_vars[(1, -1)].index())
+        self.assertRaises(KeyError, model.stock_vars.__getitem__, (1, -2))
+        model.set_hint([0, 1, 2, 0, 1, -1])
+        self.assertEqual(pywraplp.Solver.OPTIMAL, solver.Solve())
+        self.assertEqual(15, solver.Objective().Value())
+
+    def test_update_demand(self):
+        solver = pywraplp.Solver('test', pywraplp.Solver.SCIP_MIXED_INTEGER_PROGRAMMING)
+        model = BulkMipModel.build_mip(self.input, solver, names=False)
+        self.assertEqual(pywraplp.Solver.OPTIMAL, solver.Solve())
+        model.move_demand(0, 4, 3)
+        self.assertEqual((0., 1.), (solver.constraint(3 + 4).lb(), solver.constraint(3 + 3).ub()))
+        self.assertEqual(pywraplp.Solver.OPTIMAL, solver.Solve())
+        standard_solver = pywraplp.Solver('test', pywraplp.Solver.SCIP_MIXED_INTEGER_PROGRAMMING)
+        MipModel.build_mip(model.prob_input, standard_solver)
+        self.assertEqual(pywraplp.Solver.OPTIMAL, standard_solver.Solve())
+        self.assertEqual(standard_solver.Objective().Value(), solver.Objective().Value())
+
+
+class CpSatModelTest(unittest.TestCase):
+    """Tests for class: CpSatModel"""
+
+    def setUp(self):
+        self.input = example_input()
+        self.model = CpSatModel.build_model(self.input)
+
+    def test_solve(self):
+        self.assertEqual(cp_model.OPTIMAL, self.model.solve(num_workers=1))
+        self.assertEqual(15, self.model.solver.ObjectiveValue())
+        schedule = self.model.create_schedule()
+        self.assertTrue(self.input.is_feasible(schedule))
+        self.assertEqual(15, self.input.compute_costs(schedule))
+
+    def test_hint_objective(self):
+        schedule = [0, 1, -1, 1, 0, 2]
+        self.model.set_hint(schedule)
+        solver = cp_model.CpSolver()
+        solver.parameters.fix_variables_to_their_hinted_value = True
+        self.assertEqual(cp_model.OPTIMAL, solver.Solve(self.model.model))
+        self.assertEqual(self.input.compute_costs(schedule), solver.ObjectiveValue())
+
+    def test_hint_infeasible_schedule(self):
+        self.assertRaises(InputError, self.model.set_hint, [0, 2, 1, 0, 1, -1])
+
+    def test_same_optimum_as_standard_formulation(self):
+        for seed in range(3):
+            ins = generate_input(3, 10, 0.6, seed=seed)
+            solver = pywraplp.Solver('test', pywraplp.Solver.SCIP_MIXED_INTEGER_PROGRAMMING)
+            MipModel.build_mip(ins, solver)
+            self.assertEqual(pywraplp.Solver.OPTIMAL, solver.Solve())
+            cp_sat_model = CpSatModel.build_model(ins)
+            self.assertEqual(cp_model.OPTIMAL, cp_sat_model.solve(num_workers=1))
+            self.assertAlmostEqual(solver.Objective().Value(), cp_sat_model.solver.ObjectiveValue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+from lot_sizing.dynamic_program import solve_exactly
+from lot_sizing.generator import generate_input
+from lot_sizing.heuristic import earliest_deadline_schedule
+from lot_sizing.input import Input, InputError
+from lot_sizing.rolling_horizon import RollingHorizonSolver, fixed_window, free_window, solve_window
+from test import example_input
+
+
+class RollingHorizonTest(unittest.TestCase):
+    """Tests for module: rolling_horizon"""
+
+    def setUp(self):
+        self.input = example_input()
+        self.long_input = generate_input(3, 40, seed=1)
+
+    def test_free_window(self):
+        window = free_window(self.input, [0, 1, 0], 5)
+        self.assertEqual((3, 5, 0, None), (window.start, window.stop, window.initial_setup, window.final_setup))
+        # the items of machine type 0 are produced, the second item of type 1 is due in the last time period
+        self.assertEqual([[0, 0], [0, 1], [0, 0]], window.sub_input.demand.tolist())
+
+    def test_free_window_pulls_later_demand(self):
+        # the demand of time period 5 does not fit into time period 5 only
+        ins = Input.from_arrays([[0, 0, 0, 0, 0, 1], [0, 0, 0, 0, 0, 1]], 1, [[0, 1], [1, 0]])
+        window = free_window(ins, [], 5)
+        self.assertEqual(1, window.sub_input.demand.sum())
+
+    def test_fixed_window(self):
+        schedule = [0, 1, 0, -1, 1, 2]
+        window = fixed_window(self.input, schedule, 2, 5)
+        self.assertEqual((1, 2), (window.initial_setup, window.final_setup))
+        self.assertEqual([0, -1, 1], window.hint)
+        sub_schedule = solve_window(window)
+        candidate = schedule[:2] + sub_schedule + schedule[5:]
+        self.assertTrue(self.input.is_feasible(candidate))
+        self.assertLessEqual(self.input.compute_model_costs(candidate), self.input.compute_model_costs(schedule))
+
+    def test_sequential_solve(self):
+        optimum = solve_exactly(self.long_input)[1].cost
+        rolling_horizon = RollingHorizonSolver(self.long_input, window_size=12, overlap=4)
+        schedule = rolling_horizon.solve()
+        self.assertTrue(self.long_input.is_feasible(schedule))
+        self.assertEqual(self.long_input.compute_model_costs(schedule), rolling_horizon.best_cost)
+        self.assertLessEqual(rolling_horizon.best_cost, rolling_horizon.stitched_cost)
+        self.assertLessEqual(optimum, rolling_horizon.best_cost)
+
+    def test_parallel_solve(self):
+        rolling_horizon = RollingHorizonSolver(self.long_input, window_size=12, num_workers=2, overlap=0)
+        schedule = rolling_horizon.solve()
+        self.assertTrue(self.long_input.is_feasible(schedule))
+        self.assertLessEqual(rolling_horizon.stitched_cost,
+                             self.long_input.compute_model_costs(earliest_deadline_schedule(self.long_input)))
+
+    def test_infeasible_instance(self):
+        ins = Input.from_arrays([[1, 1], [0, 1]], 1, [[0, 1], [1, 0]])
+        for num_workers in (1, 2):
+            rolling_horizon = RollingHorizonSolver(ins, window_size=1, overlap=0, num_workers=num_workers)
+            self.assertRaisesRegex(InputError, 'does not admit a feasible schedule', rolling_horizon.solve)
+
+    def test_invalid_overlap(self):
+        self.assertRaises(ValueError, RollingHorizonSolver, self.input, window_size=5, overlap=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
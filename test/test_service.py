@@ -0,0 +1,107 @@
+import json
+import os
+import threading
+import unittest
+import urllib.error
+import urllib.request
+
+from lot_sizing.input import Input, InputError
+from lot_sizing.service import ServiceBusy, ServiceServer, SolverService, parse_request, settings_from
+from lot_sizing.solve import SolverSettings
+
+
+class ServiceTest(unittest.TestCase):
+    """Tests for module: service"""
+
+    def setUp(self):
+        instances = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instances')
+        with open(os.path.join(instances, '15timeslots_10types.txt')) as file:
+            self.text = file.read()
+        self.input = Input.read_text(self.text)
+        self.service = SolverService(SolverSettings(engine='dp', num_threads=1), num_workers=2, queue_size=2)
+        self.service.start()
+
+    def tearDown(self):
+        self.service.close()
+
+    def test_solve(self):
+        record = self.service.solve(self.input)
+        self.assertEqual('ok', record['status'])
+        self.assertEqual(1486, record['cost'])
+        self.assertEqual(self.input.compute_costs(record['schedule']), record['cost'])
+        self.assertIn('dp', record['times'])
+        # the worker process is reused by further requests
+        self.assertEqual(1486, self.service.solve(self.input)['objective'])
+        stats = self.service.stats()
+        self.assertEqual({'ok': 2}, stats['completed'])
+        self.assertEqual(2, stats['latency']['count'])
+        self.assertEqual(0, stats['queue_depth'])
+
+    def test_timeout(self):
+        record = self.service.solve(self.input, SolverSettings(engine='mip'), timeout=0.2)
+        self.assertEqual('timeout', record['status'])
+        self.assertIsNone(record['cost'])
+        # the killed worker process is replaced
+        self.assertEqual('ok', self.service.solve(self.input)['status'])
+
+    def test_timeout_cap(self):
+        service = SolverService(SolverSettings(engine='dp'), timeout=5.)
+        self.assertEqual(5., service.submit(self.input).timeout)
+        self.assertEqual(5., service.submit(self.input, timeout=60.).timeout)
+        self.assertEqual(1., service.submit(self.input, timeout=1.).timeout)
+
+    def test_race_and_parallel_rolling(self):
+        instances = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instances')
+        prob_input = Input.read(os.path.join(instances, '5timeslots_2types.txt'))
+        record = self.service.solve(prob_input, SolverSettings(engine='mip', backends=('scip', 'cbc'), num_threads=1))
+        self.assertEqual('ok', record['status'])
+        self.assertIn(record['backend'], ('scip', 'cbc'))
+        record = self.service.solve(self.input, SolverSettings(engine='rolling', window_size=5, window_overlap=1,
+                                                               window_workers=2, num_threads=1))
+        self.assertEqual('ok', record['status'])
+        self.assertEqual('rolling', record['engine'])
+
+    def test_queue_full(self):
+        settings = SolverSettings(engine='mip')
+        requests = []
+        with self.assertRaises(ServiceBusy):
+            for _ in range(5):
+                requests.append(self.service.submit(self.input, settings, timeout=0.5))
+        self.assertEqual(1, self.service.stats()['rejected'])
+        self.assertTrue(all(request.result()['status'] == 'timeout' for request in requests))
+
+    def test_parse_request(self):
+        prob_input, settings, timeout = parse_request(self.text.encode(), 'engine=mip&mip_time_limit=10&timeout=5')
+        self.assertEqual((10, 15), (prob_input.num_types, prob_input.num_time_periods))
+        self.assertEqual(('mip', 10), (settings.engine, settings.mip_time_limit))
+        self.assertEqual(5., timeout)
+        body = json.dumps({'demand': [[1, 0, 1], [0, 1, 0]], 'inventory_cost': 2, 'transition_cost': [[0, 1], [1, 0]],
+                           'settings': {'backends': ['scip', 'cbc']}}).encode()
+        prob_input, settings, timeout = parse_request(body)
+        self.assertEqual([[1, 0, 1], [0, 1, 0]], prob_input.demand.tolist())
+        self.assertEqual(('scip', 'cbc'), settings.backends)
+        self.assertIsNone(timeout)
+        self.assertRaises(InputError, parse_request, b'1\n')
+        self.assertRaises(ValueError, parse_request, b'{"demand": [[1]]}')
+        self.assertRaises(ValueError, settings_from, {'engine': 'unknown'})
+        self.assertRaises(ValueError, settings_from, {'unknown': 1})
+
+    def test_server(self):
+        server = ServiceServer(self.service, ('127.0.0.1', 0), quiet=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{server.server_address[1]}'
+        try:
+            with urllib.request.urlopen(f'{url}/solve', data=self.text.encode()) as response:
+                self.assertEqual(1486, json.loads(response.read())['cost'])
+            with urllib.request.urlopen(f'{url}/stats') as response:
+                self.assertEqual(1, json.loads(response.read())['submitted'])
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                urllib.request.urlopen(f'{url}/solve', data=b'no instance')
+            self.assertEqual(400, context.exception.code)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import unittest
+
+from lot_sizing.input import Input, InputError
+from lot_sizing.solve import SolverSettings, better_schedule, compute_gap, solve_instance
+from test import example_input
+
+
+class SolveTest(unittest.TestCase):
+    """Tests for module: solve"""
+
+    def setUp(self):
+        self.input = example_input()
+
+    def test_better_schedule(self):
+        self.assertIsNone(better_schedule(self.input, None, [0, 1, -1, -1, 1, 2]))
+        self.assertEqual([0, 1, -1, 0, 1, 2],
+                         better_schedule(self.input, [0, 1, 0, -1, 1, 2], None, [0, 1, -1, 0, 1, 2]))
+
+    def test_compute_gap(self):
+        self.assertIsNone(compute_gap(10., None))
+        self.assertEqual(0., compute_gap(0., 0.))
+        self.assertAlmostEqual(0.2, compute_gap(10., 8.))
+
+    def test_unknown_engine(self):
+        self.assertRaises(ValueError, solve_instance, self.input, SolverSettings(engine='unknown'))
+        self.assertRaises(ValueError, solve_instance, self.input, SolverSettings(engine='mip', backends=('unknown',)))
+
+    def test_infeasible_instance(self):
+        prob_input = Input.from_arrays([[1, 1], [0, 1]], 1, [[0, 1], [1, 0]])
+        result = solve_instance(prob_input, SolverSettings())
+        self.assertIsNone(result.schedule)
+        self.assertEqual('mip', result.engine)
+        self.assertRaises(InputError, solve_instance, prob_input, SolverSettings(engine='dp'))
+
+    def test_engines_agree_on_idle_reconfiguration(self):
+        # the transition costs violate the triangle inequality, so that idle time periods reconfigure the machine
+        instances = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instances')
+        prob_input = Input.read(os.path.join(instances, '15timeslots_6types.txt'))
+        results = {engine: solve_instance(prob_input, SolverSettings(engine=engine, num_threads=1)) for engine in
+                   ('auto', 'dp', 'cp')}
+        results['mip'] = solve_instance(prob_input, SolverSettings(engine='mip', formulation='flow', num_threads=1))
+        self.assertEqual({626}, {round(result.objective) for result in results.values()})
+        self.assertTrue(all(result.optimal for result in results.values()))
+        self.assertEqual(626, prob_input.compute_model_costs(results['dp'].schedule))
+        self.assertLess(626, prob_input.compute_costs(results['dp'].schedule))
+
+    def test_engines_agree(self):
+        dp_result = solve_instance(self.input, SolverSettings(engine='dp'))
+        self.assertTrue(dp_result.optimal)
+        mip_result = solve_instance(self.input, SolverSettings(engine='mip'))
+        self.assertTrue(mip_result.optimal)
+        self.assertEqual(dp_result.objective, self.input.compute_model_costs(mip_result.schedule))
+        race_result = solve_instance(self.input, SolverSettings(engine='mip', backends=('scip', 'cbc', 'cp-sat')))
+        self.assertTrue(race_result.optimal)
+        self.assertIn(race_result.backend, ('scip', 'cbc', 'cp-sat'))
+        self.assertEqual(mip_result.objective, race_result.objective)
+        self.assertEqual(race_result.objective, race_result.bound)
+        cp_result = solve_instance(self.input, SolverSettings(engine='cp', num_threads=1))
+        self.assertTrue(cp_result.optimal)
+        self.assertEqual(mip_result.objective, cp_result.objective)
+        rolling_result = solve_instance(self.input, SolverSettings(engine='rolling', window_size=4, window_overlap=1))
+        self.assertTrue(self.input.is_feasible(rolling_result.schedule))
+        self.assertLessEqual(dp_result.objective, rolling_result.objective)
+        heuristic_result = solve_instance(self.input, SolverSettings(engine='heuristic', time_limit=0.1, seed=0))
+        self.assertEqual(dp_result.objective, heuristic_result.objective)